@@ -0,0 +1,144 @@
+# app/auth/bloom.py
+"""
+Local Bloom filter of revoked token ids (JTIs).
+
+Almost no tokens are ever revoked, so asking Redis about every JTI costs a network hop per
+authenticated request for an answer that is nearly always "no". RevokedTokenFilter holds a
+Bloom filter of the revoked JTIs in process: a JTI missing from the filter was not revoked as
+of the last sync, and only filter hits (revoked tokens and rare false positives) are checked
+against Redis.
+
+Revocations are published as a versioned snapshot. app.auth.redis records each revoked JTI,
+and each user whose tokens were all revoked (as "user:<id>"), in a sorted set scored by expiry
+and increments a version counter; every process reads the version at most once per
+TOKEN_BLACKLIST_SYNC_INTERVAL seconds and rebuilds its filter when it has changed, so a token
+revoked elsewhere is rejected here within one interval.
+"""
+import hashlib
+import math
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+REVOKED_SET_KEY = settings.REDIS_KEY_PREFIX + "blacklist:revoked"
+VERSION_KEY = settings.REDIS_KEY_PREFIX + "blacklist:version"
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings.
+
+    Args:
+        capacity: Number of items the filter is sized for
+        error_rate: False positive rate at capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: position i is h1 + i * h2, from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class RevokedTokenFilter:
+    """
+    Periodically synced Bloom filter of revoked JTIs.
+
+    Until the first successful sync every JTI is reported as possibly revoked, so lookups
+    fall back to Redis rather than accepting tokens the filter knows nothing about.
+
+    Args:
+        capacity: Minimum number of JTIs the filter is sized for
+        error_rate: False positive rate at capacity
+        sync_interval: Seconds between checks of the published version
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.sync_errors = 0
+        self._filter = BloomFilter(capacity, error_rate)
+        self._next_sync = 0.0
+
+    def rebuild(self, jtis: Iterable[str], version: str) -> None:
+        """Replace the filter with one holding exactly the given JTIs."""
+        jtis = list(jtis)
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self.version = version
+
+    async def sync(self, redis, force: bool = False) -> None:
+        """
+        Rebuild the filter from Redis if the published version changed.
+
+        Runs at most once per sync_interval unless forced. Redis errors keep the current
+        filter in place until the next attempt.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        try:
+            # The version is read before the set, so a revocation landing in between is
+            # included now and triggers one more rebuild on the next sync.
+            version = await redis.get(VERSION_KEY) or "0"
+            if version == self.version:
+                return
+            jtis = await redis.zrangebyscore(REVOKED_SET_KEY, time.time(), "+inf")
+        except Exception:
+            self.sync_errors += 1
+            return
+        self.rebuild(jtis, version)
+
+    def note_revoked(self, jti: str) -> None:
+        """Add a JTI revoked by this process without waiting for the next sync."""
+        self._filter.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False only if the JTI was certainly not revoked as of the last sync."""
+        if self.version is None:
+            return True
+        if jti in self._filter:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Filter hit/miss counters, size and sync state."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revoked": self._filter.count,
+            "bits": self._filter.size,
+            "version": self.version,
+            "sync_errors": self.sync_errors,
+        }
+
+# Shared filter used by app.auth.redis.is_blacklisted
+revoked_tokens = RevokedTokenFilter(
+    capacity=settings.TOKEN_BLACKLIST_FILTER_CAPACITY,
+    error_rate=settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE,
+    sync_interval=settings.TOKEN_BLACKLIST_SYNC_INTERVAL,
+)
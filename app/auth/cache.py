@@ -0,0 +1,78 @@
+# app/auth/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+class PrincipalCache:
+    """
+    Bounded LRU cache mapping verified access tokens to the principal they resolve to.
+
+    Entries are keyed by the token's signature segment and expire at the token's ``exp``
+    claim, so a cached principal is never served for longer than the token itself is valid.
+    The full token is stored alongside the principal and compared on lookup, so a signature
+    presented with a different header or payload is always a miss.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return token.rpartition(".")[2]
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached principal for a token, or None on a miss."""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != token:
+                self.misses += 1
+                return None
+            if entry[1] <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, token: str, principal: Any, expires_at: float) -> None:
+        """Cache a principal until the token's expiry (a Unix timestamp)."""
+        if self.maxsize <= 0 or expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (token, expires_at, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+# Shared cache used by app.auth.dependencies.get_current_user
+principal_cache = PrincipalCache(settings.AUTH_CACHE_SIZE)
@@ -2,6 +2,10 @@ from datetime import datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+from app.auth.cache import principal_cache
+from app.auth.tokens import unverified_claims
+from app.core.metrics import time_phase
 from app.schemas.user import UserResponse
 from app.models.user import User
 
@@ -15,6 +19,9 @@ def get_current_user(
     This function supports two types of payloads:
       - A full payload as a dict containing user info.
       - A minimal payload, either as a dict with only a 'sub' key or directly as a UUID.
+
+    Verified tokens are remembered in the principal cache until they expire, so repeat
+    requests with the same token skip signature verification and model construction.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -22,10 +29,21 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token_data = User.verify_token(token)
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
+    with time_phase("jwt_decode"):
+        token_data = User.verify_token(token)
     if token_data is None:
         raise credentials_exception
 
+    principal = _principal_from_token_data(token_data, credentials_exception)
+    _cache_principal(token, principal)
+    return principal
+
+def _principal_from_token_data(token_data, credentials_exception: HTTPException) -> UserResponse:
+    """Build the principal for verified token data."""
     try:
         # If the token data is a dictionary:
         if isinstance(token_data, dict):
@@ -67,6 +85,15 @@ def get_current_user(
     except Exception:
         raise credentials_exception
 
+def _cache_principal(token: str, principal: UserResponse) -> None:
+    """Cache a principal until its token's exp claim; tokens without one are not cached."""
+    try:
+        expires_at = unverified_claims(token).get("exp")
+    except JWTError:
+        return
+    if isinstance(expires_at, (int, float)):
+        principal_cache.put(token, principal, float(expires_at))
+
 def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
 ) -> UserResponse:
@@ -79,3 +106,14 @@ def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+async def get_current_active_user_async(
+    token: str = Depends(oauth2_scheme)
+) -> UserResponse:
+    """
+    Variant of get_current_active_user for the async routes.
+
+    Token verification involves no I/O and is usually served from the principal cache,
+    so it runs directly on the event loop instead of being sent to the threadpool.
+    """
+    return get_current_active_user(get_current_user(token))
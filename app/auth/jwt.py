@@ -1,15 +1,15 @@
 # app/auth/jwt.py
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
+from functools import lru_cache
 from typing import Any, Optional, Union
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from jose import ExpiredSignatureError, JWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
-import secrets
 
 from app.core.config import get_settings
-from app.auth.redis import add_to_blacklist, is_blacklisted
+from app.auth.redis import add_to_blacklist, is_blacklisted, is_token_revoked
+from app.auth.tokens import token_service
 from app.schemas.token import TokenType
 from app.database import get_db
 from sqlalchemy.orm import Session
@@ -18,21 +18,25 @@ from app.models.user import User
 settings = get_settings()
 
 # Password hashing
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS
-)
+@lru_cache(maxsize=None)
+def _password_context():
+    """The bcrypt context, built on first use: passlib and its backend are slow to import."""
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS
+    )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return _password_context().hash(password)
 
 def create_token(
     user_id: Union[str, UUID],
@@ -42,37 +46,14 @@ def create_token(
     """
     Create a JWT token (access or refresh).
     """
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
+    if expires_delta is None:
         if token_type == TokenType.ACCESS:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
+            expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-            )
-
-    if isinstance(user_id, UUID):
-        user_id = str(user_id)
-
-    to_encode = {
-        "sub": user_id,
-        "type": token_type.value,
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
-        "jti": secrets.token_hex(16)
-    }
-
-    secret = (
-        settings.JWT_SECRET_KEY 
-        if token_type == TokenType.ACCESS 
-        else settings.JWT_REFRESH_SECRET_KEY
-    )
+            expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
     try:
-        return jwt.encode(to_encode, secret, algorithm=settings.ALGORITHM)
+        return token_service.mint(user_id, token_type, expires_delta)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -88,18 +69,7 @@ async def decode_token(
     Decode and verify a JWT token.
     """
     try:
-        secret = (
-            settings.JWT_SECRET_KEY 
-            if token_type == TokenType.ACCESS 
-            else settings.JWT_REFRESH_SECRET_KEY
-        )
-        
-        payload = jwt.decode(
-            token,
-            secret,
-            algorithms=[settings.ALGORITHM],
-            options={"verify_exp": verify_exp}
-        )
+        payload = token_service.verify(token, token_type, verify_exp=verify_exp)
         
         if payload.get("type") != token_type.value:
             raise HTTPException(
@@ -108,7 +78,7 @@ async def decode_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
             
-        if await is_blacklisted(payload["jti"]):
+        if await is_token_revoked(payload["jti"], payload["sub"], payload.get("iat", 0)):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been revoked",
@@ -117,7 +87,7 @@ async def decode_token(
             
         return payload
         
-    except jwt.ExpiredSignatureError:
+    except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
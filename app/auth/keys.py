@@ -0,0 +1,123 @@
+# app/auth/keys.py
+"""
+Key material for asymmetrically signed tokens (RS256 and EdDSA over Ed25519).
+
+The signing node holds a PEM private key; verifying nodes only need the public keys, which
+are distributed as a local JWKS file (RFC 7517) and looked up by the token's "kid" header.
+Keys without an explicit id are identified by their RFC 7638 thumbprint.
+
+Generate a key pair and the matching JWKS file with:
+
+    python -m app.auth.keys --algorithm EdDSA --private-key keys/jwt.pem --jwks keys/jwks.json
+"""
+import argparse
+import base64
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+PrivateKey = Union[rsa.RSAPrivateKey, ed25519.Ed25519PrivateKey]
+PublicKey = Union[rsa.RSAPublicKey, ed25519.Ed25519PublicKey]
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _int_to_b64(value: int) -> str:
+    return _b64(value.to_bytes((value.bit_length() + 7) // 8 or 1, "big"))
+
+def key_algorithm(key: Union[PrivateKey, PublicKey]) -> str:
+    """The JWT algorithm a key signs or verifies with."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+def public_jwk(public_key: PublicKey, kid: Optional[str] = None) -> dict:
+    """
+    JWK of a public key. Without a kid, the RFC 7638 thumbprint is used.
+    """
+    if isinstance(public_key, rsa.RSAPublicKey):
+        numbers = public_key.public_numbers()
+        jwk = {"e": _int_to_b64(numbers.e), "kty": "RSA", "n": _int_to_b64(numbers.n)}
+    elif isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        jwk = {"crv": "Ed25519", "kty": "OKP", "x": _b64(raw)}
+    else:
+        raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
+    thumbprint = _b64(hashlib.sha256(json.dumps(jwk, separators=(",", ":"), sort_keys=True).encode()).digest())
+    return {**jwk, "kid": kid or thumbprint, "alg": key_algorithm(public_key), "use": "sig"}
+
+def public_key_from_jwk(jwk: dict) -> PublicKey:
+    """Parse an RSA or Ed25519 public JWK."""
+    kty = jwk.get("kty")
+    if kty == "RSA":
+        n = int.from_bytes(_unb64(jwk["n"]), "big")
+        e = int.from_bytes(_unb64(jwk["e"]), "big")
+        return rsa.RSAPublicNumbers(e, n).public_key()
+    if kty == "OKP" and jwk.get("crv") == "Ed25519":
+        return ed25519.Ed25519PublicKey.from_public_bytes(_unb64(jwk["x"]))
+    raise ValueError(f"Unsupported JWK: kty={kty!r} crv={jwk.get('crv')!r}")
+
+def load_jwks(path: Union[str, Path]) -> Dict[str, PublicKey]:
+    """kid -> public key for the signing keys of a JWKS file."""
+    document = json.loads(Path(path).read_text())
+    keys = {}
+    for jwk in document.get("keys", []):
+        if jwk.get("use", "sig") != "sig":
+            continue
+        public_key = public_key_from_jwk(jwk)
+        keys[jwk.get("kid") or public_jwk(public_key)["kid"]] = public_key
+    return keys
+
+def load_private_key(path: Union[str, Path], password: Optional[str] = None) -> PrivateKey:
+    """Load a PEM-encoded RSA or Ed25519 private key."""
+    key = serialization.load_pem_private_key(
+        Path(path).read_bytes(), password=password.encode() if password else None
+    )
+    key_algorithm(key)
+    return key
+
+def generate_private_key(algorithm: str) -> PrivateKey:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a token signing key and its JWKS file.")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    parser.add_argument("--private-key", type=Path, required=True, help="Where to write the PEM private key")
+    parser.add_argument("--jwks", type=Path, required=True,
+                        help="JWKS file to add the public key to (created if missing)")
+    parser.add_argument("--kid", help="Key id (default: RFC 7638 thumbprint)")
+    options = parser.parse_args(argv)
+
+    private_key = generate_private_key(options.algorithm)
+    options.private_key.parent.mkdir(parents=True, exist_ok=True)
+    options.private_key.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    options.private_key.chmod(0o600)
+
+    jwk = public_jwk(private_key.public_key(), options.kid)
+    document = json.loads(options.jwks.read_text()) if options.jwks.exists() else {"keys": []}
+    document["keys"] = [k for k in document["keys"] if k.get("kid") != jwk["kid"]] + [jwk]
+    options.jwks.parent.mkdir(parents=True, exist_ok=True)
+    options.jwks.write_text(json.dumps(document, indent=2))
+    print(f"Wrote {options.private_key} and added kid {jwk['kid']} to {options.jwks}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
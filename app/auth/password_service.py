@@ -0,0 +1,142 @@
+# app/auth/password_service.py
+"""
+Password hashing and verification in a dedicated process pool.
+
+bcrypt is deliberately slow, so running it in the API worker ties up a CPU core for every
+login or registration. The PasswordService sends that work to a small pool of worker
+processes and caps how many requests may be waiting on it at once; beyond that limit new
+requests are rejected with PasswordServiceBusy, which the API turns into a 503 with a
+Retry-After header instead of letting logins queue up behind each other and starve
+calculation traffic.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+class PasswordServiceBusy(RuntimeError):
+    """Raised when the password service queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password service is busy, please retry later.")
+        self.retry_after = retry_after
+
+def _hash(password: str) -> str:
+    from app.auth.jwt import get_password_hash
+    return get_password_hash(password)
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    from app.auth.jwt import verify_password
+    return verify_password(plain_password, hashed_password)
+
+def _worker_context():
+    """
+    Start workers from a forkserver that has already imported the hashing code, so a new
+    pool is ready in milliseconds. The API process itself is multi-threaded and must not be
+    forked directly; where forkserver is unavailable, fall back to spawn.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["app.auth.jwt", "passlib.context", "passlib.handlers.bcrypt"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+class PasswordService:
+    """
+    Dispatches bcrypt work to a process pool with a bounded queue.
+
+    Args:
+        workers: Number of worker processes; 0 runs the work inline in the caller
+        max_queue: Maximum number of hash/verify calls in flight or waiting
+        retry_after: Seconds suggested to clients when the queue is full
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=_worker_context(),
+                )
+            return self._executor
+
+    def _release(self, _future: Future = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.rejected += 1
+                raise PasswordServiceBusy(self.retry_after)
+            self._pending += 1
+
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def hash(self, password: str) -> str:
+        """Hash a password, blocking the calling thread until a worker is done."""
+        return self._submit(_hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password, blocking the calling thread until a worker is done."""
+        return self._submit(_verify, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(_verify, plain_password, hashed_password))
+
+    def stats(self) -> Dict[str, int]:
+        """Current queue depth and rejection count."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; a later call starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# Shared service used by User.hash_password and User.verify_password
+password_service = PasswordService(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_queue=settings.PASSWORD_POOL_MAX_QUEUE,
+    retry_after=settings.PASSWORD_POOL_RETRY_AFTER,
+)
@@ -1,28 +1,191 @@
-from redis import asyncio as aioredis  # Use the modern redis library as a drop-in replacement
+import math
+import time
+from typing import List, Optional, Sequence
+
+from app.auth.bloom import REVOKED_SET_KEY, VERSION_KEY, revoked_tokens
 from app.core.config import settings
 
-# Create Redis client
-redis_client = aioredis.from_url(
-    settings.REDIS_URL, 
-    encoding="utf-8", 
-    decode_responses=True
-)
+def _connect():
+    """
+    Create the shared connection pool and client on first use; importing the redis package
+    takes longer than everything else in this module.
+    """
+    global redis_pool, redis_client
+    from redis import asyncio as aioredis  # Use the modern redis library as a drop-in replacement
+
+    # Shared connection pool; clients borrow a connection per command instead of opening one
+    redis_pool = aioredis.ConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        encoding="utf-8",
+        decode_responses=True,
+    )
+    redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+def get_redis_client():
+    """The shared Redis client, created on first use."""
+    client = globals().get("redis_client")
+    if client is None:
+        _connect()
+        client = redis_client
+    return client
+
+def __getattr__(name: str):
+    # `from app.auth.redis import redis_client` still works; it creates the client on first access.
+    if name in ("redis_client", "redis_pool"):
+        _connect()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def redis_key(*parts: str) -> str:
+    """Namespaced key, e.g. redis_key("blacklist", "jti", jti) -> "calc-api:blacklist:jti:<jti>"."""
+    return settings.REDIS_KEY_PREFIX + ":".join(parts)
+
+def _jti_key(jti: str) -> str:
+    return redis_key("blacklist", "jti", jti)
+
+def _user_key(user_id: str) -> str:
+    return redis_key("blacklist", "user", str(user_id))
+
+def _user_member(user_id: str) -> str:
+    """Member standing for a user's revoked tokens in the revoked-token snapshot."""
+    return f"user:{user_id}"
 
 async def add_to_blacklist(token: str, expiration: int = 3600):
     """
     Adds a token to the Redis blacklist with an expiration time.
+
+    The token is also published to the revoked-token snapshot that other processes sync
+    their Bloom filters from, in the same transaction.
+    """
+    now = time.time()
+    async with get_redis_client().pipeline(transaction=True) as pipe:
+        pipe.setex(_jti_key(token), expiration, "blacklisted")
+        pipe.zadd(REVOKED_SET_KEY, {token: now + expiration})
+        pipe.zremrangebyscore(REVOKED_SET_KEY, "-inf", now)
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+    revoked_tokens.note_revoked(token)
+
+async def revoke_user_tokens(user_id: str, expiration: Optional[int] = None):
+    """
+    Revokes every token issued to a user up to now, in one round trip.
+
+    Rather than listing the user's JTIs, the revocation time is stored per user and tokens
+    issued at or before it are rejected. It is kept for as long as the longest-lived token.
     """
-    await redis_client.setex(token, expiration, "blacklisted")
+    if expiration is None:
+        expiration = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    now = time.time()
+    async with get_redis_client().pipeline(transaction=True) as pipe:
+        pipe.setex(_user_key(user_id), expiration, int(now))
+        pipe.zadd(REVOKED_SET_KEY, {_user_member(user_id): now + expiration})
+        pipe.zremrangebyscore(REVOKED_SET_KEY, "-inf", now)
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+    revoked_tokens.note_revoked(_user_member(user_id))
 
 async def is_blacklisted(token: str) -> bool:
     """
     Checks if a token is in the Redis blacklist.
+
+    Tokens absent from the local revoked-token filter are accepted without a Redis lookup.
+    """
+    return (await are_blacklisted([token]))[0]
+
+async def are_blacklisted(tokens: Sequence[str]) -> List[bool]:
+    """
+    Checks many tokens at once: filter hits are looked up with a single MGET.
+    """
+    redis_client = get_redis_client()
+    await revoked_tokens.sync(redis_client)
+    suspects = [token for token in tokens if revoked_tokens.might_be_revoked(token)]
+    if not suspects:
+        return [False] * len(tokens)
+    values = await redis_client.mget([_jti_key(token) for token in suspects])
+    revoked = {token for token, value in zip(suspects, values) if value is not None}
+    return [token in revoked for token in tokens]
+
+async def is_token_revoked(jti: str, user_id: str, issued_at: int) -> bool:
+    """
+    Checks a token against both its own revocation and its user's revoke-all time.
+
+    A token issued in the same second as a revoke-all is treated as revoked, since iat only
+    has one-second resolution.
+    """
+    redis_client = get_redis_client()
+    await revoked_tokens.sync(redis_client)
+    jti_suspect = revoked_tokens.might_be_revoked(jti)
+    user_suspect = revoked_tokens.might_be_revoked(_user_member(user_id))
+    if not (jti_suspect or user_suspect):
+        return False
+    jti_value, revoked_before = await redis_client.mget([_jti_key(jti), _user_key(user_id)])
+    if jti_value is not None:
+        return True
+    return revoked_before is not None and issued_at <= int(revoked_before)
+
+async def migrate_legacy_blacklist(batch_size: int = 500) -> int:
     """
-    exists = await redis_client.get(token)
-    return exists is not None
+    Copy blacklist entries stored under a bare JTI, as written before keys were namespaced,
+    to their namespaced key and into the revoked-token snapshot, keeping their remaining TTL.
+
+    Until this runs, those tokens are accepted again: lookups only read namespaced keys, and
+    only for JTIs the snapshot lists. The bare keys are left to expire, so processes still
+    running the old code keep rejecting them, and running this again is harmless.
+
+    Returns:
+        int: The number of entries copied
+    """
+    redis_client = get_redis_client()
+    migrated = 0
+    batch = []
+    async for key in redis_client.scan_iter(count=batch_size):
+        if not key.startswith(settings.REDIS_KEY_PREFIX):
+            batch.append(key)
+        if len(batch) >= batch_size:
+            migrated += await _migrate_legacy_keys(redis_client, batch)
+            batch = []
+    if batch:
+        migrated += await _migrate_legacy_keys(redis_client, batch)
+    return migrated
+
+async def _migrate_legacy_keys(redis_client, keys: List[str]) -> int:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.type(key)
+            pipe.pttl(key)
+        described = await pipe.execute()
+    ttls = dict(zip(keys, described[1::2]))
+    strings = [key for key, kind in zip(keys, described[0::2]) if kind == "string"]
+    values = await redis_client.mget(strings) if strings else []
+    # Keys without an expiry (pttl -1) are kept for as long as the longest-lived token
+    longest = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    expirations = {
+        jti: math.ceil(ttls[jti] / 1000) if ttls[jti] > 0 else longest
+        for jti, value in zip(strings, values)
+        if value == "blacklisted" and ttls[jti] != -2
+    }
+    if not expirations:
+        return 0
+    now = time.time()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for jti, expiration in expirations.items():
+            pipe.setex(_jti_key(jti), expiration, "blacklisted")
+        pipe.zadd(REVOKED_SET_KEY, {jti: now + expiration for jti, expiration in expirations.items()})
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+    for jti in expirations:
+        revoked_tokens.note_revoked(jti)
+    return len(expirations)
 
 async def close_redis():
     """
     Closes the Redis connection.
     """
-    await redis_client.close()
\ No newline at end of file
+    if globals().get("redis_client") is None:
+        return
+    await redis_client.aclose()
+    await redis_pool.disconnect()
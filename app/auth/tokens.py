@@ -0,0 +1,398 @@
+# app/auth/tokens.py
+"""
+Minting and verification of the API's JWTs without going through jose per call.
+
+jose.jwt.encode re-serializes the constant header, builds a new key object from the secret
+and dumps the claims with the json module for every token. The token services do the
+constant work once: the header segment is encoded up front, keys are parsed once and kept
+in memory, and the claims segment is dumped with orjson. The output is byte-identical to
+jose's: the same header JSON (sorted, compact), the claims in insertion order with compact
+separators, and unpadded base64url.
+
+Two services share that encoding:
+
+- TokenService signs with HMAC (HS256/384/512) and the shared access and refresh secrets.
+  Each secret is held in a keyed HMAC object that is copied rather than re-keyed per
+  signature.
+- AsymmetricTokenService signs with an RSA (RS256) or Ed25519 (EdDSA) private key and puts
+  the key's id in the "kid" header. It verifies with public keys from a local JWKS file, so
+  nodes that only verify tokens need no signing secret at all. Both token types are signed
+  with the same key, so only their "type" claim tells them apart.
+
+Both services check that claim against the token type being verified.
+
+Tokens whose header is not one the service produces are handed to jose (HMAC) or rejected
+unless their kid is known (asymmetric); jose's exception types are raised in every case.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Union
+from uuid import UUID
+
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+from app.auth.keys import (
+    ASYMMETRIC_ALGORITHMS,
+    PrivateKey,
+    PublicKey,
+    key_algorithm,
+    load_jwks,
+    load_private_key,
+    public_jwk,
+)
+from app.core.config import settings
+from app.schemas.token import TokenType
+
+HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+def base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def base64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+def encode_header(algorithm: str, kid: Optional[str] = None) -> bytes:
+    """The header segment jose produces for a token, with an optional key id."""
+    header = {"typ": "JWT", "alg": algorithm}
+    if kid is not None:
+        header["kid"] = kid
+    return base64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+def unverified_claims(token: str) -> Dict[str, Any]:
+    """
+    The claims of a token without verifying it, like jose.jwt.get_unverified_claims.
+
+    Raises:
+        JWTError: If the token is malformed
+    """
+    token_bytes = token.encode("utf-8") if isinstance(token, str) else token
+    segments = token_bytes.split(b".")
+    if len(segments) != 3:
+        raise JWTError("Not enough segments")
+    try:
+        claims = orjson.loads(base64url_decode(segments[1]))
+    except (binascii.Error, ValueError):
+        raise JWTError("Invalid payload string")
+    if not isinstance(claims, dict):
+        raise JWTError("Invalid payload string: must be a json object")
+    return claims
+
+class BaseTokenService:
+    """
+    Claims encoding and validation shared by the token services.
+
+    Subclasses set self.header and implement _sign() and verify().
+    """
+    algorithm: str
+    header: bytes
+
+    def _sign(self, token_type: TokenType, signing_input: bytes) -> bytes:
+        raise NotImplementedError
+
+    def verify(self, token: str, token_type: TokenType, verify_exp: bool = True) -> Dict[str, Any]:
+        """
+        Verify a token's signature and return its claims.
+
+        The token's "type" claim must be token_type.
+
+        Raises:
+            ExpiredSignatureError: If verify_exp is set and the token has expired
+            JWTError: If the token is malformed, its signature is invalid or a claim is invalid
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _check_type(claims: Dict[str, Any], token_type: TokenType) -> Dict[str, Any]:
+        if claims.get("type") != token_type.value:
+            raise JWTClaimsError("Invalid token type")
+        return claims
+
+    def encode(self, claims: Dict[str, Any], token_type: TokenType) -> str:
+        """
+        Sign a claims set as a token of token_type.
+
+        Timestamps must already be NumericDate integers.
+        """
+        payload = orjson.dumps(claims)
+        if not payload.isascii():
+            # json.dumps escapes non-ASCII characters where orjson writes them as UTF-8.
+            payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        signing_input = self.header + b"." + base64url_encode(payload)
+        signature = base64url_encode(self._sign(token_type, signing_input))
+        return (signing_input + b"." + signature).decode("ascii")
+
+    def mint(
+        self,
+        user_id: Union[str, UUID],
+        token_type: TokenType,
+        lifetime: timedelta,
+        now: Optional[float] = None,
+        jti: Optional[str] = None,
+    ) -> str:
+        """
+        Create a token for a user with the API's claims: sub, type, exp, iat and jti.
+
+        Args:
+            user_id: Subject of the token
+            token_type: Access or refresh
+            lifetime: Time until the token expires
+            now: Issue time as a Unix timestamp (defaults to the current time)
+            jti: Token identifier (defaults to 16 random bytes in hex)
+        """
+        if now is None:
+            now = time.time()
+        return self.encode({
+            "sub": str(user_id),
+            "type": token_type.value,
+            "exp": int(now + lifetime.total_seconds()),
+            "iat": int(now),
+            "jti": jti if jti is not None else secrets.token_hex(16),
+        }, token_type)
+
+    @staticmethod
+    def _split(token: Union[str, bytes]):
+        """(header, signing input, signature, payload) segments of a compact token."""
+        token_bytes = token.encode("utf-8") if isinstance(token, str) else token
+        signing_input, _, signature = token_bytes.rpartition(b".")
+        header, _, payload = signing_input.partition(b".")
+        return header, signing_input, signature, payload
+
+    @staticmethod
+    def _decode_segments(signature: bytes, payload: bytes):
+        try:
+            return base64url_decode(signature), base64url_decode(payload)
+        except (binascii.Error, ValueError):
+            raise JWTError("Invalid token padding")
+
+    @classmethod
+    def _claims(cls, payload: bytes, verify_exp: bool) -> Dict[str, Any]:
+        try:
+            claims = orjson.loads(payload)
+        except orjson.JSONDecodeError as e:
+            raise JWTError(f"Invalid payload string: {e}")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+        cls._validate_claims(claims, verify_exp)
+        return claims
+
+    @staticmethod
+    def _validate_claims(claims: Dict[str, Any], verify_exp: bool) -> None:
+        """The time and type checks jose applies to the API's claims."""
+        now = int(time.time())
+        for name in ("exp", "iat", "nbf"):
+            if name in claims and not isinstance(claims[name], (int, float)):
+                raise JWTClaimsError(f"{name} claim must be an integer.")
+        if verify_exp and "exp" in claims and int(claims["exp"]) < now:
+            raise ExpiredSignatureError("Signature has expired.")
+        if "nbf" in claims and int(claims["nbf"]) > now:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+        for name in ("sub", "jti"):
+            if name in claims and not isinstance(claims[name], str):
+                raise JWTClaimsError(f"{name} claim must be a string.")
+        if "aud" in claims:
+            raise JWTClaimsError("Invalid audience")
+        if "at_hash" in claims:
+            raise JWTClaimsError("No access_token provided to compare against at_hash claim.")
+
+class TokenService(BaseTokenService):
+    """
+    Creates and verifies access and refresh tokens signed with HMAC.
+
+    Args:
+        access_secret: Secret for access tokens
+        refresh_secret: Secret for refresh tokens
+        algorithm: HS256, HS384 or HS512
+    """
+
+    def __init__(self, access_secret: str, refresh_secret: str, algorithm: str = "HS256"):
+        if algorithm not in HMAC_DIGESTS:
+            raise ValueError(f"Unsupported JWT algorithm for the token service: {algorithm}")
+        digest = HMAC_DIGESTS[algorithm]
+        self.algorithm = algorithm
+        self.header = encode_header(algorithm)
+        self._secrets = {TokenType.ACCESS: access_secret, TokenType.REFRESH: refresh_secret}
+        self._keys = {
+            token_type: hmac.new(secret.encode("utf-8"), digestmod=digest)
+            for token_type, secret in self._secrets.items()
+        }
+
+    def _sign(self, token_type: TokenType, signing_input: bytes) -> bytes:
+        mac = self._keys[token_type].copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def verify(self, token: str, token_type: TokenType, verify_exp: bool = True) -> Dict[str, Any]:
+        """
+        Verify a token's signature with the secret for token_type and return its claims.
+
+        The token's "type" claim must be token_type.
+
+        Raises:
+            ExpiredSignatureError: If verify_exp is set and the token has expired
+            JWTError: If the token is malformed, its signature is invalid or a claim is invalid
+        """
+        header, signing_input, signature, payload = self._split(token)
+        if header != self.header:
+            from jose import jwt
+            return self._check_type(jwt.decode(
+                token,
+                self._secrets[token_type],
+                algorithms=[self.algorithm],
+                options={"verify_exp": verify_exp},
+            ), token_type)
+        signature, payload = self._decode_segments(signature, payload)
+        if not hmac.compare_digest(signature, self._sign(token_type, signing_input)):
+            raise JWTError("Signature verification failed.")
+        return self._check_type(self._claims(payload, verify_exp), token_type)
+
+class AsymmetricTokenService(BaseTokenService):
+    """
+    Creates tokens with a private key and verifies them with cached public keys.
+
+    Args:
+        algorithm: RS256 or EdDSA
+        private_key: Signing key; None on nodes that only verify tokens
+        key_id: kid of the signing key (default: its RFC 7638 thumbprint)
+        public_keys: kid -> public key accepted for verification; the signing key's own
+            public key is always included
+        jwks_file: JWKS file public_keys was loaded from. It is re-read when a token names
+            an unknown kid and the file has changed since, which picks up rotated keys.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        private_key: Optional[PrivateKey] = None,
+        key_id: Optional[str] = None,
+        public_keys: Optional[Dict[str, PublicKey]] = None,
+        jwks_file: Optional[str] = None,
+    ):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm for the asymmetric token service: {algorithm}")
+        self.algorithm = algorithm
+        self.jwks_file = jwks_file
+        self._jwks_mtime = os.stat(jwks_file).st_mtime_ns if jwks_file else None
+        self._public_keys: Dict[str, PublicKey] = {}
+        self._headers: Dict[bytes, PublicKey] = {}
+        self._private_key = private_key
+        self.key_id = None
+        self.header = None
+        if private_key is not None:
+            if key_algorithm(private_key) != algorithm:
+                raise ValueError(f"The signing key is not an {algorithm} key")
+            self.key_id = key_id or public_jwk(private_key.public_key())["kid"]
+            self.header = encode_header(algorithm, self.key_id)
+        self._set_public_keys(public_keys or {})
+
+    @classmethod
+    def from_files(
+        cls,
+        algorithm: str,
+        private_key_file: Optional[str] = None,
+        jwks_file: Optional[str] = None,
+        key_id: Optional[str] = None,
+        private_key_password: Optional[str] = None,
+    ) -> "AsymmetricTokenService":
+        if private_key_file is None and jwks_file is None:
+            raise ValueError(f"{algorithm} needs JWT_PRIVATE_KEY_FILE, JWT_JWKS_FILE or both")
+        private_key = load_private_key(private_key_file, private_key_password) if private_key_file else None
+        public_keys = load_jwks(jwks_file) if jwks_file else {}
+        return cls(algorithm, private_key, key_id, public_keys, jwks_file)
+
+    def _set_public_keys(self, public_keys: Dict[str, PublicKey]) -> None:
+        keys = {kid: key for kid, key in public_keys.items() if key_algorithm(key) == self.algorithm}
+        if self._private_key is not None:
+            keys[self.key_id] = self._private_key.public_key()
+        self._public_keys = keys
+        # Tokens are looked up by their raw header segment, so the common case costs a dict hit.
+        self._headers = {encode_header(self.algorithm, kid): key for kid, key in keys.items()}
+
+    def _reload_jwks(self) -> bool:
+        """Re-read the JWKS file if it changed; True if the keys were replaced."""
+        if self.jwks_file is None:
+            return False
+        try:
+            mtime = os.stat(self.jwks_file).st_mtime_ns
+            if mtime == self._jwks_mtime:
+                return False
+            public_keys = load_jwks(self.jwks_file)
+        except (OSError, ValueError, KeyError):
+            return False
+        self._jwks_mtime = mtime
+        self._set_public_keys(public_keys)
+        return True
+
+    def _public_key(self, header: bytes) -> PublicKey:
+        key = self._headers.get(header)
+        if key is not None:
+            return key
+        try:
+            fields = orjson.loads(base64url_decode(header))
+        except (binascii.Error, ValueError):
+            raise JWTError("Error decoding token headers.")
+        if not isinstance(fields, dict) or fields.get("alg") != self.algorithm:
+            raise JWTError("The specified alg value is not allowed")
+        kid = fields.get("kid")
+        if not isinstance(kid, str):
+            raise JWTError("Unknown key id")
+        if kid not in self._public_keys and not (self._reload_jwks() and kid in self._public_keys):
+            raise JWTError("Unknown key id")
+        return self._public_keys[kid]
+
+    def encode(self, claims: Dict[str, Any], token_type: TokenType) -> str:
+        if self._private_key is None:
+            raise RuntimeError("This node has no signing key (JWT_PRIVATE_KEY_FILE is not set)")
+        return super().encode(claims, token_type)
+
+    def _sign(self, token_type: TokenType, signing_input: bytes) -> bytes:
+        if self.algorithm == "RS256":
+            return self._private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+        return self._private_key.sign(signing_input)
+
+    def verify(self, token: str, token_type: TokenType, verify_exp: bool = True) -> Dict[str, Any]:
+        """
+        Verify a token's signature with the public key named by its kid and return its claims.
+
+        The token's "type" claim must be token_type.
+
+        Raises:
+            ExpiredSignatureError: If verify_exp is set and the token has expired
+            JWTError: If the token is malformed, its key is unknown, its signature is invalid
+                or a claim is invalid
+        """
+        header, signing_input, signature, payload = self._split(token)
+        public_key = self._public_key(header)
+        signature, payload = self._decode_segments(signature, payload)
+        try:
+            if isinstance(public_key, rsa.RSAPublicKey):
+                public_key.verify(signature, signing_input, padding.PKCS1v15(), hashes.SHA256())
+            else:
+                public_key.verify(signature, signing_input)
+        except InvalidSignature:
+            raise JWTError("Signature verification failed.")
+        return self._check_type(self._claims(payload, verify_exp), token_type)
+
+def create_token_service(config=settings) -> BaseTokenService:
+    """The token service for the configured ALGORITHM."""
+    if config.ALGORITHM in HMAC_DIGESTS:
+        return TokenService(config.JWT_SECRET_KEY, config.JWT_REFRESH_SECRET_KEY, config.ALGORITHM)
+    return AsymmetricTokenService.from_files(
+        config.ALGORITHM,
+        private_key_file=config.JWT_PRIVATE_KEY_FILE,
+        jwks_file=config.JWT_JWKS_FILE,
+        key_id=config.JWT_KEY_ID,
+        private_key_password=config.JWT_PRIVATE_KEY_PASSWORD,
+    )
+
+token_service = create_token_service()
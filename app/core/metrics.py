@@ -0,0 +1,261 @@
+# app/core/metrics.py
+"""
+In-process metrics with Prometheus text exposition.
+
+Metric families are registered in REGISTRY when created and rendered by render_metrics()
+for the /metrics endpoint. MetricsMiddleware records request counts, latencies and
+in-flight requests per route template, and time_phase() times the inner phases of a
+request (JWT decode, database queries, result computation, serialization).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+# Upper bounds (in seconds) suited to request and query latencies
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed bucket upper bounds.
+
+    Counts are kept per bucket and reported cumulatively, Prometheus style: the count for
+    bound ``le`` is the number of observations less than or equal to it.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts, sum and count of observations."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[repr(bound)] = running
+        cumulative["+Inf"] = count
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+# ------------------------------------------------------------------------------
+# Metric families
+# ------------------------------------------------------------------------------
+REGISTRY: List["MetricFamily"] = []
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricFamily:
+    """
+    A named metric with a fixed set of label names and one child per label combination.
+
+    Args:
+        name: Metric name
+        help: One-line description
+        labels: Label names; values are passed positionally to the update methods
+        registry: List the family is added to; None keeps it unregistered
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 registry: Optional[List["MetricFamily"]] = REGISTRY):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def _key(self, labels: Sequence[Any]) -> Tuple[str, ...]:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        return tuple(str(label) for label in labels)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            children = list(self._children.items())
+        for key, value in children:
+            yield f"{self.name}{_format_labels(list(zip(self.label_names, key)))} {_format_value(value)}"
+
+    def render(self) -> List[str]:
+        """Lines of the Prometheus text format for this family."""
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}", *self._samples()]
+
+class Counter(MetricFamily):
+    """Monotonically increasing count."""
+    type = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def set_total(self, value: float, *labels: Any) -> None:
+        """Set the count to a total maintained elsewhere."""
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+class Gauge(MetricFamily):
+    """Value that can go up and down."""
+    type = "gauge"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+class HistogramFamily(MetricFamily):
+    """Histogram per label combination."""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 registry: Optional[List[MetricFamily]] = REGISTRY):
+        super().__init__(name, help, labels, registry)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = Histogram(self.buckets)
+        child.observe(value)
+
+    def attach(self, histogram: Histogram, *labels: Any) -> None:
+        """Expose an existing Histogram under the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = histogram
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            children = list(self._children.items())
+        for key, histogram in children:
+            pairs = list(zip(self.label_names, key))
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                yield f"{self.name}_bucket{_format_labels(pairs + [('le', bound)])} {count}"
+            yield f"{self.name}_sum{_format_labels(pairs)} {_format_value(snapshot['sum'])}"
+            yield f"{self.name}_count{_format_labels(pairs)} {snapshot['count']}"
+
+def render_metrics(*extra: MetricFamily) -> str:
+    """Render every registered family, plus any extra ones, in the Prometheus text format."""
+    lines: List[str] = []
+    for family in [*REGISTRY, *extra]:
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+# ------------------------------------------------------------------------------
+# Application metrics
+# ------------------------------------------------------------------------------
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by method, route template and status.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = HistogramFamily(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ["method", "route"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served, by route template.",
+    ["route"],
+)
+PHASE_SECONDS = HistogramFamily(
+    "app_phase_duration_seconds",
+    "Time spent in request phases: jwt_decode, db_query, compute, serialize.",
+    ["phase"],
+)
+
+@contextmanager
+def time_phase(phase: str) -> Iterator[None]:
+    """Time the enclosed block as one observation of the given phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.observe(time.perf_counter() - start, phase)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight requests.
+
+    Requests are labelled with the template of the route they match, such as
+    /calculations/{calc_id}, so label cardinality stays bounded; requests that match no
+    route are labelled "unmatched".
+    """
+
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+
+    def _route_template(self, scope) -> str:
+        partial = None
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route_template(scope)
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec(route)
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, route)
+            HTTP_REQUESTS.inc(method, route, status_code)
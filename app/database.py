@@ -1,14 +1,98 @@
 # app/database.py
-from sqlalchemy import create_engine
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import PHASE_SECONDS, Histogram
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+# --- Query Timing ---
+# Listeners on the Engine class cover every engine, including the sync engine behind
+# the async one. Start times are stacked per connection in case of nested executions.
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    PHASE_SECONDS.observe(time.perf_counter() - conn.info["query_start_times"].pop(), "db_query")
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_times"):
+        conn.info["query_start_times"].pop()
+
+# --- Connection Pool ---
+# Bounds (in seconds) for the time spent waiting to check out a connection
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout waited for a connection, and how many timed out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool with checkout wait metrics."""
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait metrics."""
+
+def _pool_options(database_url: str, poolclass) -> Dict[str, Any]:
+    """Pool arguments from Settings; SQLite keeps SQLAlchemy's default pool."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """Live statistics for an engine's connection pool."""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _TimedCheckoutMixin):
+        stats["timeouts"] = pool.timeouts
+        stats["wait_seconds"] = pool.wait_seconds.snapshot()
+    return stats
+
 # Create the default engine and sessionmaker
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_pool_options(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool))
+# Objects are not expired on commit: every column default is generated client-side, so a
+# freshly inserted row already holds its values and reloading it would only repeat them.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -22,8 +106,56 @@ def get_db():
 # --- New Functions Added ---
 def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
     """Factory function to create a new SQLAlchemy engine."""
-    return create_engine(database_url)
+    return create_engine(database_url, **_pool_options(database_url, InstrumentedQueuePool))
 
 def get_sessionmaker(engine):
     """Factory function to create a new sessionmaker bound to the given engine."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# --- Async Engine ---
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: str = SQLALCHEMY_DATABASE_URL) -> str:
+    """Return ASYNC_DATABASE_URL, or database_url rewritten to use an async driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+def get_async_engine(database_url: Optional[str] = None):
+    """Factory function to create a new SQLAlchemy AsyncEngine."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    database_url = database_url or get_async_database_url()
+    return create_async_engine(database_url, **_pool_options(database_url, InstrumentedAsyncAdaptedQueuePool))
+
+def get_async_sessionmaker(async_engine):
+    """
+    Factory function to create an async_sessionmaker bound to the given engine.
+
+    Objects are not expired on commit, since reloading them afterwards would need an
+    awaited round trip that attribute access cannot perform.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# The async engine is only built when first needed, so the async driver is not
+# required unless DATABASE_ASYNC is enabled.
+async_engine = None
+_async_session_factory = None
+
+def get_async_session_factory():
+    """Return the shared async_sessionmaker, creating the async engine on first use."""
+    global async_engine, _async_session_factory
+    if _async_session_factory is None:
+        async_engine = get_async_engine()
+        _async_session_factory = get_async_sessionmaker(async_engine)
+    return _async_session_factory
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
@@ -1,5 +1,18 @@
+import argparse
+import asyncio
+
+from sqlalchemy import delete, insert, inspect, select, text, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
+
 from app.database import engine
 from app.models.user import Base
+from app.models.calculation import Calculation, encode_inputs
+from app.models.calculation_stats import CalculationStats
+from app.models.schema_version import SCHEMA_VERSION, SchemaVersion
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database was not migrated to the schema version of this code."""
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -7,5 +20,135 @@ def init_db():
 def drop_db():
     Base.metadata.drop_all(bind=engine)
 
+def _add_missing_columns(connection):
+    """
+    ALTER TABLE ... ADD COLUMN for model columns the existing tables lack; they must be nullable
+    or have a server default for the rows already there.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise SchemaVersionError(f"Cannot add the non-nullable column {table.name}.{column.name}.")
+            definition = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}"))
+
+def _add_missing_indexes(connection):
+    """CREATE INDEX for model indexes the existing tables lack, such as the pagination index."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def migrate(bind=engine):
+    """
+    Create missing tables, add missing columns and indexes, then record SCHEMA_VERSION. When
+    the calculation_stats summary is created, it is backfilled from the existing calculations.
+
+    The version is written last, in the same transaction as the columns, indexes and backfill,
+    so a database is only marked current once all of them are in place: FAST_START workers
+    trust the version and never repair the schema themselves. Run once per deployment
+    (python -m app.database_init) before starting the workers.
+    """
+    has_stats = inspect(bind).has_table(CalculationStats.__tablename__)
+    Base.metadata.create_all(bind=bind)
+    table = SchemaVersion.__table__
+    with bind.begin() as connection:
+        _add_missing_columns(connection)
+        _add_missing_indexes(connection)
+        if not has_stats:
+            CalculationStats.rebuild(connection)
+        connection.execute(delete(table))
+        connection.execute(insert(table).values(version=SCHEMA_VERSION))
+
+def check_schema_version(bind=engine) -> int:
+    """
+    Verify with a single query that the database was migrated to SCHEMA_VERSION.
+
+    Raises:
+        SchemaVersionError: If the version differs or was never recorded
+    """
+    try:
+        with bind.connect() as connection:
+            version = connection.execute(select(SchemaVersion.version)).scalar()
+    except DBAPIError as e:
+        raise SchemaVersionError(
+            "The database has no schema version; run `python -m app.database_init` first."
+        ) from e
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"The database schema is at version {version}, this code expects {SCHEMA_VERSION}; "
+            "run `python -m app.database_init`."
+        )
+    return version
+
+def rebuild_calculation_stats(bind=engine):
+    """Recompute the calculation_stats summary from the calculations table."""
+    with bind.begin() as connection:
+        CalculationStats.rebuild(connection)
+
+def pack_calculation_inputs(bind=engine, batch_size: int = 1000) -> int:
+    """
+    Convert calculations whose inputs are stored as JSON to the packed format, a batch per
+    transaction, and return the number of rows converted. Rows whose inputs cannot be packed
+    stay JSON; both formats are readable, so this can run while the application serves.
+    """
+    table = Calculation.__table__
+    converted = 0
+    last_id = None
+    while True:
+        statement = (
+            select(table.c.id, table.c.inputs_json)
+            .where(table.c.inputs_packed.is_(None))
+            .order_by(table.c.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            statement = statement.where(table.c.id > last_id)
+        with bind.begin() as connection:
+            rows = connection.execute(statement).all()
+            for row in rows:
+                values = encode_inputs(row.inputs_json, format="packed")
+                if values["inputs_packed"] is not None:
+                    # A change of storage format is not an edit: keep updated_at
+                    connection.execute(
+                        update(table)
+                        .where(table.c.id == row.id, table.c.inputs_packed.is_(None))
+                        .values(**values, updated_at=table.c.updated_at)
+                    )
+                    converted += 1
+        if len(rows) < batch_size:
+            return converted
+        last_id = rows[-1].id
+
+async def migrate_token_blacklist() -> int:
+    """Copy blacklist entries stored under bare JTIs to namespaced keys, then close the client."""
+    from app.auth.redis import close_redis, migrate_legacy_blacklist
+    try:
+        return await migrate_legacy_blacklist()
+    finally:
+        await close_redis()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Migrate the database to the schema of this code.")
+    parser.add_argument("--pack-inputs", action="store_true",
+                        help="Also convert JSON calculation inputs to the packed float64 format")
+    parser.add_argument("--migrate-blacklist", action="store_true",
+                        help="Also copy Redis blacklist entries stored under bare JTIs to namespaced keys")
+    parser.add_argument("--rebuild-stats", action="store_true",
+                        help="Also recompute the calculation_stats summary from the calculations")
+    options = parser.parse_args(argv)
+    migrate()
+    if options.rebuild_stats:
+        rebuild_calculation_stats()
+        print("Rebuilt the calculation stats.")
+    if options.pack_inputs:
+        print(f"Packed the inputs of {pack_calculation_inputs()} calculation(s).")
+    if options.migrate_blacklist:
+        print(f"Migrated {asyncio.run(migrate_token_blacklist())} blacklisted token(s).")
+
 if __name__ == "__main__":
-    init_db() # pragma: no cover
\ No newline at end of file
+    main() # pragma: no cover
@@ -0,0 +1,109 @@
+# app/export.py
+"""
+Streaming serializers for exporting a user's calculation history.
+
+Rows are consumed from a server-side cursor and encoded a chunk at a time, so memory use does
+not grow with the size of the history and the first bytes are sent as soon as the first
+chunk of rows has been fetched.
+"""
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, Iterable, Iterator
+
+from app.models.calculation import decode_inputs, unpack_floats
+
+# Rows fetched per round trip from the server-side cursor, and rows encoded per chunk.
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [
+    "id", "user_id", "type", "inputs", "expression", "axis", "precision", "result", "result_exact", "results",
+    "created_at", "updated_at",
+]
+
+class ExportFormat(str, Enum):
+    """Supported export formats"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+def _record(row) -> dict:
+    return {
+        "id": str(row.id),
+        "user_id": str(row.user_id),
+        "type": row.type,
+        "inputs": decode_inputs(row.inputs_json, row.inputs_packed, row.inputs_width),
+        "expression": row.expression,
+        "axis": row.axis,
+        "precision": row.precision,
+        "result": row.result,
+        "result_exact": None if row.result_exact is None else str(row.result_exact),
+        "results": unpack_floats(row.result_vector),
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+    }
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _ndjson_chunk(chunk: list) -> str:
+    return "".join(json.dumps(_record(row)) + "\n" for row in chunk)
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+def _csv_chunk(chunk: list) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chunk:
+        record = _record(row)
+        record["inputs"] = json.dumps(record["inputs"])
+        if record["results"] is not None:
+            record["results"] = json.dumps(record["results"])
+        writer.writerow(record[field] for field in EXPORT_FIELDS)
+    return buffer.getvalue()
+
+def iter_ndjson(rows: Iterable, chunk_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON, one object per line."""
+    for chunk in _chunks(rows, chunk_size):
+        yield _ndjson_chunk(chunk)
+
+def iter_csv(rows: Iterable, chunk_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Encode rows as CSV with a header line; inputs and results are written as JSON arrays."""
+    yield _csv_header()
+    for chunk in _chunks(rows, chunk_size):
+        yield _csv_chunk(chunk)
+
+EXPORT_ENCODERS = {
+    ExportFormat.NDJSON: iter_ndjson,
+    ExportFormat.CSV: iter_csv,
+}
+
+_CHUNK_ENCODERS = {
+    ExportFormat.NDJSON: _ndjson_chunk,
+    ExportFormat.CSV: _csv_chunk,
+}
+
+async def aiter_export(
+    format: ExportFormat, result, chunk_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """Encode the rows of a streamed AsyncResult in the given format."""
+    if format == ExportFormat.CSV:
+        yield _csv_header()
+    encode = _CHUNK_ENCODERS[format]
+    async for chunk in result.partitions(chunk_size):
+        yield encode(chunk)
@@ -1,33 +1,83 @@
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
-from uuid import UUID
-from typing import List
-from fastapi import Body, FastAPI, Depends, HTTPException, status
+from uuid import UUID, uuid4
+from typing import List, Optional
+from fastapi import APIRouter, Body, FastAPI, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth.dependencies import get_current_active_user
-from app.models.calculation import Calculation
+from app.auth.bloom import revoked_tokens
+from app.auth.cache import principal_cache
+from app.auth.dependencies import get_current_active_user, get_current_active_user_async
+from app.auth.password_service import PasswordServiceBusy, password_service
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, HistogramFamily, MetricsMiddleware, render_metrics
+from app.models.calculation import Calculation, decode_inputs, encode_inputs, pack_floats, unpack_floats
+from app.models.calculation_stats import CalculationStats
 from app.models.user import User
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate
+from app.operations.result_cache import result_cache
+from app.schemas.calculation import (
+    CalculationType,
+    is_matrix,
+    CalculationBase,
+    CalculationResponse,
+    CalculationUpdate,
+    CalculationBatchCreate,
+    CalculationBatchResponse,
+    CalculationStatsResponse,
+    CalculationTypeStats,
+)
 from app.schemas.token import TokenResponse
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.database import Base, get_db, engine
+from app import database
+from app.database import get_async_db, get_db, get_pool_stats, engine
+from app.database_init import check_schema_version, migrate
+from app.export import EXPORT_BATCH_SIZE, EXPORT_ENCODERS, EXPORT_MEDIA_TYPES, ExportFormat, aiter_export
+from app.pagination import after_cursor, decode_cursor, encode_cursor, to_naive_utc
+from app.responses import CALCULATION_FIELDS, FastJSONResponse, TimedJSONResponse, calculation_record
 
-# Create tables on startup
+# Create tables on startup, or with FAST_START only check that `python -m app.database_init`
+# has migrated the database, which costs a single query per worker.
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
+    if settings.FAST_START:
+        check_schema_version(engine)
+    else:
+        print("Creating tables...")
+        migrate(engine)
+        print("Tables created successfully!")
     yield
+    password_service.shutdown()
 
 app = FastAPI(
     title="Calculations API",
     description="API for managing calculations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
+app.add_middleware(MetricsMiddleware, router=app.router)
+
+# Auth and calculation routes are registered on one of two routers: the synchronous
+# routes below, or their async counterparts further down when DATABASE_ASYNC is set.
+router = APIRouter()
+async_router = APIRouter()
+
+# ------------------------------------------------------------------------------
+# Error Handlers
+# ------------------------------------------------------------------------------
+@app.exception_handler(PasswordServiceBusy)
+async def password_service_busy_handler(request: Request, exc: PasswordServiceBusy):
+    """Shed password work with a 503 when the bcrypt worker pool is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # ------------------------------------------------------------------------------
 # Health Endpoint
@@ -36,10 +86,86 @@ app = FastAPI(
 def read_health():
     return {"status": "ok"}
 
+@app.get("/health/db-pool", tags=["health"])
+def read_db_pool_stats():
+    """Live connection pool statistics: checked out, overflow and checkout wait times."""
+    stats = {"sync": get_pool_stats(engine)}
+    if database.async_engine is not None:
+        stats["async"] = get_pool_stats(database.async_engine.sync_engine)
+    return stats
+
+@app.get("/health/result-cache", tags=["health"])
+def read_result_cache_stats():
+    """Result cache hit rate, size and evictions."""
+    return result_cache.stats()
+
+# ------------------------------------------------------------------------------
+# Metrics Endpoint
+# ------------------------------------------------------------------------------
+def _component_metrics() -> list:
+    """Families for the caches, password service and pools, read from their live stats."""
+    auth_cache = Counter("auth_cache_lookups_total", "Principal cache lookups by outcome.",
+                         ["outcome"], registry=None)
+    for outcome in ("hits", "misses"):
+        auth_cache.set_total(principal_cache.stats()[outcome], outcome)
+
+    blacklist_filter = Counter("token_blacklist_filter_lookups_total",
+                               "Revoked-token filter lookups by outcome; hits go on to Redis.",
+                               ["outcome"], registry=None)
+    for outcome in ("hits", "misses"):
+        blacklist_filter.set_total(revoked_tokens.stats()[outcome], outcome)
+
+    calc_stats = result_cache.stats()
+    calc_cache = Counter("result_cache_lookups_total", "Result cache lookups by outcome.",
+                         ["outcome"], registry=None)
+    for outcome in ("hits", "redis_hits", "misses"):
+        calc_cache.set_total(calc_stats[outcome], outcome)
+    calc_evictions = Counter("result_cache_evictions_total", "Result cache LRU evictions.",
+                             registry=None)
+    calc_evictions.set_total(calc_stats["evictions"])
+
+    password_stats = password_service.stats()
+    password_pending = Gauge("password_service_pending", "Password hashes and checks queued or running.",
+                             registry=None)
+    password_pending.set(password_stats["pending"])
+    password_rejected = Counter("password_service_rejected_total",
+                                "Password operations shed because the queue was full.", registry=None)
+    password_rejected.set_total(password_stats["rejected"])
+
+    pool_checked_out = Gauge("db_pool_checked_out", "Connections checked out of the pool.",
+                             ["engine"], registry=None)
+    pool_overflow = Gauge("db_pool_overflow", "Connections open beyond the pool size.",
+                          ["engine"], registry=None)
+    pool_timeouts = Counter("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection.",
+                            ["engine"], registry=None)
+    pool_wait = HistogramFamily("db_pool_wait_seconds", "Time spent waiting to check out a connection.",
+                                ["engine"], registry=None)
+    engines = {"sync": engine}
+    if database.async_engine is not None:
+        engines["async"] = database.async_engine.sync_engine
+    for name, pool_engine in engines.items():
+        pool = pool_engine.pool
+        if isinstance(pool, database._TimedCheckoutMixin):
+            pool_checked_out.set(pool.checkedout(), name)
+            pool_overflow.set(pool.overflow(), name)
+            pool_timeouts.set_total(pool.timeouts, name)
+            pool_wait.attach(pool.wait_seconds, name)
+
+    return [auth_cache, blacklist_filter, calc_cache, calc_evictions, password_pending, password_rejected,
+            pool_checked_out, pool_overflow, pool_timeouts, pool_wait]
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["health"])
+def read_metrics():
+    """Request, phase and component metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        render_metrics(*_component_metrics()),
+        media_type="text/plain; version=0.0.4",
+    )
+
 # ------------------------------------------------------------------------------
 # User Registration Endpoint
 # ------------------------------------------------------------------------------
-@app.post(
+@router.post(
     "/auth/register", 
     response_model=UserResponse, 
     status_code=status.HTTP_201_CREATED,
@@ -51,7 +177,6 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
     try:
         user = User.register(db, user_data)
         db.commit()
-        db.refresh(user)
         return user
     except ValueError as e:
         db.rollback()
@@ -60,7 +185,7 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
 # ------------------------------------------------------------------------------
 # User Login Endpoints
 # ------------------------------------------------------------------------------
-@app.post("/auth/login", response_model=TokenResponse, tags=["auth"])
+@router.post("/auth/login", response_model=TokenResponse, tags=["auth"])
 def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
     """Login with JSON payload"""
     auth_result = User.authenticate(db, user_login.username, user_login.password)
@@ -71,8 +196,12 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = auth_result["user"]
     db.commit()  # Commit the last_login update
+    return _token_response(auth_result)
+
+def _token_response(auth_result: dict) -> TokenResponse:
+    """Build the login response from the result of User.authenticate."""
+    user = auth_result["user"]
 
     # Ensure expires_at is timezone-aware
     expires_at = auth_result.get("expires_at")
@@ -95,7 +224,7 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
         is_verified=user.is_verified
     )
 
-@app.post("/auth/token", tags=["auth"])
+@router.post("/auth/token", tags=["auth"])
 def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login with form data for Swagger UI"""
     auth_result = User.authenticate(db, form_data.username, form_data.password)
@@ -113,9 +242,22 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
 
 # ------------------------------------------------------------------------------
 # Calculations Endpoints (BREAD)
+def _compute(calculation: Calculation) -> None:
+    """
+    Set a calculation's result: through the result cache in float64, also as result_exact in
+    the exact precision modes, or as result_vector for matrix inputs.
+    """
+    if calculation.axis is not None:
+        calculation.result_vector = pack_floats(calculation.get_results())
+    elif calculation.precision != "float64":
+        calculation.result_exact = calculation.get_exact_result()
+        calculation.result = float(calculation.result_exact)
+    else:
+        calculation.result = result_cache.get_result(calculation)
+
 # ------------------------------------------------------------------------------
 # Create (Add) Calculation – using CalculationBase so that 'user_id' from the client is ignored.
-@app.post(
+@router.post(
     "/calculations",
     response_model=CalculationResponse,
     status_code=status.HTTP_201_CREATED,
@@ -138,13 +280,18 @@ def create_calculation(
             calculation_type=calculation_data.type,
             user_id=current_user.id,
             inputs=calculation_data.inputs,
+            expression=calculation_data.expression,
+            axis=calculation_data.axis,
+            precision=calculation_data.precision,
         )
-        new_calculation.result = new_calculation.get_result()
+        _compute(new_calculation)
 
-        # Persist the calculation to the database.
+        # Persist the calculation, and its contribution to the user's stats, together.
         db.add(new_calculation)
+        CalculationStats.record_created(
+            db, current_user.id, {new_calculation.type: [new_calculation.result]}, datetime.utcnow()
+        )
         db.commit()
-        db.refresh(new_calculation)
         return new_calculation
 
     except ValueError as e:
@@ -154,17 +301,212 @@ def create_calculation(
             detail=str(e)
         )
 
+# Batch Create Calculations – many items, one bulk INSERT, one transaction.
+@router.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+def create_calculations_batch(
+    batch: CalculationBatchCreate,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Compute and persist many calculations at once.
+
+    Every item is validated and computed on its own, so an invalid item (for example a division
+    by zero) is reported in its result entry without aborting the others. All valid items are
+    written with a single bulk INSERT and committed together.
+    """
+    now = datetime.utcnow()
+    rows = []
+    results = []
+    for index, item in enumerate(batch.items):
+        try:
+            calculation_data = CalculationBase.model_validate(item)
+            calculation = Calculation.create(
+                calculation_type=calculation_data.type,
+                user_id=current_user.id,
+                inputs=calculation_data.inputs,
+                expression=calculation_data.expression,
+                axis=calculation_data.axis,
+                precision=calculation_data.precision,
+            )
+            _compute(calculation)
+        except ValidationError as e:
+            error = "; ".join(err["msg"] for err in e.errors())
+            results.append({"index": index, "calculation": None, "error": error})
+            continue
+        except ValueError as e:
+            results.append({"index": index, "calculation": None, "error": str(e)})
+            continue
+
+        row = {
+            "id": uuid4(),
+            "user_id": current_user.id,
+            "type": calculation_data.type.value,
+            "inputs_json": calculation.inputs_json,
+            "inputs_packed": calculation.inputs_packed,
+            "inputs_width": calculation.inputs_width,
+            "expression": calculation_data.expression,
+            "axis": calculation.axis,
+            "precision": calculation.precision,
+            "result": calculation.result,
+            "result_exact": calculation.result_exact,
+            "result_vector": calculation.result_vector,
+            "created_at": now,
+            "updated_at": now,
+        }
+        rows.append(row)
+        record = {field: row.get(field) for field in CALCULATION_FIELDS}
+        record["inputs"] = calculation_data.inputs
+        record["results"] = unpack_floats(calculation.result_vector)
+        results.append({"index": index, "calculation": record, "error": None})
+
+    if rows:
+        results_by_type = {}
+        for row in rows:
+            results_by_type.setdefault(row["type"], []).append(row["result"])
+        try:
+            db.execute(insert(Calculation), rows)
+            CalculationStats.record_created(db, current_user.id, results_by_type, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    return FastJSONResponse(
+        {"created": len(rows), "failed": len(results) - len(rows), "results": results},
+        status_code=status.HTTP_201_CREATED,
+    )
+
 # Browse / List Calculations (for the current user)
-@app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
+@router.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
 def list_calculations(
+    limit: int = Query(
+        settings.CALCULATIONS_PAGE_SIZE,
+        ge=1,
+        le=settings.CALCULATIONS_MAX_PAGE_SIZE,
+        description="Maximum number of calculations to return"
+    ),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    type: Optional[CalculationType] = Query(None, description="Only return calculations of this type"),
+    created_after: Optional[datetime] = Query(None, description="Only return calculations created after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only return calculations created before this time"),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    return calculations
+    """
+    Browse the current user's calculations one page at a time, oldest first.
+
+    Pages are ordered by (created_at, id). When more calculations are available, the
+    X-Next-Cursor response header holds the cursor to send back for the next page.
+    """
+    query = db.query(Calculation).filter(Calculation.user_id == current_user.id)
+    if type is not None:
+        query = query.filter(Calculation.type == type.value)
+    if created_after is not None:
+        query = query.filter(Calculation.created_at > to_naive_utc(created_after))
+    if created_before is not None:
+        query = query.filter(Calculation.created_at < to_naive_utc(created_before))
+    if cursor is not None:
+        try:
+            query = query.filter(after_cursor(Calculation.created_at, Calculation.id, decode_cursor(cursor)))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Fetch one extra row to learn whether another page exists.
+    calculations = query.order_by(Calculation.created_at, Calculation.id).limit(limit + 1).all()
+    headers = {}
+    if len(calculations) > limit:
+        calculations = calculations[:limit]
+        last = calculations[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return FastJSONResponse([calculation_record(c) for c in calculations], headers=headers)
+
+# Export the current user's full calculation history as a stream
+@router.get("/calculations/export", tags=["calculations"])
+def export_calculations(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or csv"),
+    type: Optional[CalculationType] = Query(None, description="Only export calculations of this type"),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream every calculation of the current user, oldest first, as NDJSON or CSV.
+
+    Rows are read through a server-side cursor in batches and written out as they arrive,
+    so neither the ORM objects nor the full response body are ever held in memory.
+    """
+    rows = db.execute(_export_statement(current_user.id, type))
+    return StreamingResponse(
+        EXPORT_ENCODERS[format](rows),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="calculations.{format.value}"'},
+    )
+
+def _export_statement(user_id: UUID, type: Optional[CalculationType]):
+    """Streaming SELECT of the columns included in an export."""
+    statement = (
+        select(
+            Calculation.id,
+            Calculation.user_id,
+            Calculation.type,
+            Calculation.inputs_json,
+            Calculation.inputs_packed,
+            Calculation.inputs_width,
+            Calculation.expression,
+            Calculation.axis,
+            Calculation.precision,
+            Calculation.result,
+            Calculation.result_exact,
+            Calculation.result_vector,
+            Calculation.created_at,
+            Calculation.updated_at,
+        )
+        .where(Calculation.user_id == user_id)
+        .order_by(Calculation.created_at, Calculation.id)
+        .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    )
+    if type is not None:
+        statement = statement.where(Calculation.type == type.value)
+    return statement
+
+# Summary statistics of the current user's calculations
+@router.get("/calculations/stats", response_model=CalculationStatsResponse, tags=["calculations"])
+def get_calculation_stats(
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-type count, min/max/average result and last activity for the current user.
+
+    Served from the calculation_stats summary kept up to date by the write endpoints, so the
+    cost does not depend on the size of the user's history.
+    """
+    rows = db.query(CalculationStats).filter(CalculationStats.user_id == current_user.id).all()
+    types = [
+        CalculationTypeStats(
+            type=row.type,
+            count=row.count,
+            min_result=row.min_result,
+            max_result=row.max_result,
+            avg_result=row.total / row.count,
+            last_activity=row.last_activity,
+        )
+        for row in sorted(rows, key=lambda row: row.type)
+        if row.count > 0
+    ]
+    return CalculationStatsResponse(
+        total_count=sum(t.count for t in types),
+        last_activity=max((row.last_activity for row in rows), default=None),
+        types=types,
+    )
 
 # Read / Retrieve a Specific Calculation by ID
-@app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+@router.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def get_calculation(
     calc_id: str,
     current_user = Depends(get_current_active_user),
@@ -180,37 +522,97 @@ def get_calculation(
     ).first()
     if not calculation:
         raise HTTPException(status_code=404, detail="Calculation not found.")
-    return calculation
+    return FastJSONResponse(calculation_record(calculation))
 
 # Edit / Update a Calculation
-@app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+def _calculation_response(row) -> CalculationResponse:
+    """CalculationResponse for a row of the calculations table returned by UPDATE ... RETURNING."""
+    fields = dict(row)
+    fields["inputs"] = decode_inputs(fields.pop("inputs"), fields.pop("inputs_packed"), fields.pop("inputs_width"))
+    fields["results"] = unpack_floats(fields.pop("result_vector"))
+    return CalculationResponse(**fields)
+
+@router.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def update_calculation(
     calc_id: str,
     calculation_update: CalculationUpdate,
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    """
+    Update a calculation's inputs (and an expression calculation's formula) and its result.
+
+    The result depends on the row's type, expression, axis and precision, and is computed in
+    Python, so the update takes two statements: a SELECT ... FOR UPDATE of those columns and
+    the current result (needed for the stats summary), then one UPDATE ... RETURNING with the
+    result computed once, under the row's own type. A missing calculation is a 404 after the
+    SELECT alone; inputs its type rejects are a 400 and nothing is written. The stored inputs
+    are only read when the update does not replace them.
+    """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
+
+    table = Calculation.__table__
+    owned = (table.c.id == calc_uuid, table.c.user_id == current_user.id)
+    columns = [table.c.type, table.c.expression, table.c.axis, table.c.precision, table.c.result]
+    if calculation_update.inputs is None:
+        columns += [table.c.inputs_json, table.c.inputs_packed, table.c.inputs_width]
+    current = db.execute(select(*columns).where(*owned).with_for_update()).first()
+    if current is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Calculation not found.")
 
-    if calculation_update.inputs is not None:
-        calculation.inputs = calculation_update.inputs
-        calculation.result = calculation.get_result()
-    calculation.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    values = {"updated_at": now}
+    result = current.result
+    if calculation_update.inputs is not None or calculation_update.expression is not None:
+        try:
+            calculation = _recompute(current, current_user.id, calculation_update)
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        result = calculation.result
+        values.update(
+            encode_inputs(calculation.inputs),
+            expression=calculation.expression,
+            result=calculation.result,
+            result_exact=calculation.result_exact,
+            result_vector=calculation.result_vector,
+        )
+
+    row = db.execute(update(table).where(*owned).values(**values).returning(*table.c)).mappings().first()
+    CalculationStats.record_updated(db, current_user.id, current.type, current.result, result, now)
     db.commit()
-    db.refresh(calculation)
+    return _calculation_response(row)
+
+def _recompute(current, user_id, calculation_update: CalculationUpdate) -> Calculation:
+    """
+    The calculation described by a row's type, expression, axis and precision and the
+    updated inputs and/or expression, with its result computed.
+
+    Raises:
+        ValueError: If the update does not fit the row, or its type rejects the inputs
+    """
+    if calculation_update.expression is not None and current.type != CalculationType.EXPRESSION.value:
+        raise ValueError("Only expression calculations have an expression.")
+    inputs = calculation_update.inputs
+    if inputs is None:
+        inputs = decode_inputs(current.inputs_json, current.inputs_packed, current.inputs_width)
+    if is_matrix(inputs) != (current.axis is not None):
+        raise ValueError(
+            "Matrix calculations need a list of rows." if current.axis else "Inputs must be a list of numbers."
+        )
+    expression = calculation_update.expression if calculation_update.expression is not None else current.expression
+    calculation = Calculation.create(
+        current.type, user_id, inputs, expression=expression, axis=current.axis, precision=current.precision
+    )
+    _compute(calculation)
     return calculation
 
 # Delete a Calculation
-@app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
+@router.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
 def delete_calculation(
     calc_id: str,
     current_user = Depends(get_current_active_user),
@@ -220,16 +622,199 @@ def delete_calculation(
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
+    table = Calculation.__table__
+    deleted = db.execute(
+        delete(table)
+        .where(table.c.id == calc_uuid, table.c.user_id == current_user.id)
+        .returning(table.c.type, table.c.result)
     ).first()
-    if not calculation:
+    if deleted is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Calculation not found.")
-    db.delete(calculation)
+    CalculationStats.record_deleted(db, current_user.id, deleted.type, deleted.result, datetime.utcnow())
     db.commit()
     return None
 
+# ------------------------------------------------------------------------------
+# Async Endpoints (DATABASE_ASYNC)
+# ------------------------------------------------------------------------------
+# The same endpoints served from an AsyncSession. Database work reuses the synchronous
+# route bodies through AsyncSession.run_sync, which runs them on the event loop over the
+# async driver rather than in a threadpool thread. bcrypt is awaited in the password
+# worker pool between database steps so it never blocks the loop.
+@async_router.post(
+    "/auth/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["auth"]
+)
+async def register_async(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user_data = user_create.dict(exclude={"confirm_password"})
+    hashed_password = await password_service.hash_async(user_data["password"])
+    try:
+        user = await db.run_sync(
+            lambda session: User.register(session, user_data, hashed_password=hashed_password)
+        )
+        await db.commit()
+        return user
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+async def _authenticate_async(db: AsyncSession, username_or_email: str, password: str):
+    """Async counterpart of User.authenticate."""
+    user = await db.run_sync(lambda session: User.find_by_login(session, username_or_email))
+    if user is None or not await password_service.verify_async(password, user.password):
+        return None
+    return await db.run_sync(lambda session: User.complete_login(session, user))
+
+@async_router.post("/auth/login", response_model=TokenResponse, tags=["auth"])
+async def login_json_async(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login with JSON payload"""
+    auth_result = await _authenticate_async(db, user_login.username, user_login.password)
+    if auth_result is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await db.commit()  # Commit the last_login update
+    return _token_response(auth_result)
+
+@async_router.post("/auth/token", tags=["auth"])
+async def login_form_async(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Login with form data for Swagger UI"""
+    auth_result = await _authenticate_async(db, form_data.username, form_data.password)
+    if auth_result is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return {
+        "access_token": auth_result["access_token"],
+        "token_type": "bearer"
+    }
+
+@async_router.post(
+    "/calculations",
+    response_model=CalculationResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+async def create_calculation_async(
+    calculation_data: CalculationBase,
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: create_calculation(calculation_data, current_user=current_user, db=session)
+    )
+
+@async_router.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+async def create_calculations_batch_async(
+    batch: CalculationBatchCreate,
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: create_calculations_batch(batch, current_user=current_user, db=session)
+    )
+
+@async_router.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
+async def list_calculations_async(
+    limit: int = Query(
+        settings.CALCULATIONS_PAGE_SIZE,
+        ge=1,
+        le=settings.CALCULATIONS_MAX_PAGE_SIZE,
+        description="Maximum number of calculations to return"
+    ),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    type: Optional[CalculationType] = Query(None, description="Only return calculations of this type"),
+    created_after: Optional[datetime] = Query(None, description="Only return calculations created after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only return calculations created before this time"),
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: list_calculations(
+            limit=limit,
+            cursor=cursor,
+            type=type,
+            created_after=created_after,
+            created_before=created_before,
+            current_user=current_user,
+            db=session,
+        )
+    )
+
+@async_router.get("/calculations/export", tags=["calculations"])
+async def export_calculations_async(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or csv"),
+    type: Optional[CalculationType] = Query(None, description="Only export calculations of this type"),
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    rows = await db.stream(_export_statement(current_user.id, type))
+    return StreamingResponse(
+        aiter_export(format, rows),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="calculations.{format.value}"'},
+    )
+
+@async_router.get("/calculations/stats", response_model=CalculationStatsResponse, tags=["calculations"])
+async def get_calculation_stats_async(
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: get_calculation_stats(current_user=current_user, db=session)
+    )
+
+@async_router.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+async def get_calculation_async(
+    calc_id: str,
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: get_calculation(calc_id, current_user=current_user, db=session)
+    )
+
+@async_router.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+async def update_calculation_async(
+    calc_id: str,
+    calculation_update: CalculationUpdate,
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: update_calculation(
+            calc_id, calculation_update, current_user=current_user, db=session
+        )
+    )
+
+@async_router.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
+async def delete_calculation_async(
+    calc_id: str,
+    current_user = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        lambda session: delete_calculation(calc_id, current_user=current_user, db=session)
+    )
+
+app.include_router(async_router if settings.DATABASE_ASYNC else router)
+
 # ------------------------------------------------------------------------------
 # Main Block to Run the Server
 # ------------------------------------------------------------------------------
@@ -1,2 +1,4 @@
 from .user import User
-from .calculation import Calculation
\ No newline at end of file
+from .calculation import Calculation
+from .calculation_stats import CalculationStats
+from .schema_version import SchemaVersion, SCHEMA_VERSION
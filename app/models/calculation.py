@@ -1,12 +1,96 @@
 # app/models/calculation.py
+from array import array
 from datetime import datetime
+from decimal import Decimal
+import math
+import sys
 import uuid
-from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from typing import List, Optional
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float, Index, Integer, LargeBinary, Numeric
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.ext.declarative import declared_attr
+from app.core.config import settings
 from app.database import Base
+from app.operations import engine
+from app.operations.engine import CalculationRangeError
+from app.operations.exact import reduce_exact
+from app.operations.expression import MAX_EXPRESSION_LENGTH, evaluate as evaluate_expression
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+def pack_floats(values: List[float]) -> bytes:
+    """Pack numbers as little-endian float64, 8 bytes each."""
+    packed = array("d", values)
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+def unpack_floats(data: Optional[bytes]) -> Optional[List[float]]:
+    """Inverse of pack_floats; None stays None. Accepts any bytes-like object (e.g. a memoryview)."""
+    if data is None:
+        return None
+    values = array("d")
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values.tolist()
+
+def encode_inputs(inputs, format: Optional[str] = None) -> dict:
+    """
+    Column values, by attribute name, storing inputs in format ("packed" or "json"; defaults
+    to CALCULATION_INPUTS_FORMAT).
+
+    Packed inputs are the numbers as pack_floats bytes, a matrix row after row with its row
+    length in inputs_width; the JSON column then holds JSON null. Inputs that are not a list
+    of numbers or a rectangular list of rows are kept as JSON, so validation reports them.
+    """
+    json_columns = {"inputs_json": inputs, "inputs_packed": None, "inputs_width": None}
+    if (format or settings.CALCULATION_INPUTS_FORMAT) == "json" or not isinstance(inputs, list):
+        return json_columns
+    width = None
+    values = inputs
+    if inputs and isinstance(inputs[0], list):
+        width = len(inputs[0])
+        if width == 0 or any(not isinstance(row, list) or len(row) != width for row in inputs):
+            return json_columns
+        values = [value for row in inputs for value in row]
+    try:
+        packed = pack_floats(values)
+    except TypeError:
+        return json_columns
+    return {"inputs_json": JSON.NULL, "inputs_packed": packed, "inputs_width": width}
+
+def decode_inputs(inputs_json, inputs_packed: Optional[bytes], inputs_width: Optional[int]):
+    """Inputs from their stored columns, whichever format they were written in."""
+    if inputs_packed is None:
+        return inputs_json
+    values = unpack_floats(inputs_packed)
+    if inputs_width is None:
+        return values
+    return [values[start:start + inputs_width] for start in range(0, len(values), inputs_width)]
+
+class ExactDecimal(TypeDecorator):
+    """NUMERIC on PostgreSQL; elsewhere (SQLite has no exact numeric type) the decimal as text."""
+    impl = Numeric
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Numeric(asdecimal=True))
+        return dialect.type_descriptor(String(100))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, Decimal):
+            return value
+        return Decimal(value)
 
 class AbstractCalculation:
     """Abstract base class for calculations"""
@@ -42,12 +126,74 @@ class AbstractCalculation:
         )
 
     @declared_attr
-    def inputs(cls):
+    def inputs_json(cls):
+        # The "inputs" column: JSON inputs, or JSON null when they are packed
         return Column(
-            JSON, 
+            "inputs",
+            JSON,
+            key="inputs_json",
             nullable=False
         )
 
+    @declared_attr
+    def inputs_packed(cls):
+        # Inputs packed with pack_floats (see encode_inputs)
+        return Column(
+            LargeBinary,
+            nullable=True
+        )
+
+    @declared_attr
+    def inputs_width(cls):
+        # Row length of packed matrix inputs; None for a list of numbers
+        return Column(
+            Integer,
+            nullable=True
+        )
+
+    @hybrid_property
+    def inputs(self):
+        """
+        The inputs, read from the JSON column or decoded from the packed one. Decoded inputs
+        are kept on the instance until the packed column changes, so the result key, the
+        result and the response of one request share a single decode.
+        """
+        packed, width = self.inputs_packed, self.inputs_width
+        if packed is None:
+            return self.inputs_json
+        cached = getattr(self, "_decoded_inputs", None)
+        if cached is None or cached[0] is not packed or cached[1] != width:
+            cached = (packed, width, decode_inputs(None, packed, width))
+            self._decoded_inputs = cached
+        return cached[2]
+
+    @inputs.inplace.setter
+    def _inputs_setter(self, value) -> None:
+        self._decoded_inputs = None
+        for attribute, column_value in encode_inputs(value).items():
+            setattr(self, attribute, column_value)
+
+    @inputs.inplace.expression
+    @classmethod
+    def _inputs_expression(cls):
+        # SQL sees only the JSON column, which is null for packed inputs
+        return cls.inputs_json
+
+    @declared_attr
+    def expression(cls):
+        return Column(
+            String(MAX_EXPRESSION_LENGTH),
+            nullable=True
+        )
+
+    @declared_attr
+    def axis(cls):
+        # Matrix calculations only: "rows" for a result per row, "columns" for one per column
+        return Column(
+            String(10),
+            nullable=True
+        )
+
     @declared_attr
     def result(cls):
         return Column(
@@ -55,6 +201,32 @@ class AbstractCalculation:
             nullable=True
         )
 
+    @declared_attr
+    def precision(cls):
+        # "float64", or an exact mode of app.operations.exact: "decimal" or "rational"
+        return Column(
+            String(10),
+            nullable=False,
+            default="float64",
+            server_default="float64"
+        )
+
+    @declared_attr
+    def result_exact(cls):
+        # Exact result of decimal and rational calculations; result holds it as a float
+        return Column(
+            ExactDecimal,
+            nullable=True
+        )
+
+    @declared_attr
+    def result_vector(cls):
+        # Matrix calculations only: the per-lane results, packed with pack_floats
+        return Column(
+            LargeBinary,
+            nullable=True
+        )
+
     @declared_attr
     def created_at(cls):
         return Column(
@@ -76,29 +248,93 @@ class AbstractCalculation:
     def user(cls):
         return relationship("User", back_populates="calculations")
 
+    # Whether the result depends on more than the inputs (see Expression)
+    needs_expression = False
+    # engine.reduce_lanes operation applied to matrix inputs; None if matrices are not supported
+    operation = None
+
     @classmethod
-    def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float]) -> "Calculation":
+    def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float],
+               expression: Optional[str] = None, axis: Optional[str] = None,
+               precision: str = "float64") -> "Calculation":
         """Factory method to create calculations"""
         calculation_classes = {
             'addition': Addition,
             'subtraction': Subtraction,
             'multiplication': Multiplication,
             'division': Division,
+            'expression': Expression,
         }
         calculation_class = calculation_classes.get(calculation_type.lower())
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
-        return calculation_class(user_id=user_id, inputs=inputs)
+        if axis is not None:
+            axis = axis.lower()
+            if axis not in ("rows", "columns"):
+                raise ValueError(f"Unsupported axis: {axis}")
+            if calculation_class.operation is None:
+                raise ValueError(f"{calculation_class.__name__} calculations do not take matrix inputs.")
+        precision = precision.lower()
+        if precision not in ("float64", "decimal", "rational"):
+            raise ValueError(f"Unsupported precision mode: {precision}")
+        if precision != "float64" and (calculation_class.operation is None or axis is not None):
+            raise ValueError("Only addition, subtraction, multiplication and division of a list of "
+                             "numbers have exact precision modes.")
+        if calculation_class.needs_expression:
+            return calculation_class(user_id=user_id, inputs=inputs, expression=expression, precision=precision)
+        if expression is not None:
+            raise ValueError("Only expression calculations take an expression.")
+        return calculation_class(user_id=user_id, inputs=inputs, axis=axis, precision=precision)
 
     def get_result(self) -> float:
         """Method to compute calculation result"""
         raise NotImplementedError
 
+    def get_results(self) -> List[float]:
+        """Compute the per-row (or per-column, see axis) results of matrix inputs"""
+        if self.operation is None:
+            raise ValueError(f"{self.type} calculations do not take matrix inputs.")
+        inputs = self.inputs
+        if not isinstance(inputs, list) or not all(isinstance(row, list) for row in inputs):
+            raise ValueError("Matrix inputs must be a list of rows.")
+        by_columns = self.axis == "columns"
+        operands = len(inputs) if by_columns else len(inputs[0]) if inputs else 0
+        if operands < 2:
+            raise ValueError(f"Each {'column' if by_columns else 'row'} needs at least two numbers.")
+        try:
+            return engine.reduce_lanes(self.operation, inputs, by_columns=by_columns)
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+
+    def get_exact_result(self) -> Decimal:
+        """Compute the result in the calculation's decimal or rational precision mode"""
+        if self.operation is None:
+            raise ValueError(f"{self.type} calculations have no exact precision modes.")
+        inputs = self.inputs
+        if not isinstance(inputs, list) or len(inputs) < 2:
+            raise ValueError("Inputs must be a list with at least two numbers.")
+        try:
+            result = reduce_exact(self.operation, inputs, self.precision)
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+        if not math.isfinite(float(result)):
+            raise CalculationRangeError("Result overflows the float64 range.")
+        return result
+
+    @property
+    def results(self) -> Optional[List[float]]:
+        """Per-lane results of a matrix calculation, unpacked from result_vector"""
+        return unpack_floats(self.result_vector)
+
     def __repr__(self):
         return f"<Calculation(type={self.type}, inputs={self.inputs})>"
 
 class Calculation(Base, AbstractCalculation):
     """Base calculation model"""
+    # Serves keyset pagination of a user's history ordered by (created_at, id)
+    __table_args__ = (
+        Index("ix_calculations_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     __mapper_args__ = {
         "polymorphic_on": "type",
         "polymorphic_identity": "calculation",
@@ -108,54 +344,67 @@ class Calculation(Base, AbstractCalculation):
 class Addition(Calculation):
     """Addition calculation"""
     __mapper_args__ = {"polymorphic_identity": "addition"}
+    operation = "add"
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        inputs = self.inputs
+        if not isinstance(inputs, list):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        return sum(self.inputs)
+        return engine.add(inputs)
 
 class Subtraction(Calculation):
     """Subtraction calculation"""
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
+    operation = "subtract"
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        inputs = self.inputs
+        if not isinstance(inputs, list):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+        return engine.subtract(inputs)
 
 class Multiplication(Calculation):
     """Multiplication calculation"""
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
+    operation = "multiply"
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        inputs = self.inputs
+        if not isinstance(inputs, list):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
-        for value in self.inputs:
-            result *= value
-        return result
+        return engine.multiply(inputs)
 
 class Division(Calculation):
     """Division calculation"""
     __mapper_args__ = {"polymorphic_identity": "division"}
+    operation = "divide"
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        inputs = self.inputs
+        if not isinstance(inputs, list):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero.")
-            result /= value
-        return result
+        try:
+            return engine.divide(inputs)
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+
+class Expression(Calculation):
+    """Arithmetic expression over named variables, bound to the inputs in order"""
+    __mapper_args__ = {"polymorphic_identity": "expression"}
+    needs_expression = True
+
+    def get_result(self) -> float:
+        inputs = self.inputs
+        if not isinstance(inputs, list):
+            raise ValueError("Inputs must be a list of numbers.")
+        if not self.expression:
+            raise ValueError("Expression calculations need an expression.")
+        return evaluate_expression(self.expression, inputs)
@@ -0,0 +1,182 @@
+# app/models/calculation_stats.py
+from datetime import datetime
+from typing import Iterable, Optional, Union
+import uuid
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models.calculation import Calculation
+
+class CalculationStats(Base):
+    """
+    Per-user, per-type summary of calculation results.
+
+    Rows are maintained incrementally by the write endpoints, in the same transaction as the
+    calculation they describe, so the stats endpoint reads a handful of rows instead of
+    aggregating the user's whole history. The running total gives the average; the minimum
+    and maximum are only recomputed from the calculations table when the value leaving the
+    set was the current extremum.
+
+    Matrix calculations have no single result and are left out of the summary.
+    """
+    __tablename__ = "calculation_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    type = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    min_result = Column(Float, nullable=True)
+    max_result = Column(Float, nullable=True)
+    last_activity = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def _insert(cls, db: Session):
+        """INSERT construct supporting ON CONFLICT for the session's dialect."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(cls.__table__)
+        if dialect == "sqlite":
+            return sqlite.insert(cls.__table__)
+        raise NotImplementedError(f"Calculation stats upserts are not supported on {dialect}")
+
+    @staticmethod
+    def _extremum_query(user_id: uuid.UUID, calculation_type: str, aggregate):
+        calculations = Calculation.__table__
+        return (
+            select(aggregate(calculations.c.result))
+            .where(calculations.c.user_id == user_id, calculations.c.type == calculation_type)
+            .scalar_subquery()
+        )
+
+    @classmethod
+    def record_created(cls, db: Session, user_id: uuid.UUID, results_by_type: dict, at: datetime) -> None:
+        """
+        Add new calculations to the summary with one upsert.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: Owner of the calculations
+            results_by_type: Calculation type -> results of the calculations created (None for
+                matrix calculations, which are skipped)
+            at: Time of the change
+        """
+        results_by_type = {
+            calculation_type: [result for result in results if result is not None]
+            for calculation_type, results in results_by_type.items()
+        }
+        rows = [
+            {
+                "user_id": user_id,
+                "type": calculation_type,
+                "count": len(results),
+                "total": sum(results),
+                "min_result": min(results),
+                "max_result": max(results),
+                "last_activity": at,
+            }
+            for calculation_type, results in results_by_type.items()
+            if results
+        ]
+        if not rows:
+            return
+        table = cls.__table__
+        statement = cls._insert(db).values(rows)
+        new = statement.excluded
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.type],
+            set_={
+                "count": table.c.count + new.count,
+                "total": table.c.total + new.total,
+                "min_result": case(
+                    (table.c.min_result.is_(None), new.min_result),
+                    (new.min_result < table.c.min_result, new.min_result),
+                    else_=table.c.min_result,
+                ),
+                "max_result": case(
+                    (table.c.max_result.is_(None), new.max_result),
+                    (new.max_result > table.c.max_result, new.max_result),
+                    else_=table.c.max_result,
+                ),
+                "last_activity": new.last_activity,
+            },
+        ))
+
+    @classmethod
+    def record_updated(cls, db: Session, user_id: uuid.UUID, calculation_type: str,
+                       old_result: Optional[float], new_result: Optional[float], at: datetime) -> None:
+        """
+        Replace one result in the summary. Must run after the calculation row is updated.
+        """
+        table = cls.__table__
+        values = {"last_activity": at}
+        if old_result is not None and new_result is not None and old_result != new_result:
+            values["total"] = table.c.total - old_result + new_result
+            values["min_result"] = case(
+                (table.c.min_result.is_(None), new_result),
+                (table.c.min_result > new_result, new_result),
+                (table.c.min_result == old_result, cls._extremum_query(user_id, calculation_type, func.min)),
+                else_=table.c.min_result,
+            )
+            values["max_result"] = case(
+                (table.c.max_result.is_(None), new_result),
+                (table.c.max_result < new_result, new_result),
+                (table.c.max_result == old_result, cls._extremum_query(user_id, calculation_type, func.max)),
+                else_=table.c.max_result,
+            )
+        db.execute(
+            update(table).where(table.c.user_id == user_id, table.c.type == calculation_type).values(**values)
+        )
+
+    @classmethod
+    def record_deleted(cls, db: Session, user_id: uuid.UUID, calculation_type: str,
+                       result: Optional[float], at: datetime) -> None:
+        """
+        Remove one result from the summary. Must run after the calculation row is deleted.
+        """
+        table = cls.__table__
+        values = {"last_activity": at}
+        if result is not None:
+            values["count"] = table.c.count - 1
+            values["total"] = table.c.total - result
+            values["min_result"] = case(
+                (table.c.min_result == result, cls._extremum_query(user_id, calculation_type, func.min)),
+                else_=table.c.min_result,
+            )
+            values["max_result"] = case(
+                (table.c.max_result == result, cls._extremum_query(user_id, calculation_type, func.max)),
+                else_=table.c.max_result,
+            )
+        db.execute(
+            update(table).where(table.c.user_id == user_id, table.c.type == calculation_type).values(**values)
+        )
+
+    @classmethod
+    def rebuild(cls, db: Union[Session, Connection], user_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """
+        Recompute the summary from the calculations table, for all users or only the given ones.
+
+        Used to backfill calculations written before the summary existed.
+        """
+        table = cls.__table__
+        calculations = Calculation.__table__
+        aggregate = select(
+            calculations.c.user_id,
+            calculations.c.type,
+            func.count(),
+            func.coalesce(func.sum(calculations.c.result), 0.0),
+            func.min(calculations.c.result),
+            func.max(calculations.c.result),
+            func.max(calculations.c.updated_at),
+        ).where(calculations.c.result.is_not(None)).group_by(calculations.c.user_id, calculations.c.type)
+        clear = delete(table)
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            aggregate = aggregate.where(calculations.c.user_id.in_(user_ids))
+            clear = clear.where(table.c.user_id.in_(user_ids))
+        db.execute(clear)
+        db.execute(insert(table).from_select(
+            ["user_id", "type", "count", "total", "min_result", "max_result", "last_activity"], aggregate,
+        ))
@@ -0,0 +1,19 @@
+# app/models/schema_version.py
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+# Version of the tables declared by the models. Bump it whenever they change, so workers
+# started in FAST_START mode refuse to serve a database that was not migrated.
+#   1: initial tables
+#   2: calculations.expression
+#   3: calculations.axis, calculations.result_vector
+#   4: calculations.inputs_packed, calculations.inputs_width
+#   5: calculations.precision, calculations.result_exact
+#   6: indexes missing from existing tables (ix_calculations_user_id_created_at_id)
+SCHEMA_VERSION = 6
+
+class SchemaVersion(Base):
+    """Single-row table holding the schema version the database was migrated to."""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
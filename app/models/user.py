@@ -2,15 +2,22 @@
 
 import uuid
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 from sqlalchemy import Column, String, Boolean, DateTime, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
+from jose import JWTError
+from app.auth.tokens import token_service
 from app.core.config import get_settings
 from app.database import Base
 from app.models.calculation import Calculation
+from app.schemas.token import TokenType
 
 settings = get_settings()
 
+ACCESS_LIFETIME = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_LIFETIME = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
 def utcnow():
     """Helper function to get current UTC datetime"""
     return datetime.now(timezone.utc)
@@ -81,9 +88,12 @@ class User(Base):
             
         Returns:
             bool: True if password matches, False otherwise
+
+        Raises:
+            PasswordServiceBusy: If the password worker pool queue is full
         """
-        from app.auth.jwt import verify_password
-        return verify_password(plain_password, self.password)
+        from app.auth.password_service import password_service
+        return password_service.verify(plain_password, self.password)
 
     @classmethod
     def hash_password(cls, password: str) -> str:
@@ -95,18 +105,22 @@ class User(Base):
             
         Returns:
             str: The hashed password
+
+        Raises:
+            PasswordServiceBusy: If the password worker pool queue is full
         """
-        from app.auth.jwt import get_password_hash
-        return get_password_hash(password)
+        from app.auth.password_service import password_service
+        return password_service.hash(password)
 
     @classmethod
-    def register(cls, db, user_data: dict):
+    def register(cls, db, user_data: dict, hashed_password: Optional[str] = None):
         """
         Register a new user.
 
         Args:
             db: SQLAlchemy database session
             user_data: Dictionary containing user registration data
+            hashed_password: Hash of user_data["password"], if the caller already computed it
             
         Returns:
             User: The newly created user instance
@@ -126,7 +140,8 @@ class User(Base):
             raise ValueError("Username or email already exists")
         
         # Create new user instance
-        hashed_password = cls.hash_password(password)
+        if hashed_password is None:
+            hashed_password = cls.hash_password(password)
         user = cls(
             first_name=user_data["first_name"],
             last_name=user_data["last_name"],
@@ -152,13 +167,41 @@ class User(Base):
         Returns:
             dict: Authentication result with tokens and user data, or None if authentication fails
         """
-        user = db.query(cls).filter(
-            or_(cls.username == username_or_email, cls.email == username_or_email)
-        ).first()
+        user = cls.find_by_login(db, username_or_email)
 
         if not user or not user.verify_password(password):
             return None
 
+        return cls.complete_login(db, user)
+
+    @classmethod
+    def find_by_login(cls, db, username_or_email: str):
+        """
+        Look up a user by username or email.
+        
+        Args:
+            db: SQLAlchemy database session
+            username_or_email: Username or email to look up
+            
+        Returns:
+            User: The matching user, or None
+        """
+        return db.query(cls).filter(
+            or_(cls.username == username_or_email, cls.email == username_or_email)
+        ).first()
+
+    @classmethod
+    def complete_login(cls, db, user: "User"):
+        """
+        Record a successful login for a user whose password has been verified and issue tokens.
+        
+        Args:
+            db: SQLAlchemy database session
+            user: The authenticated user
+            
+        Returns:
+            dict: Authentication result with tokens and user data
+        """
         # Update the last_login timestamp
         user.last_login = utcnow()
         db.flush()
@@ -187,9 +230,7 @@ class User(Base):
         Returns:
             str: JWT access token
         """
-        from app.auth.jwt import create_token
-        from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.ACCESS)
+        return token_service.mint(data["sub"], TokenType.ACCESS, ACCESS_LIFETIME)
 
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
@@ -202,9 +243,7 @@ class User(Base):
         Returns:
             str: JWT refresh token
         """
-        from app.auth.jwt import create_token
-        from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.REFRESH)
+        return token_service.mint(data["sub"], TokenType.REFRESH, REFRESH_LIFETIME)
 
     @classmethod
     def verify_token(cls, token: str):
@@ -217,10 +256,10 @@ class User(Base):
         Returns:
             UUID: User ID if token is valid, None otherwise
         """
-        from app.core.config import settings
-        from jose import jwt, JWTError
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+            payload = token_service.verify(token, TokenType.ACCESS)
+            if payload.get("type") != TokenType.ACCESS.value:
+                return None
             sub = payload.get("sub")
             if sub is None:
                 return None
@@ -1,19 +1,23 @@
-import operator
-from functools import reduce
+from typing import Optional
+
+from app.operations import engine, expression as expressions
 from app.schemas.calculation import CalculationType
 
-# Map the new Enum to operators
+# Map the new Enum to the numeric kernels
 CALCULATION_OPERATIONS = {
-    CalculationType.ADDITION: operator.add,
-    CalculationType.SUBTRACTION: operator.sub,
-    CalculationType.MULTIPLICATION: operator.mul,
-    CalculationType.DIVISION: operator.truediv,
+    CalculationType.ADDITION: engine.add,
+    CalculationType.SUBTRACTION: engine.subtract,
+    CalculationType.MULTIPLICATION: engine.multiply,
+    CalculationType.DIVISION: engine.divide,
+    # Called with the expression text as well: evaluate(expression, inputs)
+    CalculationType.EXPRESSION: expressions.evaluate,
 }
 
-def perform_calculation(inputs: list[float], type: str) -> float:
+def perform_calculation(inputs: list[float], type: str, expression: Optional[str] = None) -> float:
     """
     Performs calculation on a list of numbers.
     Example: inputs=[10, 5], type="subtraction" -> 10 - 5 = 5
+    Example: inputs=[3, 4], type="expression", expression="sqrt(a**2 + b**2)" -> 5
     """
     # 1. Validate Type
     try:
@@ -26,10 +30,15 @@ def perform_calculation(inputs: list[float], type: str) -> float:
     if not operation_func:
         raise ValueError(f"Operation {type} not supported.")
 
-    # 2. Perform Calculation using reduce
+    if calc_type == CalculationType.EXPRESSION:
+        if not expression:
+            raise ValueError("Expression calculations need an expression.")
+        return operation_func(expression, inputs)
+
+    # 2. Perform Calculation as a left fold
     # This allows [10, 5, 2] -> (10 - 5) - 2 = 3
     try:
-        result = reduce(operation_func, inputs)
+        result = operation_func(inputs)
         return result
     except ZeroDivisionError:
-        raise ValueError("Cannot divide by zero")
\ No newline at end of file
+        raise ValueError("Cannot divide by zero")
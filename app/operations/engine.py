@@ -0,0 +1,230 @@
+# app/operations/engine.py
+"""
+Numeric kernels for the left-fold calculation types.
+
+Sums (addition, and the subtrahends of a subtraction) are compensated: math.fsum returns the
+correctly rounded sum at every length, so long additions do not drift, and being a single C
+loop it is also faster than converting a long list to an array first.
+
+Products use math.prod, which is faster than converting the list to an array at every
+length. Quotients of short input lists are folded in plain Python; lists of at least
+VECTORIZE_THRESHOLDS["divide"] numbers are converted once into a contiguous float64 array and
+reduced with NumPy. `python -m benchmarks.run --check-thresholds` checks the thresholds
+against both kernels on the machine it runs on. Every path detects zero divisors and reports
+results that leave the float64 range instead of silently returning inf or 0.
+
+Matrix calculations apply an operation to every row (or every column) of a 2-D input. They are
+always vectorized: the matrix is converted once and each lane is reduced by a single NumPy
+call over the whole array, with the same zero-divisor and range checks applied per lane.
+
+NumPy is imported by the first vectorized call rather than with this module: most requests
+never reach the threshold, and the import is the largest part of the application's start-up.
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Shortest input list reduced with NumPy, per operation; None means the scalar kernel is
+# faster at every length.
+VECTORIZE_THRESHOLDS: Dict[str, Optional[int]] = {
+    "add": None,
+    "subtract": None,
+    "multiply": None,
+    "divide": 1024,
+}
+
+class CalculationRangeError(ValueError):
+    """Raised when a finite calculation produces a result outside the float64 range."""
+
+def _as_array(values: Sequence[float]) -> np.ndarray:
+    """Convert inputs to a contiguous float64 array."""
+    import numpy as np
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+def _require_values(values: Sequence[float]) -> None:
+    if len(values) == 0:
+        raise ValueError("Inputs must contain at least one number.")
+
+# ------------------------------------------------------------------------------
+# Compensated sums
+# ------------------------------------------------------------------------------
+def _sum(values) -> float:
+    """Correctly rounded sum, or the plain sum where fsum refuses (inf - inf, intermediate overflow)."""
+    try:
+        return math.fsum(values)
+    except (OverflowError, ValueError):
+        return sum(values)
+
+def _difference(values) -> float:
+    """values[0] minus the compensated sum of the others."""
+    return values[0] - _sum(values[1:])
+
+# ------------------------------------------------------------------------------
+# Scalar kernels
+# ------------------------------------------------------------------------------
+
+def _scalar_divide(values):
+    result = values[0]
+    for value in values[1:]:
+        if value == 0:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        result /= value
+    return result
+
+# ------------------------------------------------------------------------------
+# Vectorized kernels
+# ------------------------------------------------------------------------------
+def _vector_divide(array: np.ndarray) -> float:
+    import numpy as np
+    divisors = array[1:]
+    if not divisors.all():
+        raise ZeroDivisionError("Cannot divide by zero.")
+    # a0 / a1 / ... / an == a0 / (a1 * ... * an), unless the divisor product itself leaves
+    # the float64 range while the sequential quotients would not.
+    with np.errstate(over="raise", under="raise"):
+        try:
+            return float(array[0] / np.prod(divisors))
+        except FloatingPointError:
+            pass
+    return _scalar_divide(array.tolist())
+
+# ------------------------------------------------------------------------------
+# Range checks
+# ------------------------------------------------------------------------------
+def _all_finite(values, array=None) -> bool:
+    if array is not None:
+        import numpy as np
+        return bool(np.isfinite(array).all())
+    return all(math.isfinite(value) for value in values)
+
+def _check_range(result, values, array=None, zero_is_underflow: bool = False):
+    """
+    Raise CalculationRangeError if finite inputs produced a non-finite result (overflow) or,
+    for products and quotients of non-zero inputs, a result of exactly zero (underflow).
+    """
+    if isinstance(result, int):
+        return result
+    if not math.isfinite(result):
+        if _all_finite(values, array):
+            raise CalculationRangeError("Result overflows the float64 range.")
+    elif zero_is_underflow and result == 0:
+        raise CalculationRangeError("Result underflows the float64 range.")
+    return result
+
+# ------------------------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------------------------
+def add(values: Sequence[float]) -> float:
+    """Sum of all inputs, correctly rounded."""
+    _require_values(values)
+    return _check_range(_sum(values), values)
+
+def subtract(values: Sequence[float]) -> float:
+    """First input minus the (correctly rounded) sum of the following inputs."""
+    _require_values(values)
+    return _check_range(_difference(values), values)
+
+def multiply(values: Sequence[float]) -> float:
+    """Product of all inputs."""
+    _require_values(values)
+    return _check_range(math.prod(values), values, zero_is_underflow=0 not in values)
+
+def divide(values: Sequence[float]) -> float:
+    """
+    First input divided by each of the following inputs, left to right.
+
+    Raises:
+        ZeroDivisionError: If any divisor is zero
+    """
+    _require_values(values)
+    if len(values) < VECTORIZE_THRESHOLDS["divide"]:
+        result = _scalar_divide(values)
+        return _check_range(result, values, zero_is_underflow=values[0] != 0)
+    array = _as_array(values)
+    return _check_range(_vector_divide(array), values, array, zero_is_underflow=bool(array[0] != 0))
+
+# ------------------------------------------------------------------------------
+# Matrix kernels: array has one lane per row, operands along axis 1
+# ------------------------------------------------------------------------------
+def _lanes_add(lanes: np.ndarray) -> np.ndarray:
+    """Neumaier-compensated sum of every lane, one vectorized step per operand."""
+    import numpy as np
+    total = lanes[:, 0].copy()
+    compensation = np.zeros_like(total)
+    with np.errstate(invalid="ignore", over="ignore"):
+        for operand in lanes.T[1:]:
+            step = total + operand
+            compensation += np.where(
+                np.abs(total) >= np.abs(operand), (total - step) + operand, (operand - step) + total
+            )
+            total = step
+        # Lanes that overflowed keep the plain (infinite or nan) total
+        return np.where(np.isfinite(total), total + compensation, total)
+
+def _lanes_subtract(lanes: np.ndarray) -> np.ndarray:
+    if lanes.shape[1] == 1:
+        return lanes[:, 0].copy()
+    return lanes[:, 0] - _lanes_add(lanes[:, 1:])
+
+def _lanes_multiply(lanes: np.ndarray) -> np.ndarray:
+    import numpy as np
+    with np.errstate(over="ignore", under="ignore"):
+        return np.prod(lanes, axis=1)
+
+def _lanes_divide(lanes: np.ndarray) -> np.ndarray:
+    import numpy as np
+    divisors = lanes[:, 1:]
+    if not divisors.all():
+        raise ZeroDivisionError("Cannot divide by zero.")
+    with np.errstate(over="ignore", under="ignore"):
+        products = np.prod(divisors, axis=1)
+        results = lanes[:, 0] / products
+    # Lanes whose divisor product left the float64 range are divided sequentially instead
+    for lane in np.flatnonzero(~np.isfinite(products) | (products == 0)):
+        results[lane] = _scalar_divide(lanes[lane].tolist())
+    return results
+
+_LANE_KERNELS = {
+    "add": (_lanes_add, False),
+    "subtract": (_lanes_subtract, False),
+    "multiply": (_lanes_multiply, True),
+    "divide": (_lanes_divide, True),
+}
+
+def reduce_lanes(operation: str, matrix: Sequence[Sequence[float]], by_columns: bool = False) -> List[float]:
+    """
+    Apply operation ("add", "subtract", "multiply" or "divide") to each row of matrix, or to
+    each column if by_columns, folding the lane left to right as the scalar kernels do.
+
+    Raises:
+        ValueError: If the matrix is empty or ragged
+        ZeroDivisionError: If a divisor is zero
+        CalculationRangeError: If a lane of finite inputs leaves the float64 range
+    """
+    import numpy as np
+    kernel, products = _LANE_KERNELS[operation]
+    if len(matrix) == 0 or len(matrix[0]) == 0:
+        raise ValueError("Inputs must contain at least one number.")
+    try:
+        lanes = np.asarray(matrix, dtype=np.float64)
+    except ValueError:
+        raise ValueError("All rows must have the same number of inputs.")
+    if lanes.ndim != 2:
+        raise ValueError("All rows must have the same number of inputs.")
+    lanes = np.ascontiguousarray(lanes.T) if by_columns else lanes
+    results = kernel(lanes)
+
+    finite_lanes = np.isfinite(lanes).all(axis=1)
+    if (~np.isfinite(results) & finite_lanes).any():
+        raise CalculationRangeError("Result overflows the float64 range.")
+    if products:
+        # Products and quotients of non-zero operands (for quotients, a non-zero dividend)
+        # are never exactly zero.
+        nonzero = lanes.all(axis=1) if operation == "multiply" else lanes[:, 0] != 0
+        if ((results == 0) & nonzero).any():
+            raise CalculationRangeError("Result underflows the float64 range.")
+    return results.tolist()
@@ -0,0 +1,76 @@
+# app/operations/exact.py
+"""
+Exact kernels for the decimal and rational precision modes.
+
+Inputs arrive as floats. Each is converted through its shortest representation (str), so the
+input 0.1 is the decimal 0.1 and not the binary 0.1000000000000000055511151231257827...
+
+decimal:  Decimal arithmetic in decimal_context(): DECIMAL_PRECISION significant digits,
+          rounded with DECIMAL_ROUNDING after every operation, as a calculator would.
+rational: Fraction arithmetic, exact at every step; only the final result is rounded, once,
+          to decimal_context(). To four digits, 1 / 3 / 2 is 0.1667 here and 0.1666 in
+          decimal mode.
+
+Rational numerators and denominators grow with every product or quotient, so a fold costs
+time quadratic in the number of inputs; both modes accept at most MAX_EXACT_INPUTS.
+"""
+import math
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow
+from fractions import Fraction
+from functools import reduce
+from operator import add, mul, sub, truediv
+from typing import Sequence
+
+from app.core.config import settings
+from app.schemas.calculation import MAX_EXACT_INPUTS
+
+def decimal_context() -> Context:
+    """The configured context; overflow and invalid operations raise instead of giving inf/NaN."""
+    return Context(
+        prec=settings.DECIMAL_PRECISION,
+        rounding=settings.DECIMAL_ROUNDING,
+        traps=[InvalidOperation, DivisionByZero, Overflow],
+    )
+
+def _decimal_fold(operation: str, values: Sequence[Decimal], context: Context) -> Decimal:
+    if operation == "add":
+        return reduce(context.add, values)
+    if operation == "subtract":
+        return reduce(context.subtract, values)
+    if operation == "multiply":
+        return reduce(context.multiply, values)
+    return reduce(context.divide, values)
+
+_FRACTION_OPERATORS = {"add": add, "subtract": sub, "multiply": mul, "divide": truediv}
+
+def _check_values(values: Sequence[float]) -> None:
+    if len(values) == 0:
+        raise ValueError("Inputs must contain at least one number.")
+    if len(values) > MAX_EXACT_INPUTS:
+        raise ValueError(f"Exact precision modes take at most {MAX_EXACT_INPUTS} inputs.")
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError("Exact precision modes need finite inputs.")
+
+def reduce_exact(operation: str, values: Sequence[float], precision: str) -> Decimal:
+    """
+    Fold values with operation ("add", "subtract", "multiply" or "divide") left to right in
+    the given precision mode ("decimal" or "rational").
+
+    Raises:
+        ValueError: If there are more than MAX_EXACT_INPUTS values, an input is not finite
+            or the precision mode is unknown
+        ZeroDivisionError: If a divisor is zero
+    """
+    _check_values(values)
+    context = decimal_context()
+    if operation == "divide" and any(value == 0 for value in values[1:]):
+        raise ZeroDivisionError("Cannot divide by zero.")
+    try:
+        if precision == "decimal":
+            return _decimal_fold(operation, [Decimal(str(value)) for value in values], context)
+        if precision == "rational":
+            result = reduce(_FRACTION_OPERATORS[operation], [Fraction(str(value)) for value in values])
+            return context.divide(Decimal(result.numerator), Decimal(result.denominator))
+    except Overflow:
+        raise ValueError("Result exceeds the range of the decimal context.")
+    raise ValueError(f"Unsupported precision mode: {precision}")
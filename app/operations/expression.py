@@ -0,0 +1,191 @@
+# app/operations/expression.py
+"""
+Arithmetic expressions over named variables, e.g. "(a + b) / 2" or "sqrt(x**2 + y**2)".
+
+An expression is parsed with the ast module and every node is checked against a small
+whitelist: numeric literals, variables, + - * / // % ** (binary and unary), parentheses and
+calls to the functions in FUNCTIONS. Anything else (attributes, subscripts, comparisons,
+keywords, strings, ...) is rejected. Literals are turned into floats, so an exponent can
+overflow but never build an enormous integer.
+
+The checked tree is compiled once into a Python function taking the variables as positional
+arguments, and compiled expressions are kept in an LRU cache keyed by the expression text:
+evaluating a known formula over new inputs is a cache hit and one function call.
+
+Variables are bound to the inputs in the order they first appear in the expression, so
+"b * a + a" with inputs [2, 3] evaluates with b=2 and a=3. Names of FUNCTIONS and CONSTANTS
+are not variables.
+"""
+import ast
+import math
+from functools import lru_cache
+from typing import Callable, Sequence, Tuple
+
+from app.core.config import settings
+from app.operations.engine import CalculationRangeError
+
+MAX_EXPRESSION_LENGTH = 500
+
+FUNCTIONS = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# Namespace the compiled functions run in: no builtins, only the whitelisted names.
+_GLOBALS = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed or use anything outside the whitelist."""
+
+class CompiledExpression:
+    """
+    A checked expression compiled to a function of its variables.
+
+    Attributes:
+        text: The expression as written
+        variables: Variable names in the order they are bound to inputs
+    """
+    __slots__ = ("text", "variables", "_function")
+
+    def __init__(self, text: str, variables: Tuple[str, ...], function: Callable[..., float]):
+        self.text = text
+        self.variables = variables
+        self._function = function
+
+    def evaluate(self, inputs: Sequence[float]) -> float:
+        """
+        Evaluate the expression with the variables bound to inputs.
+
+        Raises:
+            ValueError: If the number of inputs does not match the variables, or the expression
+                is undefined for them (division by zero, math domain errors, complex results)
+            CalculationRangeError: If finite inputs give a result outside the float64 range
+        """
+        if len(inputs) != len(self.variables):
+            raise ValueError(
+                f"Expression has {len(self.variables)} variable(s) "
+                f"({', '.join(self.variables) or 'none'}) but {len(inputs)} input(s) were given."
+            )
+        try:
+            # Floats, as in the database, so a ** b cannot build an enormous integer either
+            result = self._function(*map(float, inputs))
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+        except OverflowError:
+            raise CalculationRangeError("Result overflows the float64 range.")
+        except TypeError as e:
+            # Calls with the wrong number of arguments, e.g. min() or sqrt(1, 2)
+            raise ValueError(f"Invalid function call: {e}")
+        if isinstance(result, complex):
+            raise ValueError("Expression has no real result for these inputs.")
+        result = float(result)
+        if not math.isfinite(result) and all(math.isfinite(value) for value in inputs):
+            raise CalculationRangeError("Result overflows the float64 range.")
+        return result
+
+class _Checker(ast.NodeTransformer):
+    """Rejects non-whitelisted nodes, collects variables and turns literals into floats."""
+
+    def __init__(self):
+        self.variables = []
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported literal in expression: {node.value!r}")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id in FUNCTIONS:
+            raise ExpressionError(f"Function {node.id} must be called.")
+        if node.id not in CONSTANTS:
+            if node.id.startswith("_"):
+                raise ExpressionError(f"Invalid variable name: {node.id}")
+            if node.id not in self.variables:
+                self.variables.append(node.id)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ExpressionError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ExpressionError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("Only these functions can be called: " + ", ".join(FUNCTIONS))
+        if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            raise ExpressionError("Function arguments must be plain expressions.")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+def _parse(text: str) -> ast.Expression:
+    if not isinstance(text, str) or not text.strip():
+        raise ExpressionError("Expression must be a non-empty string.")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        return ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}")
+    except (RecursionError, MemoryError):
+        raise ExpressionError("Expression is nested too deeply.")
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Parse, check and compile an expression; results are cached by text.
+
+    Raises:
+        ExpressionError: If the expression is invalid
+    """
+    checker = _Checker()
+    tree = checker.visit(_parse(text))
+    variables = tuple(checker.variables)
+    function_tree = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=tree.body,
+    ))
+    ast.fix_missing_locations(function_tree)
+    try:
+        function = eval(compile(function_tree, "<expression>", "eval"), _GLOBALS)
+    except (RecursionError, MemoryError):
+        raise ExpressionError("Expression is nested too deeply.")
+    return CompiledExpression(text, variables, function)
+
+def evaluate(text: str, inputs: Sequence[float]) -> float:
+    """Evaluate an expression over inputs, compiling it only on the first use of its text."""
+    return compile_expression(text).evaluate(inputs)
@@ -0,0 +1,162 @@
+# app/operations/result_cache.py
+"""
+Content-addressed cache of calculation results.
+
+A result depends only on the calculation type, its inputs and, for expressions, the
+expression text, so it can be shared between requests and users. Entries are keyed by a
+SHA-256 digest of those, with the inputs packed as float64, which makes [2, 3] and [2.0, 3.0]
+the same key. Lookups go to an in-process LRU first and then, when RESULT_CACHE_REDIS is
+enabled, to Redis through the shared client in app.auth.redis. Failed computations are never
+cached, so validation errors are raised as before.
+"""
+import asyncio
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import anyio.from_thread
+
+from app.core.config import settings
+from app.core.metrics import time_phase
+
+REDIS_KEY_PREFIX = settings.REDIS_KEY_PREFIX + "calc-result:"
+
+def result_key(calculation_type: str, inputs, expression: Optional[str] = None) -> str:
+    """
+    Digest identifying a (type, inputs) pair, or (type, expression, inputs) for expressions.
+
+    Raises:
+        TypeError: If inputs is not a sequence of numbers
+    """
+    packed = array("d", inputs).tobytes()
+    prefix = calculation_type.encode("utf-8") + b"\0"
+    if expression is not None:
+        prefix += expression.encode("utf-8") + b"\0"
+    return hashlib.sha256(prefix + packed).hexdigest()
+
+class ResultCache:
+    """
+    Two-tier result cache: a bounded in-process LRU in front of an optional Redis tier.
+
+    Args:
+        maxsize: Maximum number of results kept in process (0 disables the local tier)
+        use_redis: Whether to consult and populate Redis on a local miss
+        redis_ttl: Lifetime of Redis entries in seconds
+        redis_timeout: Seconds to wait for Redis before treating the lookup as a miss
+    """
+
+    def __init__(self, maxsize: int, use_redis: bool = False, redis_ttl: int = 86400,
+                 redis_timeout: float = 0.05):
+        self.maxsize = maxsize
+        self.use_redis = use_redis
+        self.redis_ttl = redis_ttl
+        self.redis_timeout = redis_timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> Optional[float]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def _put_local(self, key: str, result: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _redis(self, operation, *args):
+        """
+        Run a Redis coroutine from a threadpool thread on the app's event loop.
+
+        Returns None when Redis is unavailable, slow, or cannot be reached from the current
+        thread (for example when called on the event loop itself).
+        """
+        async def call():
+            return await asyncio.wait_for(operation(*args), self.redis_timeout)
+
+        try:
+            return anyio.from_thread.run(call)
+        except RuntimeError:
+            return None
+        except Exception:
+            self.redis_errors += 1
+            return None
+
+    def _get_redis(self, key: str) -> Optional[float]:
+        from app.auth.redis import redis_client
+        value = self._redis(redis_client.get, REDIS_KEY_PREFIX + key)
+        return float(value) if value is not None else None
+
+    def _put_redis(self, key: str, result: float) -> None:
+        from app.auth.redis import redis_client
+        self._redis(redis_client.setex, REDIS_KEY_PREFIX + key, self.redis_ttl, repr(result))
+
+    def get_result(self, calculation) -> float:
+        """Return calculation.get_result(), computing it only on a cache miss."""
+        try:
+            key = result_key(calculation.type, calculation.inputs, calculation.expression)
+        except TypeError:
+            with time_phase("compute"):
+                return calculation.get_result()
+
+        result = self._get_local(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        if self.use_redis:
+            result = self._get_redis(key)
+            if result is not None:
+                self.redis_hits += 1
+                self._put_local(key, result)
+                return result
+
+        self.misses += 1
+        with time_phase("compute"):
+            result = calculation.get_result()
+        self._put_local(key, result)
+        if self.use_redis:
+            self._put_redis(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all local entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+        self.hits = self.misses = self.evictions = self.redis_hits = self.redis_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier and current size."""
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "redis_errors": self.redis_errors,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+# Shared cache used by the calculation endpoints
+result_cache = ResultCache(
+    maxsize=settings.RESULT_CACHE_SIZE,
+    use_redis=settings.RESULT_CACHE_REDIS,
+    redis_ttl=settings.RESULT_CACHE_TTL,
+    redis_timeout=settings.RESULT_CACHE_REDIS_TIMEOUT,
+)
@@ -0,0 +1,47 @@
+# app/pagination.py
+"""
+Helpers for keyset (cursor) pagination over (created_at, id).
+
+A cursor is the url-safe base64 encoding of the last row's created_at and id. The next page
+is everything strictly after that pair, which an index on (user_id, created_at, id) can
+serve directly without scanning the rows of earlier pages.
+"""
+import base64
+from datetime import datetime, timezone
+from typing import Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise ValueError("Invalid cursor.")
+
+def after_cursor(created_at_column, id_column, cursor: Tuple[datetime, UUID]):
+    """Filter clause selecting rows that sort strictly after the cursor."""
+    created_at, id = cursor
+    return or_(
+        created_at_column > created_at,
+        and_(created_at_column == created_at, id_column > id),
+    )
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC, matching how created_at is stored."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,50 @@
+# app/responses.py
+"""Response classes shared by the API routes."""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+from app.core.metrics import time_phase
+from app.schemas.calculation import CalculationResponse
+
+# Response fields in the order CalculationResponse serializes them
+CALCULATION_FIELDS = tuple(CalculationResponse.model_fields)
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records the time spent encoding its body as the serialize phase."""
+
+    def render(self, content: Any) -> bytes:
+        with time_phase("serialize"):
+            return super().render(content)
+
+def _encode_decimal(value: Any) -> str:
+    # Decimals (result_exact) are encoded as strings, as pydantic does, so no digit is lost
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded with orjson.
+
+    Routes returning it bypass response_model validation, so content must already have the
+    response shape; UUIDs and datetimes are encoded natively and decimals as strings, as
+    pydantic would.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with time_phase("serialize"):
+            return orjson.dumps(content, default=_encode_decimal)
+
+def calculation_record(calculation) -> dict:
+    """CalculationResponse body for a calculation loaded from the database, without validation."""
+    # Loaded column values live in the instance __dict__; reading them there skips the
+    # attribute instrumentation, which costs more than building the dict.
+    loaded = calculation.__dict__
+    return {
+        field: loaded[field] if field in loaded else getattr(calculation, field)
+        for field in CALCULATION_FIELDS
+    }
@@ -14,7 +14,12 @@ from .calculation import (
     CalculationBase,
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CalculationBatchCreate,
+    CalculationBatchItemResult,
+    CalculationBatchResponse,
+    CalculationTypeStats,
+    CalculationStatsResponse
 )
 
 __all__ = [
@@ -32,4 +37,9 @@ __all__ = [
     'CalculationCreate',
     'CalculationUpdate',
     'CalculationResponse',
+    'CalculationBatchCreate',
+    'CalculationBatchItemResult',
+    'CalculationBatchResponse',
+    'CalculationTypeStats',
+    'CalculationStatsResponse',
 ]
\ No newline at end of file
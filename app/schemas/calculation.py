@@ -1,8 +1,9 @@
 from enum import Enum
 from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 
 class CalculationType(str, Enum):
     """Valid calculation types"""
@@ -10,18 +11,83 @@ class CalculationType(str, Enum):
     SUBTRACTION = "subtraction"
     MULTIPLICATION = "multiplication"
     DIVISION = "division"
+    EXPRESSION = "expression"
+
+class MatrixAxis(str, Enum):
+    """How matrix inputs are reduced"""
+    ROWS = "rows"         # one result per row
+    COLUMNS = "columns"   # one result per column
+
+class PrecisionMode(str, Enum):
+    """Arithmetic a calculation is computed in"""
+    FLOAT64 = "float64"     # binary floating point, with compensated sums
+    DECIMAL = "decimal"     # decimal arithmetic in the configured context
+    RATIONAL = "rational"   # exact fractions, rounded once to the decimal context
+
+# Longest input list the decimal and rational modes compute: rational numerators and
+# denominators grow with every step, so their cost is quadratic (a product of 1000 inputs
+# takes ~70 ms)
+MAX_EXACT_INPUTS = 1000
+
+# Inputs are either a flat list of numbers or, in matrix mode, a list of equal-length rows
+Inputs = Union[List[float], List[List[float]]]
+
+def is_matrix(inputs: Optional[Inputs]) -> bool:
+    """Whether inputs are a list of rows rather than a list of numbers."""
+    return bool(inputs) and isinstance(inputs[0], list)
+
+def _validate_matrix(inputs: List[List[float]], axis: MatrixAxis) -> None:
+    """Check that a matrix is rectangular and has at least two operands per lane."""
+    width = len(inputs[0])
+    if width == 0:
+        raise ValueError("Rows must not be empty")
+    if any(len(row) != width for row in inputs):
+        raise ValueError("All rows must have the same number of inputs")
+    operands = len(inputs) if axis == MatrixAxis.COLUMNS else width
+    if operands < 2:
+        raise ValueError(f"Each {'column' if axis == MatrixAxis.COLUMNS else 'row'} needs at least two numbers")
+
+def _validate_expression(expression: Optional[str], inputs: Optional[List[float]]) -> None:
+    """Check that an expression compiles and, if inputs are given, that they bind its variables."""
+    from app.operations.expression import compile_expression
+
+    if expression is None:
+        raise ValueError("Expression calculations need an expression")
+    variables = compile_expression(expression).variables
+    if inputs is not None and len(inputs) != len(variables):
+        raise ValueError(
+            f"Expression has {len(variables)} variable(s) ({', '.join(variables) or 'none'}) "
+            f"but {len(inputs)} input(s) were given"
+        )
 
 class CalculationBase(BaseModel):
     type: CalculationType = Field(
         ...,
-        description="Type of calculation (addition, subtraction, multiplication, division)",
+        description="Type of calculation (addition, subtraction, multiplication, division, expression)",
         example="addition"
     )
-    inputs: List[float] = Field(
+    inputs: Inputs = Field(
         ...,
-        description="List of numeric inputs for the calculation",
-        example=[10.5, 3, 2],
-        min_items=2
+        description="List of numeric inputs for the calculation; for an expression, the values "
+                    "of its variables in the order they first appear. A list of equal-length "
+                    "rows applies the operation to each row (or column, see axis)",
+        example=[10.5, 3, 2]
+    )
+    axis: Optional[MatrixAxis] = Field(
+        None,
+        description="For matrix inputs: 'rows' (default) for a result per row, 'columns' for one per column",
+        example=None
+    )
+    expression: Optional[str] = Field(
+        None,
+        description="Arithmetic expression over named variables, for the expression type",
+        example=None,
+        max_length=500
+    )
+    precision: PrecisionMode = Field(
+        PrecisionMode.FLOAT64,
+        description="float64 (default), decimal or rational; the exact modes also return result_exact",
+        example="float64"
     )
 
     @field_validator("type", mode="before")
@@ -42,6 +108,30 @@ class CalculationBase(BaseModel):
     @model_validator(mode='after')
     def validate_inputs(self) -> "CalculationBase":
         """Validate inputs based on calculation type"""
+        matrix = is_matrix(self.inputs)
+        if not matrix and self.axis is not None:
+            raise ValueError("Only matrix inputs take an axis")
+        if self.precision != PrecisionMode.FLOAT64 and (matrix or self.type == CalculationType.EXPRESSION):
+            raise ValueError("Expressions and matrix inputs are computed in float64 only")
+        if self.precision != PrecisionMode.FLOAT64 and len(self.inputs) > MAX_EXACT_INPUTS:
+            raise ValueError(f"Decimal and rational calculations take at most {MAX_EXACT_INPUTS} inputs")
+        if self.type == CalculationType.EXPRESSION:
+            if matrix:
+                raise ValueError("Expression calculations take a list of numbers")
+            _validate_expression(self.expression, self.inputs)
+            return self
+        if self.expression is not None:
+            raise ValueError("Only expression calculations take an expression")
+        if matrix:
+            if self.axis is None:
+                self.axis = MatrixAxis.ROWS
+            _validate_matrix(self.inputs, self.axis)
+            if self.type == CalculationType.DIVISION:
+                # Every value after the first of each lane is a divisor
+                divisors = [row[1:] for row in self.inputs] if self.axis == MatrixAxis.ROWS else self.inputs[1:]
+                if any(x == 0 for row in divisors for x in row):
+                    raise ValueError("Cannot divide by zero")
+            return self
         if len(self.inputs) < 2:
             raise ValueError("At least two numbers are required for calculation")
         if self.type == CalculationType.DIVISION:
@@ -58,12 +148,22 @@ class CalculationCreate(CalculationBase):
 
 class CalculationUpdate(BaseModel):
     """Schema for updating an existing Calculation"""
-    inputs: Optional[List[float]] = Field(None, min_items=2)
+    inputs: Optional[Inputs] = Field(None, description="New inputs: a matrix for matrix calculations")
+    expression: Optional[str] = Field(None, description="New expression, for expression calculations",
+                                      max_length=500)
 
     @model_validator(mode='after')
     def validate_inputs(self) -> "CalculationUpdate":
-        if self.inputs is not None and len(self.inputs) < 2:
+        # Whether inputs fit the row depends on its stored type, axis and expression, which the
+        # update itself checks. A flat list without an expression needs at least two numbers,
+        # as it always has; an expression of one variable is updated together with it.
+        if is_matrix(self.inputs):
+            if any(len(row) != len(self.inputs[0]) for row in self.inputs):
+                raise ValueError("All rows must have the same number of inputs")
+        elif self.inputs is not None and self.expression is None and len(self.inputs) < 2:
             raise ValueError("At least two numbers are required for calculation")
+        if self.expression is not None:
+            _validate_expression(self.expression, self.inputs)
         return self
 
     model_config = ConfigDict(from_attributes=True)
@@ -74,6 +174,55 @@ class CalculationResponse(CalculationBase):
     user_id: UUID
     created_at: datetime
     updated_at: datetime
-    result: float
+    result: Optional[float] = Field(None, description="The result; None for matrix calculations")
+    results: Optional[List[float]] = Field(None, description="Per-row or per-column results of matrix inputs")
+    result_exact: Optional[Decimal] = Field(
+        None, description="Result of decimal and rational calculations, exact to the decimal context"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Upper bound on the number of items accepted by the batch endpoint
+MAX_BATCH_SIZE = 1000
+
+class CalculationBatchCreate(BaseModel):
+    """Schema for creating many Calculations in one request"""
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        description="Calculations to create, each with a 'type' and 'inputs'",
+        example=[
+            {"type": "addition", "inputs": [1, 2]},
+            {"type": "division", "inputs": [10, 0]}
+        ],
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
+
+class CalculationBatchItemResult(BaseModel):
+    """Outcome of a single item in a batch request"""
+    index: int = Field(..., description="Position of the item in the request")
+    calculation: Optional[CalculationResponse] = Field(None, description="The created calculation")
+    error: Optional[str] = Field(None, description="Why the item was rejected")
+
+class CalculationBatchResponse(BaseModel):
+    """Schema for the result of a batch request"""
+    created: int = Field(..., description="Number of calculations persisted")
+    failed: int = Field(..., description="Number of items rejected")
+    results: List[CalculationBatchItemResult]
+
+class CalculationTypeStats(BaseModel):
+    """Summary of a user's calculations of one type"""
+    type: CalculationType
+    count: int = Field(..., description="Number of calculations")
+    min_result: Optional[float] = Field(None, description="Smallest result")
+    max_result: Optional[float] = Field(None, description="Largest result")
+    avg_result: Optional[float] = Field(None, description="Mean result")
+    last_activity: datetime = Field(..., description="When a calculation of this type last changed")
+
+    model_config = ConfigDict(from_attributes=True)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+class CalculationStatsResponse(BaseModel):
+    """Schema for a user's calculation statistics"""
+    total_count: int = Field(..., description="Number of calculations across all types")
+    last_activity: Optional[datetime] = Field(None, description="When any calculation last changed")
+    types: List[CalculationTypeStats]
@@ -0,0 +1,95 @@
+# benchmarks/bench_api.py
+"""
+End-to-end POST /calculations and GET /calculations through TestClient.
+
+Runs against a temporary SQLite file, and also against Postgres when --postgres-url is given.
+The Postgres database only needs to exist: tables are created if missing and a fresh user is
+registered for each run, so existing data is left alone.
+"""
+import tempfile
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.auth.password_service import password_service
+from app.database import Base, get_db, get_engine, get_sessionmaker
+from app.main import app
+
+LIST_PAGE_SIZE = 100
+
+_engines = []
+_tempdir = None
+
+def _session_override(engine):
+    SessionLocal = get_sessionmaker(engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return override_get_db
+
+def _login(client: TestClient) -> dict:
+    password = "Password123!"
+    username = f"bench_{uuid.uuid4().hex[:12]}"
+    response = client.post("/auth/register", json={
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": password,
+        "confirm_password": password,
+        "first_name": "Bench",
+        "last_name": "User",
+    })
+    response.raise_for_status()
+    response = client.post("/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def _backend_cases(backend: str, database_url: str) -> dict:
+    engine = get_engine(database_url)
+    _engines.append(engine)
+    Base.metadata.create_all(bind=engine)
+    override = _session_override(engine)
+    client = TestClient(app)
+
+    def call(method, url, **kwargs):
+        # Each backend installs its own session override before every request
+        app.dependency_overrides[get_db] = override
+        response = client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    app.dependency_overrides[get_db] = override
+    headers = _login(client)
+    call("POST", "/calculations/batch", headers=headers, json={
+        "items": [{"type": "multiplication", "inputs": [i, 1.5]} for i in range(LIST_PAGE_SIZE)]
+    })
+    create_body = {"type": "addition", "inputs": [10.5, 3, 2]}
+    return {
+        f"api_create_calculation[{backend}]": lambda: call("POST", "/calculations", headers=headers, json=create_body),
+        f"api_list_calculations[{backend},{LIST_PAGE_SIZE}]": lambda: call(
+            "GET", "/calculations", headers=headers, params={"limit": LIST_PAGE_SIZE}
+        ),
+    }
+
+def cases(options=None) -> dict:
+    """Benchmark name -> zero-argument callable."""
+    global _tempdir
+    _tempdir = tempfile.TemporaryDirectory()
+    result = _backend_cases("sqlite", f"sqlite:///{Path(_tempdir.name) / 'bench.db'}")
+    postgres_url = getattr(options, "postgres_url", None)
+    if postgres_url:
+        result.update(_backend_cases("postgres", postgres_url))
+    return result
+
+def close() -> None:
+    app.dependency_overrides.pop(get_db, None)
+    password_service.shutdown()
+    while _engines:
+        _engines.pop().dispose()
+    if _tempdir is not None:
+        _tempdir.cleanup()
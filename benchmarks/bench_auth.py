@@ -0,0 +1,59 @@
+# benchmarks/bench_auth.py
+"""
+Token creation and verification, and bcrypt at the configured cost.
+
+The jose[...] cases sign and verify the same claims with jose directly, as a reference for
+the token service's fast path; RS256/EdDSA.verify time the asymmetric verifiers.
+
+decode_token is measured on its steady-state path: the revoked-token filter is marked as
+synced and empty, so the Redis blacklist is never consulted, as for any token that was not
+revoked.
+"""
+import asyncio
+import time
+import uuid
+from datetime import timedelta
+
+from jose import jwt
+
+from app.auth.bloom import revoked_tokens
+from app.auth.jwt import create_token, decode_token, get_password_hash, verify_password
+from app.auth.keys import generate_private_key
+from app.auth.tokens import AsymmetricTokenService, token_service
+from app.core.config import settings
+from app.schemas.token import TokenType
+
+_loop = None
+
+def cases(options=None) -> dict:
+    """Benchmark name -> zero-argument callable."""
+    global _loop
+    _loop = asyncio.new_event_loop()
+    revoked_tokens.rebuild([], version="benchmark")
+    revoked_tokens._next_sync = time.monotonic() + 86400
+
+    user_id = uuid.uuid4()
+    token = create_token(user_id, TokenType.ACCESS)
+    claims = jwt.get_unverified_claims(token)
+    hashed = get_password_hash("Password123!")
+    rs256 = AsymmetricTokenService("RS256", generate_private_key("RS256"))
+    rs256_token = rs256.mint(user_id, TokenType.ACCESS, timedelta(minutes=30))
+    eddsa = AsymmetricTokenService("EdDSA", generate_private_key("EdDSA"))
+    eddsa_token = eddsa.mint(user_id, TokenType.ACCESS, timedelta(minutes=30))
+    return {
+        "create_token[access]": lambda: create_token(user_id, TokenType.ACCESS),
+        "decode_token[access]": lambda: _loop.run_until_complete(decode_token(token, TokenType.ACCESS)),
+        "token_service.encode": lambda: token_service.encode(dict(claims), TokenType.ACCESS),
+        "token_service.verify": lambda: token_service.verify(token, TokenType.ACCESS),
+        "jose[encode]": lambda: jwt.encode(dict(claims), settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM),
+        "jose[decode]": lambda: jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        "RS256.verify": lambda: rs256.verify(rs256_token, TokenType.ACCESS),
+        "EdDSA.verify": lambda: eddsa.verify(eddsa_token, TokenType.ACCESS),
+        f"bcrypt_verify[rounds={settings.BCRYPT_ROUNDS}]": lambda: verify_password("Password123!", hashed),
+    }
+
+def close() -> None:
+    revoked_tokens.version = None
+    revoked_tokens._next_sync = 0.0
+    if _loop is not None:
+        _loop.close()
@@ -0,0 +1,125 @@
+# benchmarks/bench_calculations.py
+"""Calculation kernels (float64 and exact), expressions, matrices, get_result and request validation."""
+import json
+import random
+import uuid
+from typing import Callable, Dict, List
+
+from app.models.calculation import Calculation, decode_inputs, encode_inputs
+from app.operations import engine
+from app.operations.calculation_logic import perform_calculation
+from app.operations.expression import compile_expression
+from app.schemas.calculation import CalculationBase
+
+CALCULATION_TYPES = ("addition", "subtraction", "multiplication", "division")
+INPUT_SIZES = (2, 16, 256, 4096)
+EXPRESSION = "sqrt(a**2 + b**2) / max(abs(a - b), 1)"
+MATRIX_ROWS = 1000
+# Operations with a NumPy kernel, and the sizes the two kernels are compared at
+VECTORIZABLE = ("multiply", "divide")
+KERNEL_SIZES = (256, 1024, 4096, 65536)
+# Sizes vectorize_threshold_checks compares scalar-only operations at (above 64k inputs both
+# paths are bound by memory and too close to call on a busy machine)
+CHECK_SIZES = (256, 4096)
+
+def make_inputs(size: int) -> list:
+    # Values near 1 keep products and quotients of long inputs within the float64 range
+    rng = random.Random(size)
+    return [rng.uniform(0.5, 1.5) for _ in range(size)]
+
+def _vector_multiply(values) -> float:
+    import numpy as np
+    array = engine._as_array(values)
+    with np.errstate(over="ignore", under="ignore"):
+        result = float(np.prod(array))
+    return engine._check_range(result, values, array, zero_is_underflow=bool(array.all()))
+
+def _scalar_divide(values) -> float:
+    return engine._check_range(engine._scalar_divide(values), values, zero_is_underflow=values[0] != 0)
+
+def _vector_divide(values) -> float:
+    array = engine._as_array(values)
+    return engine._check_range(engine._vector_divide(array), values, array, zero_is_underflow=bool(array[0] != 0))
+
+def kernel_paths(operation: str, values: list) -> Dict[str, Callable[[], float]]:
+    """The scalar and the NumPy kernel of operation, range checks included, regardless of the threshold."""
+    scalar, vector = {
+        "multiply": (engine.multiply, _vector_multiply),
+        "divide": (_scalar_divide, _vector_divide),
+    }[operation]
+    return {"scalar": lambda: scalar(values), "vector": lambda: vector(values)}
+
+def vectorize_threshold_checks(repeat: int = 5) -> List[str]:
+    """
+    Check engine.VECTORIZE_THRESHOLDS against the kernels: an operation without a threshold
+    must be faster on the scalar path at each of CHECK_SIZES, and one with a threshold must
+    be faster on the NumPy path at four times the threshold. Returns the failures.
+    """
+    from benchmarks.run import time_case
+    failures = []
+    for operation in VECTORIZABLE:
+        threshold = engine.VECTORIZE_THRESHOLDS[operation]
+        sizes = CHECK_SIZES if threshold is None else (4 * threshold,)
+        expected = "scalar" if threshold is None else "vector"
+        for size in sizes:
+            paths = kernel_paths(operation, make_inputs(size))
+            timings = {path: time_case(func, repeat)["min"] for path, func in paths.items()}
+            if min(timings, key=timings.get) != expected:
+                failures.append(
+                    f"{operation}[{size}]: scalar {timings['scalar'] * 1e6:.1f} us, "
+                    f"vector {timings['vector'] * 1e6:.1f} us; expected the {expected} path to win"
+                )
+    return failures
+
+def cases(options=None) -> dict:
+    """Benchmark name -> zero-argument callable."""
+    result = {}
+    user_id = uuid.uuid4()
+    for size in INPUT_SIZES:
+        inputs = make_inputs(size)
+        for calculation_type in CALCULATION_TYPES:
+            calculation = Calculation.create(calculation_type, user_id, inputs)
+            result[f"get_result[{calculation_type},{size}]"] = calculation.get_result
+            result[f"perform_calculation[{calculation_type},{size}]"] = (
+                lambda inputs=inputs, calculation_type=calculation_type: perform_calculation(inputs, calculation_type)
+            )
+            if size <= 256:
+                # The exact modes, against the float64 get_result above
+                for precision in ("decimal", "rational"):
+                    exact = Calculation.create(calculation_type, user_id, inputs, precision=precision)
+                    result[f"get_exact_result[{calculation_type},{precision},{size}]"] = exact.get_exact_result
+        # Loading stored inputs: parsing the JSON column against decoding the packed one
+        stored_json = json.dumps(inputs)
+        packed = encode_inputs(inputs, format="packed")["inputs_packed"]
+        result[f"load_inputs[json,{size}]"] = lambda stored_json=stored_json: json.loads(stored_json)
+        result[f"load_inputs[packed,{size}]"] = lambda packed=packed: decode_inputs(None, packed, None)
+        payload = {"type": "addition", "inputs": inputs}
+        result[f"validate_calculation_base[{size}]"] = lambda payload=payload: CalculationBase.model_validate(payload)
+
+    # Scalar against NumPy kernels, for calibrating engine.VECTORIZE_THRESHOLDS
+    for size in KERNEL_SIZES:
+        inputs = make_inputs(size)
+        for operation in VECTORIZABLE:
+            for path, func in kernel_paths(operation, inputs).items():
+                result[f"kernel[{operation},{path},{size}]"] = func
+
+    # Cached compile (the steady state) against parsing and compiling on every call
+    inputs = make_inputs(2)
+    expression = Calculation.create("expression", user_id, inputs, expression=EXPRESSION)
+    result["get_result[expression,2]"] = expression.get_result
+    result["compile_expression[uncached]"] = lambda: compile_expression.__wrapped__(EXPRESSION)
+    payload = {"type": "expression", "inputs": inputs, "expression": EXPRESSION}
+    result["validate_calculation_base[expression]"] = lambda: CalculationBase.model_validate(payload)
+
+    # One matrix calculation against the per-row calculations it replaces
+    rows = [make_inputs(4) for _ in range(MATRIX_ROWS)]
+    for calculation_type in CALCULATION_TYPES:
+        matrix = Calculation.create(calculation_type, user_id, rows, axis="rows")
+        result[f"get_results[{calculation_type},{MATRIX_ROWS}x4]"] = matrix.get_results
+        per_row = [Calculation.create(calculation_type, user_id, row) for row in rows]
+        result[f"get_result_per_row[{calculation_type},{MATRIX_ROWS}x4]"] = (
+            lambda per_row=per_row: [calculation.get_result() for calculation in per_row]
+        )
+    payload = {"type": "addition", "inputs": rows}
+    result[f"validate_calculation_base[matrix,{MATRIX_ROWS}x4]"] = lambda: CalculationBase.model_validate(payload)
+    return result
@@ -0,0 +1,53 @@
+# benchmarks/bench_serialization.py
+"""
+Response serialization for calculation lists: the response_model path against FastJSONResponse.
+
+The response_model path is what FastAPI does for a route returning ORM objects: validate
+every row into CalculationResponse (from attributes), dump it to JSON-compatible Python and
+encode that with the standard json module. The fast path builds the response dicts straight
+from the rows and encodes them with orjson.
+
+Run with: python -m benchmarks.run -k serialize
+"""
+import uuid
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.calculation import Calculation
+from app.responses import FastJSONResponse, TimedJSONResponse, calculation_record
+from app.schemas.calculation import CalculationResponse
+
+ROW_COUNTS = (1, 100, 1000)
+
+_list_adapter = TypeAdapter(List[CalculationResponse])
+
+def make_rows(count: int) -> list:
+    """Calculation rows shaped like the ones loaded by GET /calculations."""
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        calculation = Calculation.create("multiplication", user_id, [float(i), 1.5, 2.25])
+        calculation.id = uuid.uuid4()
+        calculation.result = calculation.get_result()
+        calculation.created_at = calculation.updated_at = now
+        rows.append(calculation)
+    return rows
+
+def response_model_path(rows: list) -> bytes:
+    validated = _list_adapter.validate_python(rows, from_attributes=True)
+    return TimedJSONResponse(_list_adapter.dump_python(validated, mode="json")).body
+
+def fast_path(rows: list) -> bytes:
+    return FastJSONResponse([calculation_record(row) for row in rows]).body
+
+def cases(options=None) -> dict:
+    """Benchmark name -> zero-argument callable."""
+    result = {}
+    for count in ROW_COUNTS:
+        rows = make_rows(count)
+        result[f"serialize_list[response_model,{count}]"] = lambda rows=rows: response_model_path(rows)
+        result[f"serialize_list[orjson,{count}]"] = lambda rows=rows: fast_path(rows)
+    return result
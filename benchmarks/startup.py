@@ -0,0 +1,109 @@
+# benchmarks/startup.py
+"""
+Start-up time report: what a fresh worker spends importing the application, per module.
+
+The import is run in a new interpreter with -X importtime, so nothing is already cached in
+sys.modules, and the per-module times are summed by top-level package:
+
+    python -m benchmarks.startup                     # import cost of app.main
+    python -m benchmarks.startup --top 30 --lifespan # also time the lifespan and first request
+    python -m benchmarks.startup --output benchmarks/results/startup.json
+
+--lifespan starts the application with the configured DATABASE_URL (FAST_START included) and
+times the lifespan start-up and a first GET /health.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_LIFESPAN_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    started = time.perf_counter()
+    client.get("/health")
+    served = time.perf_counter()
+print(json.dumps({"import": imported - start, "lifespan": started - imported, "first_request": served - started}))
+"""
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """Rows of "import time: self [us] | cumulative | name" as dicts (times in seconds)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self": int(self_us) / 1e6,
+            "cumulative": int(cumulative_us) / 1e6,
+        })
+    return rows
+
+def import_report(module: str) -> dict:
+    """Import module in a fresh interpreter and break its import time down."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = parse_importtime(completed.stderr)
+    packages = defaultdict(float)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self"]
+    total = next((row["cumulative"] for row in rows if row["module"] == module), sum(packages.values()))
+    return {
+        "module": module,
+        "total": total,
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "modules": sorted(rows, key=lambda row: -row["self"]),
+    }
+
+def lifespan_report() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _LIFESPAN_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def print_report(report: dict, top: int) -> None:
+    imports = report["imports"]
+    print(f"import {imports['module']}: {imports['total'] * 1000:.1f} ms\n")
+    print(f"{'package':40s} {'self ms':>9s} {'share':>7s}")
+    for package, seconds in list(imports["packages"].items())[:top]:
+        print(f"{package:40s} {seconds * 1000:9.1f} {seconds / imports['total']:7.1%}")
+    print(f"\n{'module':60s} {'self ms':>9s} {'cumul. ms':>10s}")
+    for row in imports["modules"][:top]:
+        print(f"{row['module']:60s} {row['self'] * 1000:9.1f} {row['cumulative'] * 1000:10.1f}")
+    if "lifespan" in report:
+        timings = report["lifespan"]
+        print(f"\nimport {timings['import'] * 1000:.1f} ms, lifespan start-up {timings['lifespan'] * 1000:.1f} ms, "
+              f"first request {timings['first_request'] * 1000:.1f} ms")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module whose import is measured")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules listed")
+    parser.add_argument("--lifespan", action="store_true", help="Also time the lifespan and a first request")
+    parser.add_argument("--output", type=Path, help="Also write the report to this JSON file")
+    options = parser.parse_args(argv)
+
+    report = {"imports": import_report(options.module)}
+    if options.lifespan:
+        report["lifespan"] = lifespan_report()
+    print_report(report, options.top)
+    if options.output is not None:
+        options.output.parent.mkdir(parents=True, exist_ok=True)
+        options.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,18 @@
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from faker import Faker
 from uuid import uuid4
 
+from app.auth import redis as app_redis
+from app.auth.bloom import RevokedTokenFilter
 from app.main import app
 from app.database import Base, get_db
 from app.models.user import User
@@ -19,7 +26,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 fake = Faker()
 
 @pytest.fixture(scope="function")
@@ -118,4 +125,169 @@ def fake_user_data():
         "hashed_password": get_password_hash(password),
         "is_active": True,
         "is_verified": False
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture(scope="function")
+def auth_headers(client):
+    """
+    Registers and logs in a user through the API and returns its Authorization header.
+    """
+    password = "Password123!"
+    username = fake.unique.user_name()
+    client.post("/auth/register", json={
+        "email": fake.unique.email(),
+        "username": username,
+        "password": password,
+        "confirm_password": password,
+        "first_name": fake.first_name(),
+        "last_name": fake.last_name()
+    })
+    login_res = client.post("/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+@pytest.fixture
+def count_statements():
+    """
+    Returns a context manager that collects the SQL statements executed inside it.
+    """
+    @contextmanager
+    def collect():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+    return collect
+
+class FakeRedis:
+    """
+    In-memory stand-in for the async Redis client.
+
+    Implements the string, counter, sorted-set and key-scanning commands the app uses, with key
+    expiry and pipelines, and records the commands it receives in `calls` so tests can count
+    round trips (a pipeline counts as one call).
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.zsets = {}
+        self.calls = []
+
+    def _live(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        return self._live(key)
+
+    async def mget(self, keys):
+        self.calls.append(("mget", tuple(keys)))
+        return [self._live(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self.calls.append(("set", key))
+        self._set(key, value, ex)
+
+    async def setex(self, key, ttl, value):
+        self.calls.append(("setex", key))
+        self._set(key, value, ttl)
+
+    def _set(self, key, value, ttl):
+        self.data[key] = str(value)
+        if ttl is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = time.time() + ttl
+
+    async def type(self, key):
+        self.calls.append(("type", key))
+        if self._live(key) is not None:
+            return "string"
+        return "zset" if key in self.zsets else "none"
+
+    async def pttl(self, key):
+        self.calls.append(("pttl", key))
+        if self._live(key) is None:
+            return -2
+        if key not in self.expires:
+            return -1
+        return int((self.expires[key] - time.time()) * 1000)
+
+    async def scan_iter(self, match=None, count=None):
+        self.calls.append(("scan", match))
+        for key in list(self.data) + list(self.zsets):
+            yield key
+
+    async def incr(self, key):
+        self.calls.append(("incr", key))
+        self.data[key] = str(int(self._live(key) or 0) + 1)
+        return int(self.data[key])
+
+    async def zadd(self, key, mapping):
+        self.calls.append(("zadd", key))
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        self.calls.append(("zremrangebyscore", key))
+        members = self.zsets.get(key, {})
+        for member in self._score_range(members, low, high):
+            del members[member]
+
+    async def zrangebyscore(self, key, low, high):
+        self.calls.append(("zrangebyscore", key))
+        return self._score_range(self.zsets.get(key, {}), low, high)
+
+    @staticmethod
+    def _score_range(members, low, high):
+        low, high = float(low), float(high)
+        return [member for member, score in members.items() if low <= score <= high]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis as one call on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.redis.calls.append(("pipeline", tuple(name for name, _, _ in self.commands)))
+        calls_before = len(self.redis.calls)
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        del self.redis.calls[calls_before:]
+        return results
+
+@pytest.fixture
+def fake_redis():
+    """
+    Replaces the shared Redis client with a FakeRedis, and the revoked-token filter with an
+    unsynced one, for the duration of a test.
+    """
+    fake = FakeRedis()
+    revoked = RevokedTokenFilter(capacity=100, error_rate=0.001, sync_interval=60)
+    with patch.object(app_redis, "redis_client", fake), patch.object(app_redis, "revoked_tokens", revoked):
+        yield fake
@@ -0,0 +1,100 @@
+# tests/integration/test_async_routes.py
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_async_database_url, get_async_db, get_async_sessionmaker
+from app.main import async_router
+
+@pytest.fixture(scope="function")
+def async_client():
+    """
+    A TestClient for an app serving the async routes from an in-memory aiosqlite database.
+    """
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    AsyncTestingSessionLocal = get_async_sessionmaker(async_engine)
+
+    async def create_tables():
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    asyncio.run(create_tables())
+    app = FastAPI()
+    app.include_router(async_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(async_engine.dispose())
+
+@pytest.fixture(scope="function")
+def async_auth_headers(async_client):
+    password = "Password123!"
+    response = async_client.post("/auth/register", json={
+        "email": "async@example.com",
+        "username": "async_user",
+        "password": password,
+        "confirm_password": password,
+        "first_name": "Async",
+        "last_name": "User"
+    })
+    assert response.status_code == 201
+    login_res = async_client.post("/auth/login", json={"username": "async_user", "password": password})
+    assert login_res.status_code == 200
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+def test_async_database_url_uses_async_drivers():
+    """Test that sync URLs are rewritten to their async drivers."""
+    assert get_async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+def test_async_login_rejects_bad_password(async_client, async_auth_headers):
+    """Test that the async login route verifies the password."""
+    response = async_client.post("/auth/login", json={"username": "async_user", "password": "WrongPass123!"})
+    assert response.status_code == 401
+
+def test_async_calculation_lifecycle(async_client, async_auth_headers):
+    """Test create, read, list, update and delete through the async routes."""
+    create_res = async_client.post(
+        "/calculations", json={"type": "addition", "inputs": [10, 5]}, headers=async_auth_headers
+    )
+    assert create_res.status_code == 201
+    calc_id = create_res.json()["id"]
+
+    read_res = async_client.get(f"/calculations/{calc_id}", headers=async_auth_headers)
+    assert read_res.json()["result"] == 15.0
+
+    list_res = async_client.get("/calculations", headers=async_auth_headers)
+    assert [c["id"] for c in list_res.json()] == [calc_id]
+
+    update_res = async_client.put(
+        f"/calculations/{calc_id}", json={"inputs": [10, 10]}, headers=async_auth_headers
+    )
+    assert update_res.json()["result"] == 20.0
+
+    del_res = async_client.delete(f"/calculations/{calc_id}", headers=async_auth_headers)
+    assert del_res.status_code == 204
+    missing_res = async_client.get(f"/calculations/{calc_id}", headers=async_auth_headers)
+    assert missing_res.status_code == 404
+
+def test_async_batch_and_export(async_client, async_auth_headers):
+    """Test the async batch endpoint and the streamed export."""
+    batch_res = async_client.post("/calculations/batch", json={"items": [
+        {"type": "multiplication", "inputs": [2, 3]},
+        {"type": "division", "inputs": [1, 0]},
+    ]}, headers=async_auth_headers)
+    assert batch_res.status_code == 201
+    assert batch_res.json()["created"] == 1
+
+    export_res = async_client.get("/calculations/export", headers=async_auth_headers)
+    records = [json.loads(line) for line in export_res.text.splitlines()]
+    assert [r["result"] for r in records] == [6.0]
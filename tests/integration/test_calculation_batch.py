@@ -0,0 +1,56 @@
+# tests/integration/test_calculation_batch.py
+
+from app.models.calculation import Calculation
+
+def test_batch_creates_all_valid_items(client, auth_headers, db_session):
+    """Test that every valid item is computed and persisted."""
+    payload = {"items": [
+        {"type": "addition", "inputs": [1, 2, 3]},
+        {"type": "subtraction", "inputs": [10, 4]},
+        {"type": "multiplication", "inputs": [2, 5]},
+        {"type": "division", "inputs": [9, 3]},
+    ]}
+    response = client.post("/calculations/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+
+    body = response.json()
+    assert body["created"] == 4
+    assert body["failed"] == 0
+    assert [r["calculation"]["result"] for r in body["results"]] == [6.0, 6.0, 10.0, 3.0]
+    assert db_session.query(Calculation).count() == 4
+
+def test_batch_reports_item_errors_without_aborting(client, auth_headers, db_session):
+    """Test that invalid items are reported while the remaining items are still created."""
+    payload = {"items": [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [10, 0]},
+        {"type": "square_root", "inputs": [4, 2]},
+        {"type": "multiplication", "inputs": [3, 3]},
+    ]}
+    response = client.post("/calculations/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    results = {r["index"]: r for r in body["results"]}
+    assert results[0]["calculation"]["result"] == 3.0
+    assert "Cannot divide by zero" in results[1]["error"]
+    assert "Type must be one of" in results[2]["error"]
+    assert results[3]["calculation"]["result"] == 9.0
+
+    stored = {str(c.id): c.type for c in db_session.query(Calculation).all()}
+    assert stored == {
+        results[0]["calculation"]["id"]: "addition",
+        results[3]["calculation"]["id"]: "multiplication",
+    }
+
+def test_batch_rejects_empty_request(client, auth_headers):
+    """Test that an empty batch is rejected by validation."""
+    response = client.post("/calculations/batch", json={"items": []}, headers=auth_headers)
+    assert response.status_code == 422
+
+def test_batch_requires_authentication(client):
+    """Test that the batch endpoint requires a bearer token."""
+    response = client.post("/calculations/batch", json={"items": [{"type": "addition", "inputs": [1, 2]}]})
+    assert response.status_code == 401
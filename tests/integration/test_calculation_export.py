@@ -0,0 +1,53 @@
+# tests/integration/test_calculation_export.py
+
+import csv
+import io
+import json
+
+def create_batch(client, headers, items):
+    response = client.post("/calculations/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 201
+    return [r["calculation"]["id"] for r in response.json()["results"]]
+
+def test_export_ndjson(client, auth_headers):
+    """Test that NDJSON export emits one JSON object per calculation."""
+    ids = create_batch(client, auth_headers, [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "multiplication", "inputs": [3, 4]},
+    ])
+    response = client.get("/calculations/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["id"] for r in records) == sorted(ids)
+    assert {r["type"]: r["result"] for r in records} == {"addition": 3.0, "multiplication": 12.0}
+
+def test_export_csv(client, auth_headers):
+    """Test that CSV export has a header row and JSON-encoded inputs."""
+    create_batch(client, auth_headers, [{"type": "subtraction", "inputs": [10, 4]}])
+    response = client.get("/calculations/export", params={"format": "csv"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["type"] == "subtraction"
+    assert json.loads(rows[0]["inputs"]) == [10.0, 4.0]
+    assert float(rows[0]["result"]) == 6.0
+
+def test_export_filters_by_type(client, auth_headers):
+    """Test that the type filter applies to exports."""
+    create_batch(client, auth_headers, [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [8, 2]},
+    ])
+    response = client.get("/calculations/export", params={"type": "division"}, headers=auth_headers)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["type"] for r in records] == ["division"]
+
+def test_export_empty_history(client, auth_headers):
+    """Test that an empty history exports an empty body."""
+    response = client.get("/calculations/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.text == ""
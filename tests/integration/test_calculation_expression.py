@@ -0,0 +1,72 @@
+# tests/integration/test_calculation_expression.py
+
+import json
+
+def create(client, headers, inputs, expression, calc_type="expression"):
+    return client.post(
+        "/calculations", json={"type": calc_type, "inputs": inputs, "expression": expression}, headers=headers
+    )
+
+def test_create_and_get_expression(client, auth_headers):
+    """Test that an expression calculation is evaluated and stored with its formula."""
+    response = create(client, auth_headers, [3, 4], "sqrt(a**2 + b**2)")
+    assert response.status_code == 201
+    calc = response.json()
+    assert calc["result"] == 5
+    assert calc["expression"] == "sqrt(a**2 + b**2)"
+
+    fetched = client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()
+    assert fetched["expression"] == "sqrt(a**2 + b**2)"
+    assert fetched["result"] == 5
+
+def test_invalid_expressions_are_rejected(client, auth_headers):
+    assert create(client, auth_headers, [1], "__import__('os')").status_code == 422
+    assert create(client, auth_headers, [1, 2], "a + b + c").status_code == 422
+    assert create(client, auth_headers, [1, 0], "a / b").status_code == 400
+    assert create(client, auth_headers, [1, 2], "a + b", calc_type="addition").status_code == 422
+    assert client.post("/calculations", json={"type": "expression", "inputs": [1]}, headers=auth_headers).status_code == 422
+
+def test_batch_with_expressions(client, auth_headers):
+    response = client.post("/calculations/batch", json={"items": [
+        {"type": "expression", "inputs": [2, 3], "expression": "a * b + 1"},
+        {"type": "expression", "inputs": [2], "expression": "log(a - 2)"},
+        {"type": "addition", "inputs": [1, 2]},
+    ]}, headers=auth_headers)
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert results[0]["calculation"]["result"] == 7
+    assert results[0]["calculation"]["expression"] == "a * b + 1"
+    assert results[1]["error"]
+    assert results[2]["calculation"]["expression"] is None
+
+def test_update_expression_row(client, auth_headers):
+    """Test that new inputs are evaluated with the row's formula, and the formula can change."""
+    calc = create(client, auth_headers, [10, 4], "a - 2 * b").json()
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [20, 5]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 10
+    assert response.json()["expression"] == "a - 2 * b"
+
+    response = client.put(f"/calculations/{calc['id']}", json={"expression": "a / b"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 4
+    assert response.json()["inputs"] == [20, 5]
+
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [1, 0]}, headers=auth_headers)
+    assert response.status_code == 400
+    assert client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()["result"] == 4
+
+    stats = client.get("/calculations/stats", headers=auth_headers).json()
+    assert stats["types"] == [{**stats["types"][0], "type": "expression", "count": 1, "min_result": 4, "max_result": 4}]
+
+def test_expression_on_other_types_is_rejected(client, auth_headers):
+    calc = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}, headers=auth_headers).json()
+    response = client.put(f"/calculations/{calc['id']}", json={"expression": "a * b"}, headers=auth_headers)
+    assert response.status_code == 400
+    assert client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()["result"] == 3
+
+def test_export_includes_the_expression(client, auth_headers):
+    create(client, auth_headers, [1, 2], "a + b")
+    response = client.get("/calculations/export", headers=auth_headers)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["expression"] for r in records] == ["a + b"]
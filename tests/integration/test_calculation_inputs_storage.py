@@ -0,0 +1,63 @@
+# tests/integration/test_calculation_inputs_storage.py
+
+import json
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database_init import pack_calculation_inputs
+
+def stored(db_session, calc_id):
+    """The raw inputs columns of a calculation."""
+    return db_session.execute(
+        text("SELECT inputs, inputs_packed, inputs_width FROM calculations WHERE id = :id"),
+        {"id": calc_id.replace("-", "")},
+    ).one()
+
+def create_all(client, headers):
+    response = client.post("/calculations/batch", json={"items": [
+        {"type": "addition", "inputs": [1, 2.5]},
+        {"type": "division", "inputs": [[8, 2], [9, 3]], "axis": "rows"},
+        {"type": "expression", "inputs": [3, 4], "expression": "sqrt(a**2 + b**2)"},
+    ]}, headers=headers)
+    assert response.status_code == 201
+    single = client.post("/calculations", json={"type": "subtraction", "inputs": [10, 4]}, headers=headers)
+    return [r["calculation"]["id"] for r in response.json()["results"]] + [single.json()["id"]]
+
+def responses(client, headers, ids):
+    return [client.get(f"/calculations/{calc_id}", headers=headers).json() for calc_id in ids]
+
+def test_inputs_are_packed_by_default(client, auth_headers, db_session):
+    ids = create_all(client, auth_headers)
+    inputs, packed, width = stored(db_session, ids[1])
+    assert (json.loads(inputs), len(packed), width) == (None, 32, 2)
+    assert [c["inputs"] for c in responses(client, auth_headers, ids)] == [[1, 2.5], [[8, 2], [9, 3]], [3, 4], [10, 4]]
+
+    response = client.put(f"/calculations/{ids[0]}", json={"inputs": [4, 5]}, headers=auth_headers)
+    assert (response.json()["inputs"], response.json()["result"]) == ([4, 5], 9)
+    assert len(stored(db_session, ids[0]).inputs_packed) == 16
+
+def test_json_rows_are_read_and_packed_by_the_migration(client, auth_headers, db_session):
+    """Test that JSON rows are served as before and converted by pack_calculation_inputs."""
+    with patch.object(settings, "CALCULATION_INPUTS_FORMAT", "json"):
+        ids = create_all(client, auth_headers)
+    assert all(stored(db_session, calc_id).inputs_packed is None for calc_id in ids)
+    before = responses(client, auth_headers, ids)
+
+    response = client.put(f"/calculations/{ids[2]}", json={"expression": "a * b"}, headers=auth_headers)
+    assert (response.json()["inputs"], response.json()["result"]) == ([3, 4], 12)
+    before[2] = client.get(f"/calculations/{ids[2]}", headers=auth_headers).json()
+
+    db_session.commit()
+    assert pack_calculation_inputs(db_session.get_bind(), batch_size=2) == 3
+    assert pack_calculation_inputs(db_session.get_bind()) == 0
+    db_session.expire_all()
+    inputs, packed, width = stored(db_session, ids[1])
+    assert (json.loads(inputs), len(packed), width) == (None, 32, 2)
+    assert responses(client, auth_headers, ids) == before
+
+    export = client.get("/calculations/export", headers=auth_headers).text.splitlines()
+    assert sorted(json.dumps(json.loads(line)["inputs"]) for line in export) == sorted(
+        json.dumps(c["inputs"]) for c in before
+    )
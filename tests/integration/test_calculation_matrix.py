@@ -0,0 +1,75 @@
+# tests/integration/test_calculation_matrix.py
+
+import json
+
+def create(client, headers, calc_type, inputs, **extra):
+    return client.post("/calculations", json={"type": calc_type, "inputs": inputs, **extra}, headers=headers)
+
+def test_matrix_by_rows_and_columns(client, auth_headers):
+    """Test that matrix inputs get one result per row by default, or one per column."""
+    response = create(client, auth_headers, "subtraction", [[10, 2, 3], [1, 1, 1]])
+    assert response.status_code == 201
+    calc = response.json()
+    assert calc["axis"] == "rows"
+    assert calc["result"] is None
+    assert calc["results"] == [5, -1]
+
+    response = create(client, auth_headers, "division", [[8, 1], [2, 4]], axis="columns")
+    assert response.status_code == 201
+    assert response.json()["results"] == [4, 0.25]
+
+    fetched = client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()
+    assert fetched["results"] == [5, -1]
+    listed = client.get("/calculations", headers=auth_headers).json()
+    assert sorted(c["axis"] for c in listed) == ["columns", "rows"]
+
+def test_invalid_matrices_are_rejected(client, auth_headers):
+    assert create(client, auth_headers, "addition", [[1, 2], [3]]).status_code == 422
+    assert create(client, auth_headers, "addition", [[1], [2]]).status_code == 422
+    assert create(client, auth_headers, "addition", [[1, 2]], axis="columns").status_code == 422
+    assert create(client, auth_headers, "division", [[1, 2], [0, 4]], axis="columns").status_code == 422
+    assert create(client, auth_headers, "division", [[1, 0], [2, 4]]).status_code == 422
+    assert create(client, auth_headers, "addition", [1, 2], axis="rows").status_code == 422
+    assert create(client, auth_headers, "expression", [[1, 2]], expression="a + b").status_code == 422
+    assert create(client, auth_headers, "multiplication", [[1e300, 1e300]]).status_code == 400
+
+def test_batch_mixes_scalar_and_matrix_items(client, auth_headers):
+    response = client.post("/calculations/batch", json={"items": [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "multiplication", "inputs": [[1, 2], [3, 4], [5, 6]]},
+    ]}, headers=auth_headers)
+    assert response.status_code == 201
+    scalar, matrix = (r["calculation"] for r in response.json()["results"])
+    assert (scalar["result"], scalar["results"]) == (3, None)
+    assert (matrix["result"], matrix["results"]) == (None, [2, 12, 30])
+    assert client.get(f"/calculations/{matrix['id']}", headers=auth_headers).json()["results"] == [2, 12, 30]
+
+def test_update_matrix(client, auth_headers):
+    """Test that a matrix calculation is recomputed along its axis and keeps its mode."""
+    calc = create(client, auth_headers, "addition", [[1, 2], [3, 4]], axis="columns").json()
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [[1, 1, 1], [2, 2, 2]]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [3, 3, 3]
+
+    assert client.put(f"/calculations/{calc['id']}", json={"inputs": [1, 2]}, headers=auth_headers).status_code == 400
+    response = client.put(f"/calculations/{calc['id']}", json={}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [3, 3, 3]
+
+    scalar = create(client, auth_headers, "addition", [1, 2]).json()
+    assert client.put(f"/calculations/{scalar['id']}", json={"inputs": [[1, 2]]}, headers=auth_headers).status_code == 400
+
+def test_matrix_calculations_are_left_out_of_stats(client, auth_headers):
+    create(client, auth_headers, "addition", [1, 2])
+    matrix = create(client, auth_headers, "addition", [[100, 200]]).json()
+    types = client.get("/calculations/stats", headers=auth_headers).json()["types"]
+    assert (types[0]["count"], types[0]["max_result"]) == (1, 3)
+    assert client.delete(f"/calculations/{matrix['id']}", headers=auth_headers).status_code == 204
+    assert client.get("/calculations/stats", headers=auth_headers).json()["types"][0]["count"] == 1
+
+def test_export_includes_matrix_results(client, auth_headers):
+    create(client, auth_headers, "addition", [[1, 2], [3, 4]])
+    records = [json.loads(line) for line in client.get("/calculations/export", headers=auth_headers).text.splitlines()]
+    assert [(r["axis"], r["results"]) for r in records] == [("rows", [3, 7])]
+    response = client.get("/calculations/export", params={"format": "csv"}, headers=auth_headers)
+    assert "[3.0, 7.0]" in response.text
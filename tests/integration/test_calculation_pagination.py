@@ -0,0 +1,93 @@
+# tests/integration/test_calculation_pagination.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+
+def create_batch(client, headers, items):
+    response = client.post("/calculations/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 201
+    return [r["calculation"]["id"] for r in response.json()["results"]]
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the values it was built from."""
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901)
+    id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+
+def test_decode_cursor_rejects_garbage():
+    """Test that a malformed cursor raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
+
+def test_list_walks_all_pages_in_order(client, auth_headers):
+    """Test that following X-Next-Cursor returns every calculation exactly once."""
+    ids = create_batch(client, auth_headers, [{"type": "addition", "inputs": [i, 1]} for i in range(5)])
+    ids += create_batch(client, auth_headers, [{"type": "addition", "inputs": [i, 2]} for i in range(2)])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/calculations", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 3
+        seen += [c["id"] for c in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(set(seen))
+
+def test_list_without_more_rows_has_no_cursor(client, auth_headers):
+    """Test that the last page does not carry a cursor."""
+    create_batch(client, auth_headers, [{"type": "addition", "inputs": [1, 2]}])
+    response = client.get("/calculations", params={"limit": 1}, headers=auth_headers)
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+
+def test_list_filters_by_type(client, auth_headers):
+    """Test that the type filter only returns matching calculations."""
+    create_batch(client, auth_headers, [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [4, 2]},
+        {"type": "division", "inputs": [9, 3]},
+    ])
+    response = client.get("/calculations", params={"type": "division"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [c["type"] for c in response.json()] == ["division", "division"]
+
+def test_list_filters_by_created_range(client, auth_headers):
+    """Test the created_after and created_before filters."""
+    create_batch(client, auth_headers, [{"type": "addition", "inputs": [1, 2]}])
+    now = datetime.utcnow()
+
+    before = client.get(
+        "/calculations",
+        params={"created_before": (now - timedelta(hours=1)).isoformat()},
+        headers=auth_headers,
+    )
+    after = client.get(
+        "/calculations",
+        params={"created_after": (now - timedelta(hours=1)).isoformat() + "Z"},
+        headers=auth_headers,
+    )
+    assert before.json() == []
+    assert len(after.json()) == 1
+
+def test_list_rejects_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is a 400."""
+    response = client.get("/calculations", params={"cursor": "garbage"}, headers=auth_headers)
+    assert response.status_code == 400
+
+def test_list_rejects_limit_above_maximum(client, auth_headers):
+    """Test that limit is bounded."""
+    response = client.get("/calculations", params={"limit": 100000}, headers=auth_headers)
+    assert response.status_code == 422
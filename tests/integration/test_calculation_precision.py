@@ -0,0 +1,67 @@
+# tests/integration/test_calculation_precision.py
+
+import json
+
+from app.operations.exact import MAX_EXACT_INPUTS
+
+def create(client, headers, calc_type, inputs, **extra):
+    return client.post("/calculations", json={"type": calc_type, "inputs": inputs, **extra}, headers=headers)
+
+def test_decimal_and_rational_results(client, auth_headers):
+    """Test that the exact modes return result_exact as a string, and float64 stays the default."""
+    response = create(client, auth_headers, "addition", [0.1, 0.2], precision="decimal")
+    assert response.status_code == 201
+    calc = response.json()
+    assert (calc["precision"], calc["result_exact"], calc["result"]) == ("decimal", "0.3", 0.3)
+
+    fetched = client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()
+    assert (fetched["precision"], fetched["result_exact"]) == ("decimal", "0.3")
+
+    rational = create(client, auth_headers, "division", [1, 3], precision="rational").json()
+    assert rational["result_exact"] == "0." + "3" * 28
+
+    default = create(client, auth_headers, "addition", [0.1, 0.2]).json()
+    assert (default["precision"], default["result_exact"], default["result"]) == ("float64", None, 0.1 + 0.2)
+
+    listed = client.get("/calculations", headers=auth_headers).json()
+    assert sorted(c["result_exact"] or "" for c in listed) == sorted(["0.3", rational["result_exact"], ""])
+
+def test_exact_modes_are_rejected_for_matrices_and_expressions(client, auth_headers):
+    assert create(client, auth_headers, "addition", [[1, 2]], precision="decimal").status_code == 422
+    assert create(client, auth_headers, "expression", [1], expression="a", precision="rational").status_code == 422
+    assert create(client, auth_headers, "addition", [1, 2], precision="binary128").status_code == 422
+
+def test_exact_modes_cap_the_number_of_inputs(client, auth_headers):
+    """Test that exact calculations are limited to MAX_EXACT_INPUTS inputs, on create and on update."""
+    inputs = [1.5] * MAX_EXACT_INPUTS
+    for precision in ("decimal", "rational"):
+        response = create(client, auth_headers, "multiplication", inputs + [1.5], precision=precision)
+        assert response.status_code == 422
+        assert f"at most {MAX_EXACT_INPUTS} inputs" in response.text
+    calc = create(client, auth_headers, "division", inputs, precision="rational")
+    assert calc.status_code == 201
+    assert create(client, auth_headers, "addition", inputs + [1.5]).status_code == 201
+
+    response = client.put(f"/calculations/{calc.json()['id']}", json={"inputs": inputs + [1.5]}, headers=auth_headers)
+    assert response.status_code == 400
+    assert f"at most {MAX_EXACT_INPUTS} inputs" in response.json()["detail"]
+
+def test_update_recomputes_in_the_row_precision(client, auth_headers):
+    calc = create(client, auth_headers, "multiplication", [1.1, 1.1], precision="decimal").json()
+    assert calc["result_exact"] == "1.21"
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [0.1, 0.1, 0.1]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.json()["precision"], response.json()["result_exact"]) == ("decimal", "0.001")
+    assert client.put(f"/calculations/{calc['id']}", json={}, headers=auth_headers).json()["result_exact"] == "0.001"
+
+def test_batch_and_export(client, auth_headers):
+    response = client.post("/calculations/batch", json={"items": [
+        {"type": "subtraction", "inputs": [1, 0.9], "precision": "decimal"},
+        {"type": "subtraction", "inputs": [1, 0.9]},
+    ]}, headers=auth_headers)
+    exact, binary = (r["calculation"] for r in response.json()["results"])
+    assert exact["result_exact"] == "0.1"
+    assert binary["result_exact"] is None
+
+    records = [json.loads(line) for line in client.get("/calculations/export", headers=auth_headers).text.splitlines()]
+    assert sorted((r["precision"], r["result_exact"]) for r in records) == [("decimal", "0.1"), ("float64", None)]
@@ -0,0 +1,94 @@
+# tests/integration/test_calculation_stats.py
+
+from app.models import CalculationStats
+
+def create(client, headers, calc_type, inputs):
+    response = client.post("/calculations", json={"type": calc_type, "inputs": inputs}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+def stats_by_type(client, headers):
+    response = client.get("/calculations/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json(), {t["type"]: t for t in response.json()["types"]}
+
+def test_stats_empty(client, auth_headers):
+    """Test that a user without calculations gets an empty summary."""
+    body, types = stats_by_type(client, auth_headers)
+    assert body == {"total_count": 0, "last_activity": None, "types": []}
+
+def test_stats_follow_create_and_batch(client, auth_headers):
+    """Test that single and batch creates are both counted."""
+    create(client, auth_headers, "addition", [1, 2])
+    create(client, auth_headers, "addition", [10, 20])
+    response = client.post("/calculations/batch", json={"items": [
+        {"type": "addition", "inputs": [0, 1]},
+        {"type": "multiplication", "inputs": [2, 3]},
+        {"type": "division", "inputs": [1, 0]},
+    ]}, headers=auth_headers)
+    assert response.status_code == 201
+
+    body, types = stats_by_type(client, auth_headers)
+    assert body["total_count"] == 4
+    assert body["last_activity"] is not None
+    assert list(types) == ["addition", "multiplication"]
+    assert types["addition"]["count"] == 3
+    assert types["addition"]["min_result"] == 1
+    assert types["addition"]["max_result"] == 30
+    assert types["addition"]["avg_result"] == 34 / 3
+    assert types["multiplication"]["count"] == 1
+
+def test_stats_recompute_extremum_on_update_and_delete(client, auth_headers):
+    """Test that replacing or removing the min/max result recomputes it."""
+    low = create(client, auth_headers, "subtraction", [1, 0])
+    create(client, auth_headers, "subtraction", [5, 0])
+    high = create(client, auth_headers, "subtraction", [9, 0])
+
+    client.put(f"/calculations/{low['id']}", json={"inputs": [7, 0]}, headers=auth_headers)
+    _, types = stats_by_type(client, auth_headers)
+    assert (types["subtraction"]["min_result"], types["subtraction"]["max_result"]) == (5, 9)
+    assert types["subtraction"]["avg_result"] == 7
+
+    assert client.delete(f"/calculations/{high['id']}", headers=auth_headers).status_code == 204
+    _, types = stats_by_type(client, auth_headers)
+    assert types["subtraction"]["count"] == 2
+    assert (types["subtraction"]["min_result"], types["subtraction"]["max_result"]) == (5, 7)
+
+    assert client.delete(f"/calculations/{low['id']}", headers=auth_headers).status_code == 204
+    _, types = stats_by_type(client, auth_headers)
+    assert (types["subtraction"]["min_result"], types["subtraction"]["max_result"]) == (5, 5)
+
+def test_stats_hide_types_without_calculations(client, auth_headers):
+    """Test that a type whose calculations were all deleted is left out."""
+    calc = create(client, auth_headers, "addition", [1, 2])
+    client.delete(f"/calculations/{calc['id']}", headers=auth_headers)
+    body, _ = stats_by_type(client, auth_headers)
+    assert body["total_count"] == 0
+    assert body["types"] == []
+
+def test_stats_are_per_user(client, auth_headers, fake_user_data):
+    """Test that another user's calculations are not included."""
+    create(client, auth_headers, "addition", [1, 2])
+    password = fake_user_data["password"]
+    client.post("/auth/register", json={**fake_user_data, "confirm_password": password})
+    token = client.post("/auth/login", json={"username": fake_user_data["username"], "password": password})
+    other = {"Authorization": f"Bearer {token.json()['access_token']}"}
+    body, _ = stats_by_type(client, other)
+    assert body["total_count"] == 0
+
+def test_rebuild_matches_incremental_stats(client, auth_headers, db_session):
+    """Test that rebuilding the summary from the calculations table gives the same result."""
+    create(client, auth_headers, "addition", [1, 2])
+    create(client, auth_headers, "addition", [4, 4])
+    create(client, auth_headers, "division", [9, 3])
+    incremental, _ = stats_by_type(client, auth_headers)
+
+    db_session.query(CalculationStats).delete()
+    db_session.commit()
+    assert stats_by_type(client, auth_headers)[0]["total_count"] == 0
+
+    CalculationStats.rebuild(db_session)
+    db_session.commit()
+    rebuilt, _ = stats_by_type(client, auth_headers)
+    assert [{k: v for k, v in t.items() if k != "last_activity"} for t in rebuilt["types"]] == \
+        [{k: v for k, v in t.items() if k != "last_activity"} for t in incremental["types"]]
@@ -0,0 +1,99 @@
+# tests/integration/test_calculation_update.py
+
+from uuid import uuid4
+
+from app.operations.result_cache import result_cache
+
+def create(client, headers, calc_type, inputs):
+    response = client.post("/calculations", json={"type": calc_type, "inputs": inputs}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+def test_update_recomputes_with_one_select_and_one_update(client, auth_headers, count_statements):
+    """Test that an update reads the row's type once and writes the result with one UPDATE ... RETURNING."""
+    calc = create(client, auth_headers, "subtraction", [10, 4])
+    with count_statements() as statements:
+        response = client.put(f"/calculations/{calc['id']}", json={"inputs": [20, 5, 5]}, headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["result"] == 10
+    assert body["inputs"] == [20, 5, 5]
+    assert body["type"] == "subtraction"
+    assert body["updated_at"] >= calc["updated_at"]
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["SELECT", "UPDATE", "UPDATE"]
+    assert [s.lstrip().split()[1] for s in statements if s.lstrip().upper().startswith("UPDATE")] == [
+        "calculations", "calculation_stats",
+    ]
+
+def test_update_computes_only_the_stored_type(client, auth_headers):
+    """Test that an update computes one result, not one per calculation type."""
+    calc = create(client, auth_headers, "multiplication", [3, 4])
+    result_cache.clear()
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [7, 9, 11]}, headers=auth_headers)
+    assert response.json()["result"] == 693
+    assert result_cache.stats()["misses"] == 1
+    assert result_cache.stats()["size"] == 1
+
+def test_update_takes_two_statements_for_every_kind_of_row(client, auth_headers, count_statements):
+    """Test that expression, matrix and exact-precision rows are updated like float64 ones."""
+    payloads = [
+        ({"type": "expression", "inputs": [3, 4], "expression": "a * b"}, {"inputs": [5, 6]}, 30),
+        ({"type": "addition", "inputs": [[1, 2], [3, 4]], "axis": "rows"}, {"inputs": [[5, 6]]}, None),
+        ({"type": "division", "inputs": [1, 4], "precision": "decimal"}, {"inputs": [1, 8]}, 0.125),
+    ]
+    for payload, update, expected in payloads:
+        calc = client.post("/calculations", json=payload, headers=auth_headers).json()
+        with count_statements() as statements:
+            response = client.put(f"/calculations/{calc['id']}", json=update, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["result"] == expected
+        assert [s.lstrip().split()[0].upper() for s in statements] == ["SELECT", "UPDATE", "UPDATE"]
+
+def test_update_without_inputs_only_touches_timestamp(client, auth_headers):
+    """Test that an empty update keeps inputs and result."""
+    calc = create(client, auth_headers, "multiplication", [3, 4])
+    response = client.put(f"/calculations/{calc['id']}", json={}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 12
+    assert response.json()["inputs"] == [3, 4]
+
+def test_update_rejects_inputs_invalid_for_the_type(client, auth_headers):
+    """Test that a zero divisor is reported as 400 and leaves the row unchanged."""
+    calc = create(client, auth_headers, "division", [10, 2])
+    response = client.put(f"/calculations/{calc['id']}", json={"inputs": [1, 0]}, headers=auth_headers)
+    assert response.status_code == 400
+    assert "divide by zero" in response.json()["detail"]
+    assert client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()["result"] == 5
+
+def test_update_with_fewer_than_two_inputs_is_a_validation_error(client, auth_headers):
+    """Test that a flat list of under two numbers is rejected by the schema (422), as before."""
+    calc = create(client, auth_headers, "addition", [1, 2])
+    for inputs in ([5], []):
+        response = client.put(f"/calculations/{calc['id']}", json={"inputs": inputs}, headers=auth_headers)
+        assert response.status_code == 422
+    assert client.get(f"/calculations/{calc['id']}", headers=auth_headers).json()["inputs"] == [1, 2]
+
+    expression = client.post(
+        "/calculations", json={"type": "expression", "inputs": [4, 1], "expression": "a - b"}, headers=auth_headers
+    ).json()
+    response = client.put(
+        f"/calculations/{expression['id']}", json={"inputs": [9], "expression": "sqrt(a)"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["result"] == 3
+
+def test_update_and_delete_missing_calculation(client, auth_headers):
+    """Test that unknown ids are 404 and malformed ids 400."""
+    missing = str(uuid4())
+    assert client.put(f"/calculations/{missing}", json={"inputs": [1, 2]}, headers=auth_headers).status_code == 404
+    assert client.delete(f"/calculations/{missing}", headers=auth_headers).status_code == 404
+    assert client.put("/calculations/not-a-uuid", json={}, headers=auth_headers).status_code == 400
+
+def test_delete_in_one_statement(client, auth_headers, count_statements):
+    """Test that a delete is a single DELETE ... RETURNING plus the stats update, and the row is gone."""
+    calc = create(client, auth_headers, "addition", [1, 2])
+    with count_statements() as statements:
+        response = client.delete(f"/calculations/{calc['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["DELETE", "UPDATE"]
+    assert client.get(f"/calculations/{calc['id']}", headers=auth_headers).status_code == 404
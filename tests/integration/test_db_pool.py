@@ -0,0 +1,50 @@
+# tests/integration/test_db_pool.py
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.database import InstrumentedQueuePool, _pool_options, get_pool_stats
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+def test_pool_options_from_settings():
+    """Test that server databases get the configured pool and SQLite keeps its default."""
+    options = _pool_options("postgresql://u:p@db/app", InstrumentedQueuePool)
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= options.keys()
+    assert _pool_options("sqlite:///:memory:", InstrumentedQueuePool) == {}
+
+def test_pool_stats_track_checkouts_and_timeouts(pooled_engine):
+    """Test that checkouts, waits and timeouts are reported."""
+    conn = pooled_engine.connect()
+    conn.execute(text("SELECT 1"))
+    stats = get_pool_stats(pooled_engine)
+    assert stats["checked_out"] == 1
+    assert stats["size"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        pooled_engine.connect()
+    conn.close()
+
+    stats = get_pool_stats(pooled_engine)
+    assert stats["checked_out"] == 0
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds"]["count"] == 2
+    assert stats["wait_seconds"]["buckets"]["+Inf"] == 2
+
+def test_db_pool_endpoint(client):
+    """Test that the pool statistics endpoint responds."""
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    assert "pool" in response.json()["sync"]
@@ -0,0 +1,41 @@
+# tests/integration/test_metrics_endpoint.py
+
+from app.core.metrics import HTTP_REQUESTS, PHASE_SECONDS
+
+def _phase_count(phase):
+    for line in PHASE_SECONDS.render():
+        if line.startswith(f'app_phase_duration_seconds_count{{phase="{phase}"}}'):
+            return int(line.rsplit(" ", 1)[1])
+    return 0
+
+def test_requests_are_labelled_by_route_template(client, auth_headers):
+    """Test that requests are counted per route template rather than raw path."""
+    created = client.post(
+        "/calculations", json={"type": "addition", "inputs": [1, 2]}, headers=auth_headers
+    ).json()
+    client.get(f"/calculations/{created['id']}", headers=auth_headers)
+    client.get("/no/such/path")
+
+    text = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/calculations/{calc_id}",status="200"}' in text
+    assert 'http_request_duration_seconds_count{method="POST",route="/calculations"}' in text
+    assert 'route="unmatched",status="404"' in text
+    assert created["id"] not in text
+
+def test_phases_are_timed(client, auth_headers):
+    """Test that JWT decode, queries, computation and serialization are timed."""
+    before = {phase: _phase_count(phase) for phase in ("jwt_decode", "db_query", "compute", "serialize")}
+    client.post("/calculations", json={"type": "multiplication", "inputs": [3.25, 7.5]}, headers=auth_headers)
+    for phase, count in before.items():
+        assert _phase_count(phase) > count, phase
+
+def test_metrics_endpoint_includes_component_stats(client):
+    """Test that the endpoint serves the Prometheus text format with cache and pool metrics."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_requests_in_flight gauge" in response.text
+    assert "result_cache_lookups_total" in response.text
+    assert "auth_cache_lookups_total" in response.text
+    assert "password_service_pending" in response.text
+    assert HTTP_REQUESTS.name in response.text
@@ -0,0 +1,165 @@
+# tests/integration/test_schema_version.py
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Float, ForeignKey, MetaData, String, Table, create_engine, insert, inspect,
+    select, text, update,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.database_init import SchemaVersionError, check_schema_version, migrate
+from app.main import app
+from app.models.calculation import Calculation, encode_inputs
+from app.models.calculation_stats import CalculationStats
+from app.models.schema_version import SCHEMA_VERSION, SchemaVersion
+from app.models.user import User
+
+@pytest.fixture
+def empty_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+def test_migrate_records_the_schema_version(empty_engine):
+    with pytest.raises(SchemaVersionError, match="no schema version"):
+        check_schema_version(empty_engine)
+    migrate(empty_engine)
+    assert check_schema_version(empty_engine) == SCHEMA_VERSION
+    migrate(empty_engine)
+    assert check_schema_version(empty_engine) == SCHEMA_VERSION
+
+def test_check_rejects_another_version(empty_engine):
+    migrate(empty_engine)
+    with empty_engine.begin() as connection:
+        connection.execute(update(SchemaVersion.__table__).values(version=SCHEMA_VERSION - 1))
+    with pytest.raises(SchemaVersionError, match=f"expects {SCHEMA_VERSION}"):
+        check_schema_version(empty_engine)
+
+def test_fast_start_refuses_an_unmigrated_database(empty_engine):
+    """Test that FAST_START workers only check the version and fail on an unmigrated database."""
+    with patch.object(settings, "FAST_START", True), patch("app.main.engine", empty_engine):
+        with pytest.raises(SchemaVersionError):
+            with TestClient(app):
+                pass
+        migrate(empty_engine)
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 200
+
+def test_migrate_adds_new_columns_to_existing_tables(empty_engine):
+    """Test that a database created before a nullable column was added gains it on migrate."""
+    migrate(empty_engine)
+    with empty_engine.begin() as connection:
+        connection.execute(text("ALTER TABLE calculations DROP COLUMN expression"))
+    assert "expression" not in {c["name"] for c in inspect(empty_engine).get_columns("calculations")}
+    migrate(empty_engine)
+    assert "expression" in {c["name"] for c in inspect(empty_engine).get_columns("calculations")}
+
+def test_migrate_adds_columns_with_a_server_default(empty_engine):
+    """Test that a non-nullable column is added to an existing table with its server default."""
+    migrate(empty_engine)
+    with empty_engine.begin() as connection:
+        connection.execute(text("ALTER TABLE calculations DROP COLUMN precision"))
+    migrate(empty_engine)
+    precision = next(c for c in inspect(empty_engine).get_columns("calculations") if c["name"] == "precision")
+    assert not precision["nullable"]
+    assert "float64" in precision["default"]
+
+def test_migrate_backfills_the_stats_summary_when_it_is_created(empty_engine):
+    """Test that calculations written before calculation_stats existed are counted once it is created."""
+    migrate(empty_engine)
+    user_id = uuid4()
+    with empty_engine.begin() as connection:
+        connection.execute(insert(User.__table__).values(
+            id=user_id, first_name="A", last_name="B", email="a@example.com", username="ab", password="x",
+        ))
+        for inputs in ([1, 2], [3, 4]):
+            calculation = Calculation.create("addition", user_id, inputs)
+            connection.execute(insert(Calculation.__table__).values(
+                id=uuid4(), user_id=user_id, type="addition", **encode_inputs(inputs),
+                result=calculation.get_result(),
+            ))
+        connection.execute(text("DROP TABLE calculation_stats"))
+    migrate(empty_engine)
+    with empty_engine.connect() as connection:
+        row = connection.execute(select(CalculationStats.__table__)).one()
+    assert (row.count, row.total, row.min_result, row.max_result) == (2, 10.0, 3.0, 7.0)
+    # Later migrations leave the incrementally maintained summary alone
+    with empty_engine.begin() as connection:
+        connection.execute(update(CalculationStats.__table__).values(count=5))
+    migrate(empty_engine)
+    with empty_engine.connect() as connection:
+        assert connection.execute(select(CalculationStats.count)).scalar() == 5
+
+def create_baseline_schema(engine):
+    """The users and calculations tables as the first release created them."""
+    metadata = MetaData()
+    Table(
+        "users", metadata,
+        Column("id", PG_UUID(as_uuid=True), primary_key=True, index=True),
+        Column("username", String(50), unique=True, nullable=False, index=True),
+        Column("email", String, unique=True, nullable=False, index=True),
+        Column("password", String, nullable=False),
+        Column("first_name", String(50), nullable=False),
+        Column("last_name", String(50), nullable=False),
+        Column("is_active", Boolean),
+        Column("is_verified", Boolean),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Column("updated_at", DateTime(timezone=True), nullable=False),
+        Column("last_login", DateTime(timezone=True)),
+    )
+    Table(
+        "calculations", metadata,
+        Column("id", PG_UUID(as_uuid=True), primary_key=True),
+        Column("user_id", PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+        Column("type", String(50), nullable=False, index=True),
+        Column("inputs", JSON, nullable=False),
+        Column("result", Float),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    metadata.create_all(engine)
+    return metadata
+
+def test_migrate_upgrades_the_baseline_schema(empty_engine):
+    """Test that a database created by the first release gains the new columns and indexes."""
+    baseline = create_baseline_schema(empty_engine)
+    user_id, now = uuid4(), datetime.utcnow()
+    with empty_engine.begin() as connection:
+        connection.execute(insert(baseline.tables["users"]).values(
+            id=user_id, username="ab", email="a@example.com", password="x", first_name="A", last_name="B",
+            created_at=now, updated_at=now,
+        ))
+        connection.execute(insert(baseline.tables["calculations"]).values(
+            id=uuid4(), user_id=user_id, type="addition", inputs=[1, 2], result=3.0, created_at=now, updated_at=now,
+        ))
+
+    migrate(empty_engine)
+    assert check_schema_version(empty_engine) == SCHEMA_VERSION
+    inspector = inspect(empty_engine)
+    indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes("calculations")}
+    assert indexes["ix_calculations_user_id_created_at_id"] == ["user_id", "created_at", "id"]
+    columns = {column["name"] for column in inspector.get_columns("calculations")}
+    assert {"expression", "axis", "inputs_packed", "precision", "result_exact"} <= columns
+    with empty_engine.connect() as connection:
+        assert connection.execute(select(CalculationStats.count, CalculationStats.total)).one() == (1, 3.0)
+
+def test_version_is_only_recorded_after_the_schema_is_reconciled(empty_engine):
+    """Test that a migration that fails to create an index leaves the previous version in place."""
+    migrate(empty_engine)
+    with empty_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_calculations_user_id_created_at_id"))
+        connection.execute(update(SchemaVersion.__table__).values(version=SCHEMA_VERSION - 1))
+    with patch("app.database_init._add_missing_indexes", side_effect=RuntimeError("disk full")):
+        with pytest.raises(RuntimeError):
+            migrate(empty_engine)
+    with pytest.raises(SchemaVersionError, match=f"version {SCHEMA_VERSION - 1}"):
+        check_schema_version(empty_engine)
+    migrate(empty_engine)
+    assert check_schema_version(empty_engine) == SCHEMA_VERSION
+    assert "ix_calculations_user_id_created_at_id" in {i["name"] for i in inspect(empty_engine).get_indexes("calculations")}
@@ -1,10 +1,15 @@
 # tests/integration/test_user_auth.py
 
 import pytest
-from uuid import UUID
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import UUID, uuid4
 import pydantic_core
 from sqlalchemy.exc import IntegrityError
+from app.auth import keys
+from app.auth.tokens import AsymmetricTokenService
 from app.models.user import User
+from app.schemas.token import TokenType
 
 def test_password_hashing(db_session, fake_user_data):
     """Test password hashing and verification functionality"""
@@ -194,3 +199,17 @@ def test_missing_password_registration(db_session):
     # Adjust the expected error message
     with pytest.raises(ValueError, match="Password must be at least 6 characters long"):
         User.register(db_session, test_data)
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_refresh_token_is_rejected_on_protected_routes(client, algorithm):
+    """Test that a refresh token, signed with the same key as access tokens, is not accepted as one"""
+    service = AsymmetricTokenService(algorithm, keys.generate_private_key(algorithm))
+    user_id = uuid4()
+    access = service.mint(user_id, TokenType.ACCESS, timedelta(minutes=5))
+    refresh = service.mint(user_id, TokenType.REFRESH, timedelta(days=7))
+    with patch("app.models.user.token_service", service), patch("app.auth.jwt.token_service", service):
+        assert User.verify_token(refresh) is None
+        response = client.get("/calculations", headers={"Authorization": f"Bearer {refresh}"})
+        assert response.status_code == 401
+        response = client.get("/calculations", headers={"Authorization": f"Bearer {access}"})
+        assert response.status_code == 200
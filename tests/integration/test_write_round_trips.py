@@ -0,0 +1,22 @@
+# tests/integration/test_write_round_trips.py
+
+def test_create_calculation_is_insert_only(client, auth_headers, count_statements):
+    """Test that creating a calculation only inserts it and upserts the stats, without a reload."""
+    with count_statements() as statements:
+        response = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}, headers=auth_headers)
+    assert response.status_code == 201
+    body = response.json()
+    assert body["result"] == 3
+    assert body["id"] and body["created_at"] and body["updated_at"]
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["INSERT", "INSERT"]
+
+def test_register_does_not_reload_the_user(client, fake_user_data, count_statements):
+    """Test that registration is a duplicate check plus the INSERT, with no SELECT afterwards."""
+    payload = {key: fake_user_data[key] for key in ("first_name", "last_name", "email", "username", "password")}
+    payload["confirm_password"] = payload["password"]
+    with count_statements() as statements:
+        response = client.post("/auth/register", json=payload)
+    assert response.status_code == 201
+    assert response.json()["username"] == payload["username"]
+    assert response.json()["id"]
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["SELECT", "INSERT"]
@@ -0,0 +1,107 @@
+# tests/unit/test_asymmetric_tokens.py
+import json
+import os
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from jose import jwt
+from jose.exceptions import JWTError
+
+from app.auth import keys
+from app.auth.tokens import AsymmetricTokenService, TokenService, create_token_service
+from app.schemas.token import TokenType
+
+@pytest.fixture
+def key_files(tmp_path):
+    """Generate an Ed25519 key pair with the CLI; returns (private key path, JWKS path, kid)."""
+    private_key, jwks = tmp_path / "jwt.pem", tmp_path / "jwks.json"
+    assert keys.main(["--algorithm", "EdDSA", "--private-key", str(private_key), "--jwks", str(jwks)]) == 0
+    kid = json.loads(jwks.read_text())["keys"][0]["kid"]
+    return private_key, jwks, kid
+
+def test_rs256_is_byte_identical_to_jose():
+    """Test that RS256 tokens match jose's, kid header included, and verify with jose."""
+    private_key = keys.generate_private_key("RS256")
+    service = AsymmetricTokenService("RS256", private_key, key_id="key-1")
+    token = service.mint(uuid4(), TokenType.ACCESS, timedelta(minutes=5), jti="ab" * 16)
+    claims = jwt.get_unverified_claims(token)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    assert token == jwt.encode(claims, pem, algorithm="RS256", headers={"kid": "key-1"})
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    assert jwt.decode(token, public_pem, algorithms=["RS256"]) == claims
+    assert jwt.get_unverified_header(token)["kid"] == "key-1"
+    assert service.verify(token, TokenType.ACCESS) == claims
+    with pytest.raises(JWTError, match="Invalid token type"):
+        service.verify(token, TokenType.REFRESH)
+
+def test_verifier_node_needs_only_the_jwks(key_files):
+    """Test that a node with only the JWKS file verifies tokens but cannot mint them."""
+    private_key, jwks, kid = key_files
+    signer = AsymmetricTokenService.from_files("EdDSA", private_key_file=str(private_key))
+    verifier = AsymmetricTokenService.from_files("EdDSA", jwks_file=str(jwks))
+    assert signer.key_id == kid
+
+    user_id = uuid4()
+    token = signer.mint(user_id, TokenType.ACCESS, timedelta(minutes=5))
+    assert verifier.verify(token, TokenType.ACCESS)["sub"] == str(user_id)
+    with pytest.raises(RuntimeError):
+        verifier.mint(user_id, TokenType.ACCESS, timedelta(minutes=5))
+
+def test_verify_rejects_unknown_keys_and_forgeries(key_files):
+    private_key, jwks, _ = key_files
+    verifier = AsymmetricTokenService.from_files("EdDSA", jwks_file=str(jwks))
+    stranger = AsymmetricTokenService("EdDSA", keys.generate_private_key("EdDSA"))
+    token = stranger.mint(uuid4(), TokenType.ACCESS, timedelta(minutes=5))
+    with pytest.raises(JWTError, match="Unknown key id"):
+        verifier.verify(token, TokenType.ACCESS)
+
+    signer = AsymmetricTokenService.from_files("EdDSA", private_key_file=str(private_key))
+    header, payload, _ = signer.mint(uuid4(), TokenType.ACCESS, timedelta(minutes=5)).split(".")
+    with pytest.raises(JWTError, match="Signature verification failed"):
+        verifier.verify(f"{header}.{payload}.{token.split('.')[2]}", TokenType.ACCESS)
+
+    hmac_token = jwt.encode({"sub": "x"}, "secret", algorithm="HS256", headers={"kid": signer.key_id})
+    with pytest.raises(JWTError, match="alg"):
+        verifier.verify(hmac_token, TokenType.ACCESS)
+
+def test_rotated_keys_are_picked_up_from_the_jwks_file(key_files, tmp_path):
+    """Test that a kid added to the JWKS file after startup is accepted."""
+    _, jwks, _ = key_files
+    verifier = AsymmetricTokenService.from_files("EdDSA", jwks_file=str(jwks))
+    new_key = tmp_path / "new.pem"
+    keys.main(["--algorithm", "EdDSA", "--private-key", str(new_key), "--jwks", str(jwks), "--kid", "rotated"])
+    stat = os.stat(jwks)
+    os.utime(jwks, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    signer = AsymmetricTokenService.from_files("EdDSA", private_key_file=str(new_key), key_id="rotated")
+    token = signer.mint("user", TokenType.ACCESS, timedelta(minutes=5))
+    assert verifier.verify(token, TokenType.ACCESS)["sub"] == "user"
+    assert len(json.loads(jwks.read_text())["keys"]) == 2
+
+def test_create_token_service_follows_the_algorithm(key_files):
+    private_key, jwks, _ = key_files
+    config = SimpleNamespace(
+        ALGORITHM="HS256",
+        JWT_SECRET_KEY="a",
+        JWT_REFRESH_SECRET_KEY="b",
+        JWT_PRIVATE_KEY_FILE=None,
+        JWT_PRIVATE_KEY_PASSWORD=None,
+        JWT_KEY_ID=None,
+        JWT_JWKS_FILE=None,
+    )
+    assert isinstance(create_token_service(config), TokenService)
+    with pytest.raises(ValueError):
+        create_token_service(SimpleNamespace(**{**vars(config), "ALGORITHM": "EdDSA"}))
+    service = create_token_service(SimpleNamespace(
+        **{**vars(config), "ALGORITHM": "EdDSA", "JWT_PRIVATE_KEY_FILE": str(private_key), "JWT_JWKS_FILE": str(jwks)}
+    ))
+    assert isinstance(service, AsymmetricTokenService)
+    with pytest.raises(ValueError):
+        AsymmetricTokenService("RS256", keys.load_private_key(private_key))
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.operations import engine
+from app.operations.engine import CalculationRangeError, VECTORIZE_THRESHOLDS
+
+LARGE = VECTORIZE_THRESHOLDS["divide"]
+
+def large(values):
+    """Pad a list of inputs with zeros to the divide threshold, leaving its sum unchanged."""
+    return values + [0.0] * (LARGE - len(values))
+
+def large_product(values, size=LARGE):
+    """Pad a list of inputs with ones, leaving its product and quotient unchanged."""
+    return values + [1.0] * (size - len(values))
+
+def test_long_inputs_give_the_same_results():
+    """Padding with neutral elements does not change any kernel's result."""
+    small = [100.0, 2.0, 5.0]
+    assert engine.add(small) == engine.add(large(small)) == 107.0
+    assert engine.subtract(small) == engine.subtract(large(small)) == 93.0
+    assert engine.multiply(small) == engine.multiply(large_product(small)) == 1000.0
+    assert engine.divide(small) == engine.divide(large_product(small)) == 10.0
+
+def test_divide_switches_to_numpy_at_its_threshold():
+    """Quotients just below the threshold are folded in Python, from it on with NumPy, and agree."""
+    values = [100.0, 2.0, 5.0, 0.5]
+    with patch.object(engine, "_vector_divide", wraps=engine._vector_divide) as vector_divide:
+        assert engine.divide(large_product(values, LARGE - 1)) == 20.0
+        assert vector_divide.call_count == 0
+        assert engine.divide(large_product(values, LARGE)) == 20.0
+        assert vector_divide.call_count == 1
+
+def test_sums_of_large_inputs():
+    """Large inputs are summed correctly."""
+    values = [float(i) for i in range(1, 10001)]
+    assert engine.add(values) == 50005000.0
+    assert engine.subtract(values) == 1.0 - (50005000.0 - 1.0)
+
+@pytest.mark.parametrize("values", [[10.0, 0.0], large_product([10.0, 2.0, 0.0])])
+def test_divide_detects_zero_divisor(values):
+    """A zero divisor raises ZeroDivisionError on both paths."""
+    with pytest.raises(ZeroDivisionError):
+        engine.divide(values)
+
+@pytest.mark.parametrize("values", [[1e300, 1e300], large_product([1e300, 1e300])])
+def test_multiply_reports_overflow(values):
+    """A finite product that leaves the float64 range is reported."""
+    with pytest.raises(CalculationRangeError, match="overflows"):
+        engine.multiply(values)
+
+@pytest.mark.parametrize("values", [[1e-300, 1e300], large_product([1e-300, 1e300])])
+def test_divide_reports_underflow(values):
+    """A non-zero quotient that rounds to zero is reported."""
+    with pytest.raises(CalculationRangeError, match="underflows"):
+        engine.divide(values)
+
+def test_divide_falls_back_when_divisor_product_overflows():
+    """Sequential division is used when only the divisor product leaves the float64 range."""
+    values = large_product([1e300, 1e200, 1e200])
+    assert engine.divide(values) == pytest.approx(1e-100)
+
+def test_zero_product_is_not_underflow():
+    """A product with a zero factor is a legitimate zero."""
+    assert engine.multiply([5.0, 0.0]) == 0.0
+    assert engine.multiply(large_product([5.0, 0.0])) == 0.0
+
+def test_empty_inputs_rejected():
+    """Kernels require at least one input."""
+    with pytest.raises(ValueError, match="at least one number"):
+        engine.add([])
+
+def test_reduce_lanes_matches_the_scalar_kernels():
+    """Each row (or column) is folded exactly as the scalar kernels fold a list."""
+    matrix = [[100.0, 2.0, 5.0], [7.0, 0.5, 4.0], [-3.0, 3.0, 1.0]]
+    columns = [list(column) for column in zip(*matrix)]
+    kernels = {"add": engine.add, "subtract": engine.subtract, "multiply": engine.multiply, "divide": engine.divide}
+    for operation, kernel in kernels.items():
+        assert engine.reduce_lanes(operation, matrix) == [kernel(row) for row in matrix]
+        assert engine.reduce_lanes(operation, matrix, by_columns=True) == [kernel(column) for column in columns]
+
+def test_reduce_lanes_checks_every_lane():
+    with pytest.raises(ZeroDivisionError):
+        engine.reduce_lanes("divide", [[1.0, 2.0], [3.0, 0.0]])
+    with pytest.raises(CalculationRangeError, match="overflows"):
+        engine.reduce_lanes("multiply", [[1.0, 2.0], [1e300, 1e300]])
+    with pytest.raises(CalculationRangeError, match="underflows"):
+        engine.reduce_lanes("divide", [[1e-300, 1e300], [1.0, 2.0]])
+    assert engine.reduce_lanes("divide", [[1e300, 1e200, 1e200], [1.0, 2.0, 4.0]]) == [1e-100, 0.125]
+    with pytest.raises(ValueError, match="same number"):
+        engine.reduce_lanes("add", [[1.0, 2.0], [3.0]])
+
+def test_sums_are_compensated():
+    """Sums are correctly rounded instead of drifting with the order of the inputs."""
+    assert engine.add([1e16, 1.0, -1e16]) == 1.0
+    assert engine.add([0.1] * 10) == 1.0
+    assert engine.add(large([1e16, 1.0, -1e16])) == 1.0
+    assert engine.subtract([1.0, 1e16, 1.0, -1e16]) == 0.0
+    assert engine.reduce_lanes("add", [[1e16, 1.0, -1e16], [0.5, 0.25, 0.25]]) == [1.0, 1.0]
+    assert engine.reduce_lanes("subtract", [[2.0, 1e16, 1.0, -1e16]]) == [1.0]
+    with pytest.raises(CalculationRangeError):
+        engine.add([1e308, 1e308])
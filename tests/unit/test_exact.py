@@ -0,0 +1,46 @@
+# tests/unit/test_exact.py
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.operations.exact import MAX_EXACT_INPUTS, reduce_exact
+
+def test_decimal_mode_uses_the_shortest_repr_of_inputs():
+    assert reduce_exact("add", [0.1, 0.2], "decimal") == Decimal("0.3")
+    assert reduce_exact("subtract", [1, 0.1, 0.2, 0.3, 0.4], "decimal") == 0
+    assert reduce_exact("multiply", [1.1, 1.1], "decimal") == Decimal("1.21")
+    assert reduce_exact("divide", [1, 3], "decimal") == Decimal("0." + "3" * 28)
+
+def test_rational_mode_rounds_once():
+    """Test that a chain of divisions is rounded once in rational mode and at every step in decimal."""
+    with patch.object(settings, "DECIMAL_PRECISION", 4):
+        assert reduce_exact("divide", [1, 3, 2], "rational") == Decimal("0.1667")
+        assert reduce_exact("divide", [1, 3, 2], "decimal") == Decimal("0.1666")
+        assert reduce_exact("multiply", [0.5, 0.25, 8], "rational") == 1
+
+def test_context_is_configurable():
+    with patch.object(settings, "DECIMAL_PRECISION", 3), patch.object(settings, "DECIMAL_ROUNDING", "ROUND_DOWN"):
+        assert reduce_exact("divide", [2, 3], "decimal") == Decimal("0.666")
+
+@pytest.mark.parametrize("values, error", [
+    ([1, 0], ZeroDivisionError),
+    ([1, float("inf")], ValueError),
+    ([], ValueError),
+    ([1.5] * (MAX_EXACT_INPUTS + 1), ValueError),
+])
+def test_invalid_inputs(values, error):
+    with pytest.raises(error):
+        reduce_exact("divide", values, "rational")
+
+def test_model_exact_results():
+    calculation = Calculation.create("addition", None, [0.1, 0.2], precision="decimal")
+    assert calculation.get_exact_result() == Decimal("0.3")
+    with pytest.raises(ValueError, match="divide by zero"):
+        Calculation.create("division", None, [1, 0], precision="rational").get_exact_result()
+    with pytest.raises(ValueError):
+        Calculation.create("addition", None, [[1, 2]], axis="rows", precision="decimal")
+    with pytest.raises(ValueError):
+        Calculation.create("addition", None, [1, 2], precision="binary128")
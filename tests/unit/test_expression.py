@@ -0,0 +1,65 @@
+# tests/unit/test_expression.py
+import math
+
+import pytest
+
+from app.operations.calculation_logic import perform_calculation
+from app.operations.engine import CalculationRangeError
+from app.operations.expression import ExpressionError, compile_expression, evaluate
+from app.operations.result_cache import result_key
+
+def test_evaluate_binds_variables_in_order_of_appearance():
+    assert evaluate("(a + b) / 2", [3, 5]) == 4
+    assert evaluate("b * a + a", [2, 3]) == 9
+    assert evaluate("sqrt(x**2 + y**2)", [3, 4]) == 5
+    assert evaluate("2 * pi * r", [1]) == 2 * math.pi
+    assert evaluate("max(a, b, 10) % 7 - -c", [1, 2, 1]) == 4
+    assert compile_expression("b * a + a").variables == ("b", "a")
+    assert perform_calculation([3, 4], "expression", "hyp * 0 + a") == 4
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('true')",
+    "a.real",
+    "a[0]",
+    "'abc'",
+    "a if b else c",
+    "a < b",
+    "lambda: 1",
+    "round(a, ndigits=2)",
+    "sqrt",
+    "open(a)",
+    "_secret + 1",
+    "True + a",
+    "a +",
+    "",
+    "a" * 501,
+])
+def test_unsupported_expressions_are_rejected(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+def test_compiled_expressions_are_cached():
+    compile_expression.cache_clear()
+    for inputs in ([1, 2], [3, 4], [5, 6]):
+        evaluate("a * b + 1", inputs)
+    info = compile_expression.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+@pytest.mark.parametrize("text, inputs, error", [
+    ("a / b", [1, 0], ValueError),
+    ("a // (b - b)", [1, 2], ValueError),
+    ("log(a)", [-1], ValueError),
+    ("a ** 0.5", [-4], ValueError),
+    ("sqrt(a, b)", [1, 2], ValueError),
+    ("a + b", [1], ValueError),
+    ("exp(a)", [1000], CalculationRangeError),
+    ("a ** b", [10, 400], CalculationRangeError),
+    ("a * b", [1e200, 1e200], CalculationRangeError),
+])
+def test_evaluation_errors(text, inputs, error):
+    with pytest.raises(error):
+        evaluate(text, inputs)
+
+def test_result_key_includes_the_expression():
+    assert result_key("expression", [1, 2], "a + b") != result_key("expression", [1, 2], "a - b")
+    assert result_key("expression", [1, 2], "a + b") != result_key("addition", [1, 2])
@@ -0,0 +1,58 @@
+# tests/unit/test_inputs_storage.py
+import struct
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import JSON
+
+from app.models.calculation import Addition, Calculation, decode_inputs, encode_inputs, pack_floats, unpack_floats
+from app.operations.result_cache import result_key
+
+def test_packed_floats_are_little_endian_float64():
+    assert pack_floats([1.5, -2.0]) == struct.pack("<2d", 1.5, -2.0)
+    assert unpack_floats(memoryview(struct.pack("<2d", 1.5, -2.0))) == [1.5, -2.0]
+    assert unpack_floats(None) is None
+
+@pytest.mark.parametrize("inputs", [[1, 2.5, -3], [[1, 2], [3, 4], [5, 6]], []])
+def test_encode_decode_round_trip(inputs):
+    columns = encode_inputs(inputs, format="packed")
+    assert columns["inputs_json"] is JSON.NULL
+    count = sum(map(len, inputs)) if inputs and isinstance(inputs[0], list) else len(inputs)
+    assert len(columns["inputs_packed"]) == 8 * count
+    assert decode_inputs(None, columns["inputs_packed"], columns["inputs_width"]) == inputs
+
+    columns = encode_inputs(inputs, format="json")
+    assert (columns["inputs_packed"], columns["inputs_width"]) == (None, None)
+    assert decode_inputs(columns["inputs_json"], None, None) == inputs
+
+@pytest.mark.parametrize("inputs", ["not-a-list", [1, "a"], [[1, 2], [3]], [[]]])
+def test_inputs_that_cannot_be_packed_stay_json(inputs):
+    assert encode_inputs(inputs, format="packed") == {"inputs_json": inputs, "inputs_packed": None, "inputs_width": None}
+
+def test_model_inputs_hybrid():
+    """Test that assigning inputs packs them and reading them decodes the packed column."""
+    addition = Addition(inputs=[10, 5, 3.5])
+    assert addition.inputs_packed == pack_floats([10, 5, 3.5])
+    assert addition.inputs == [10, 5, 3.5]
+    assert addition.get_result() == 18.5
+
+    matrix = Calculation.create("multiplication", None, [[1, 2], [3, 4]], axis="columns")
+    assert matrix.inputs_width == 2
+    assert matrix.get_results() == [3, 8]
+    assert str(Calculation.inputs == None).startswith("calculations.inputs IS NULL")  # noqa: E711
+
+def test_packed_inputs_are_decoded_once():
+    """Test that the result key, the result and the response share one decode, until the inputs change."""
+    addition = Addition(inputs=[1.0, 2.0, 3.0])
+    with patch("app.models.calculation.decode_inputs", wraps=decode_inputs) as decode:
+        result_key(addition.type, addition.inputs)
+        assert addition.get_result() == 6.0
+        assert addition.inputs == [1.0, 2.0, 3.0]
+        assert decode.call_count == 1
+        addition.inputs = [4.0, 5.0]
+        assert addition.get_result() == 9.0
+        assert addition.inputs == [4.0, 5.0]
+        assert decode.call_count == 2
+        addition.inputs_packed = pack_floats([7.0])
+        assert addition.inputs == [7.0]
+        assert decode.call_count == 3
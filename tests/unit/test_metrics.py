@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.metrics import Counter, Gauge, HistogramFamily, render_metrics
+
+def test_counter_and_gauge_render_labelled_samples():
+    """Counters accumulate and gauges move both ways, one sample per label set."""
+    counter = Counter("jobs_total", "Jobs.", ["queue"], registry=None)
+    counter.inc("fast")
+    counter.inc("fast", amount=2)
+    gauge = Gauge("workers", "Workers.", registry=None)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = render_metrics(counter, gauge)
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{queue="fast"} 3' in text
+    assert "# TYPE workers gauge" in text
+    assert "workers 1" in text
+
+def test_histogram_family_renders_cumulative_buckets():
+    """Histogram samples include cumulative buckets, +Inf, sum and count."""
+    histogram = HistogramFamily("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0), registry=None)
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+def test_label_values_are_escaped_and_checked():
+    """Quotes in label values are escaped and the label count is enforced."""
+    counter = Counter("errors_total", "Errors.", ["message"], registry=None)
+    counter.inc('bad "input"')
+    assert 'errors_total{message="bad \\"input\\""} 1' in counter.render()
+    with pytest.raises(ValueError):
+        counter.inc()
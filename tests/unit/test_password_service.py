@@ -0,0 +1,62 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.auth.jwt import get_password_hash
+from app.auth.password_service import PasswordService, PasswordServiceBusy, password_service
+
+def test_inline_hash_and_verify():
+    """With no workers, hashing and verification run in the caller."""
+    service = PasswordService(workers=0, max_queue=4, retry_after=1)
+    hashed = service.hash("Secret123!")
+    assert service.verify("Secret123!", hashed) is True
+    assert service.verify("Wrong123!", hashed) is False
+    assert service.stats()["pending"] == 0
+
+def test_pool_hash_and_verify_async():
+    """The async API runs the work in the process pool."""
+    service = PasswordService(workers=1, max_queue=4, retry_after=1)
+    try:
+        hashed = asyncio.run(service.hash_async("Secret123!"))
+        assert asyncio.run(service.verify_async("Secret123!", hashed)) is True
+    finally:
+        service.shutdown()
+    assert service.stats()["pending"] == 0
+
+def test_full_queue_is_rejected():
+    """Calls beyond max_queue fail fast with PasswordServiceBusy."""
+    service = PasswordService(workers=1, max_queue=1, retry_after=7)
+    try:
+        slow = service._submit(time.sleep, 0.5)
+        with pytest.raises(PasswordServiceBusy) as exc_info:
+            service.hash("Secret123!")
+        assert exc_info.value.retry_after == 7
+        assert service.stats()["rejected"] == 1
+        slow.result()
+    finally:
+        service.shutdown()
+
+def test_login_returns_503_when_busy(client):
+    """A saturated password pool turns into 503 with Retry-After."""
+    user = {
+        "email": "busy@example.com",
+        "username": "busy_user",
+        "password": "Password123!",
+        "confirm_password": "Password123!",
+        "first_name": "Busy",
+        "last_name": "User"
+    }
+    assert client.post("/auth/register", json=user).status_code == 201
+
+    with patch.object(password_service, "verify", side_effect=PasswordServiceBusy(3)):
+        response = client.post("/auth/login", json={"username": "busy_user", "password": "Password123!"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+def test_hashes_are_compatible_with_jwt_helpers():
+    """Hashes from the service verify with the plain helpers and vice versa."""
+    service = PasswordService(workers=0, max_queue=4, retry_after=1)
+    assert service.verify("Secret123!", get_password_hash("Secret123!")) is True
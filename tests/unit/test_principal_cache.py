@@ -0,0 +1,64 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.auth.cache import PrincipalCache, principal_cache
+from app.auth.dependencies import get_current_user
+from app.auth.jwt import create_token
+from app.models.user import User
+from app.schemas.token import TokenType
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+def test_cache_hit_and_miss_counters():
+    """A stored principal is returned and counted as a hit; unknown tokens are misses."""
+    cache = PrincipalCache(maxsize=10)
+    cache.put("a.b.sig", "principal", time.time() + 60)
+
+    assert cache.get("a.b.sig") == "principal"
+    assert cache.get("a.b.other") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_cache_rejects_same_signature_with_different_token():
+    """A signature reused with a different payload is a miss."""
+    cache = PrincipalCache(maxsize=10)
+    cache.put("a.b.sig", "principal", time.time() + 60)
+    assert cache.get("a.forged.sig") is None
+
+def test_cache_entries_expire():
+    """Entries are not served past the token's expiry."""
+    cache = PrincipalCache(maxsize=10)
+    cache.put("a.b.sig", "principal", time.time() + 0.01)
+    time.sleep(0.02)
+    assert cache.get("a.b.sig") is None
+    assert cache.stats()["size"] == 0
+
+def test_cache_evicts_least_recently_used():
+    """The cache never grows beyond maxsize."""
+    cache = PrincipalCache(maxsize=2)
+    expires = time.time() + 60
+    cache.put("t.1.one", 1, expires)
+    cache.put("t.2.two", 2, expires)
+    cache.get("t.1.one")
+    cache.put("t.3.three", 3, expires)
+
+    assert cache.get("t.2.two") is None
+    assert cache.get("t.1.one") == 1
+    assert cache.get("t.3.three") == 3
+
+def test_get_current_user_verifies_token_once():
+    """Repeat calls with the same token are served from the cache."""
+    token = create_token("123e4567-e89b-12d3-a456-426614174000", TokenType.ACCESS)
+    with patch.object(User, "verify_token", wraps=User.verify_token) as verify:
+        first = get_current_user(token=token)
+        second = get_current_user(token=token)
+
+    assert verify.call_count == 1
+    assert first is second
+    assert str(first.id) == "123e4567-e89b-12d3-a456-426614174000"
@@ -0,0 +1,29 @@
+import json
+import uuid
+from datetime import datetime
+
+from app.models.calculation import Calculation
+from app.responses import FastJSONResponse, calculation_record
+from app.schemas.calculation import CalculationResponse
+
+def make_row(calculation_type="division", inputs=(7.5, 2.0)):
+    calculation = Calculation.create(calculation_type, uuid.uuid4(), list(inputs))
+    calculation.id = uuid.uuid4()
+    calculation.result = calculation.get_result()
+    calculation.created_at = datetime(2025, 1, 2, 3, 4, 5, 678901)
+    calculation.updated_at = datetime(2025, 1, 2, 3, 4, 6)
+    return calculation
+
+def test_fast_response_matches_validated_response():
+    """The orjson body decodes to the same JSON as the response_model path."""
+    row = make_row()
+    fast = json.loads(FastJSONResponse(calculation_record(row)).body)
+    validated = json.loads(CalculationResponse.model_validate(row).model_dump_json())
+    assert fast == validated
+    assert list(fast) == list(validated)
+
+def test_fast_response_encodes_lists():
+    """A list of rows is encoded as a JSON array with the JSON media type."""
+    response = FastJSONResponse([calculation_record(make_row("addition", (1.0, 2.0))) for _ in range(3)])
+    assert response.media_type == "application/json"
+    assert [item["result"] for item in json.loads(response.body)] == [3.0, 3.0, 3.0]
@@ -0,0 +1,74 @@
+import uuid
+from unittest.mock import patch
+
+import anyio
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations.result_cache import ResultCache, result_key
+
+def make(calculation_type, inputs):
+    return Calculation.create(calculation_type=calculation_type, user_id=uuid.uuid4(), inputs=inputs)
+
+def test_result_key_normalizes_numbers():
+    """Integers and floats with the same value share a key; types do not."""
+    assert result_key("addition", [2, 3]) == result_key("addition", [2.0, 3.0])
+    assert result_key("addition", [2, 3]) != result_key("multiplication", [2, 3])
+    assert result_key("addition", [2, 3]) != result_key("addition", [3, 2])
+
+def test_repeat_computation_is_a_hit():
+    """The second identical calculation is served from the cache."""
+    cache = ResultCache(maxsize=10)
+    calculation = make("multiplication", [3, 4])
+    with patch.object(type(calculation), "get_result", wraps=calculation.get_result) as compute:
+        assert cache.get_result(calculation) == 12
+        assert cache.get_result(make("multiplication", [3.0, 4.0])) == 12
+    assert compute.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+def test_errors_are_not_cached():
+    """A failing computation raises every time."""
+    cache = ResultCache(maxsize=10)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            cache.get_result(make("division", [1, 0]))
+    assert cache.stats()["size"] == 0
+
+def test_invalid_inputs_fall_through_to_model_validation():
+    """Inputs that cannot be keyed are validated by the model as usual."""
+    cache = ResultCache(maxsize=10)
+    with pytest.raises(ValueError, match="Inputs must be a list of numbers"):
+        cache.get_result(make("addition", "not-a-list"))
+
+def test_lru_eviction():
+    """The local tier is bounded and evicts the least recently used entry."""
+    cache = ResultCache(maxsize=2)
+    cache.get_result(make("addition", [1, 1]))
+    cache.get_result(make("addition", [2, 2]))
+    cache.get_result(make("addition", [1, 1]))
+    cache.get_result(make("addition", [3, 3]))
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert result_key("addition", [2, 2]) not in cache._entries
+
+def test_redis_tier_shares_results(fake_redis):
+    """A result computed by one process is found in Redis by another."""
+    first = ResultCache(maxsize=10, use_redis=True)
+    second = ResultCache(maxsize=10, use_redis=True)
+
+    async def compute(cache, calculation):
+        return await anyio.to_thread.run_sync(cache.get_result, calculation)
+
+    assert anyio.run(compute, first, make("subtraction", [10, 4])) == 6
+    assert anyio.run(compute, second, make("subtraction", [10, 4])) == 6
+
+    assert second.stats()["redis_hits"] == 1
+    assert second.stats()["misses"] == 0
+
+def test_redis_tier_skipped_outside_worker_threads():
+    """Without an event loop to call into, the Redis tier is skipped silently."""
+    cache = ResultCache(maxsize=10, use_redis=True)
+    assert cache.get_result(make("addition", [1, 2])) == 3
+    assert cache.stats()["redis_errors"] == 0
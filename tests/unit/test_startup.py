@@ -0,0 +1,26 @@
+# tests/unit/test_startup.py
+import subprocess
+import sys
+
+from benchmarks.startup import parse_importtime
+
+def test_heavy_modules_are_not_imported_at_startup():
+    """Test that importing the app does not load modules only some requests need."""
+    code = (
+        "import sys, app.main, app.auth.jwt; "
+        "print(sorted(m for m in ('numpy', 'redis', 'passlib', 'jose.jwt') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "[]"
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     app.core\n"
+        "import time:      3000 |       3500 |   app.main\n"
+        "unrelated line\n"
+    )
+    rows = parse_importtime(stderr)
+    assert [row["module"] for row in rows] == ["app.core", "app.main"]
+    assert rows[1]["self"] == 0.003 and rows[1]["cumulative"] == 0.0035
+    assert rows[0]["depth"] == 2 and rows[1]["depth"] == 1
@@ -0,0 +1,123 @@
+import time
+from unittest.mock import patch
+
+import anyio
+
+from app.auth import redis as token_redis
+from app.auth.bloom import BloomFilter, RevokedTokenFilter
+
+def jti_lookups(redis):
+    """Commands that looked up blacklist entries."""
+    return [call for call in redis.calls if call[0] in ("get", "mget") and "blacklist:jti" in str(call[1])]
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added item is reported present, and unrelated items rarely are."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+def test_keys_are_namespaced(fake_redis):
+    """Blacklist entries are written under the configured key prefix."""
+    anyio.run(token_redis.add_to_blacklist, "some-jti", 60)
+    assert token_redis.redis_key("blacklist", "jti", "some-jti") in fake_redis.data
+    assert all(key.startswith(token_redis.settings.REDIS_KEY_PREFIX) for key in fake_redis.data)
+
+def test_unrevoked_tokens_skip_redis(fake_redis):
+    """After the first sync, tokens absent from the filter need no Redis lookup."""
+    async def check():
+        return [await token_redis.is_blacklisted(f"jti-{i}") for i in range(20)]
+
+    assert anyio.run(check) == [False] * 20
+    assert jti_lookups(fake_redis) == []
+    assert token_redis.revoked_tokens.stats()["misses"] == 20
+
+def test_revoked_token_is_confirmed_in_redis(fake_redis):
+    """A token revoked by this process is rejected immediately."""
+    async def revoke_and_check():
+        await token_redis.is_blacklisted("warm-up")
+        await token_redis.add_to_blacklist("revoked-jti", 60)
+        return await token_redis.is_blacklisted("revoked-jti")
+
+    assert anyio.run(revoke_and_check) is True
+    assert len(jti_lookups(fake_redis)) == 1
+
+def test_revocations_from_other_processes_arrive_on_sync(fake_redis):
+    """A filter picks up revocations published elsewhere once the version changes."""
+    other_process = RevokedTokenFilter(100, 0.001, sync_interval=60)
+
+    async def scenario():
+        await token_redis.is_blacklisted("warm-up")
+        with patch.object(token_redis, "revoked_tokens", other_process):
+            await token_redis.add_to_blacklist("revoked-elsewhere", 60)
+        before_sync = await token_redis.is_blacklisted("revoked-elsewhere")
+        await token_redis.revoked_tokens.sync(fake_redis, force=True)
+        after_sync = await token_redis.is_blacklisted("revoked-elsewhere")
+        return before_sync, after_sync
+
+    assert anyio.run(scenario) == (False, True)
+    assert token_redis.revoked_tokens.version == "1"
+
+def test_bulk_check_uses_one_mget(fake_redis):
+    """Many JTIs are checked with a single MGET covering only the filter hits."""
+    async def scenario():
+        await token_redis.add_to_blacklist("a", 60)
+        await token_redis.add_to_blacklist("c", 60)
+        await token_redis.revoked_tokens.sync(fake_redis, force=True)
+        fake_redis.calls.clear()
+        return await token_redis.are_blacklisted(["a", "b", "c", "d"])
+
+    assert anyio.run(scenario) == [True, False, True, False]
+    assert len(fake_redis.calls) == 1
+    assert fake_redis.calls[0][0] == "mget"
+
+def test_revoke_user_tokens_is_one_round_trip(fake_redis):
+    """Revoking all of a user's tokens is one pipeline and rejects tokens issued before it."""
+    issued_before = int(time.time()) - 10
+
+    async def scenario():
+        fake_redis.calls.clear()
+        await token_redis.revoke_user_tokens("user-1")
+        revoke_calls = list(fake_redis.calls)
+        return revoke_calls, [
+            await token_redis.is_token_revoked("old-jti", "user-1", issued_before),
+            await token_redis.is_token_revoked("new-jti", "user-1", int(time.time()) + 10),
+            await token_redis.is_token_revoked("other-jti", "user-2", issued_before),
+        ]
+
+    revoke_calls, outcomes = anyio.run(scenario)
+    assert [call[0] for call in revoke_calls] == ["pipeline"]
+    assert outcomes == [True, False, False]
+
+def test_unsynced_filter_falls_back_to_redis():
+    """Before any successful sync every lookup is treated as a possible revocation."""
+    revoked = RevokedTokenFilter(100, 0.001, sync_interval=60)
+    assert revoked.might_be_revoked("anything") is True
+
+    class DownRedis:
+        async def get(self, key):
+            raise ConnectionError("redis is down")
+
+    anyio.run(revoked.sync, DownRedis())
+    assert revoked.might_be_revoked("anything") is True
+    assert revoked.stats()["sync_errors"] == 1
+
+def test_legacy_blacklist_entries_are_migrated(fake_redis):
+    """Entries stored under a bare JTI before keys were namespaced stay revoked after migration."""
+    async def scenario():
+        fake_redis._set("legacy-jti", "blacklisted", 600)
+        fake_redis._set("unrelated", "some value", 600)
+        await token_redis.is_blacklisted("warm-up")
+        before = await token_redis.is_blacklisted("legacy-jti")
+        migrated = await token_redis.migrate_legacy_blacklist()
+        after = await token_redis.is_blacklisted("legacy-jti")
+        return before, migrated, after
+
+    assert anyio.run(scenario) == (False, 1, True)
+    key = token_redis.redis_key("blacklist", "jti", "legacy-jti")
+    assert 590 < fake_redis.expires[key] - time.time() <= 600
+    assert "legacy-jti" in fake_redis.data
+    assert token_redis.redis_key("blacklist", "jti", "unrelated") not in fake_redis.data
+    assert anyio.run(token_redis.migrate_legacy_blacklist) == 1
@@ -0,0 +1,85 @@
+# tests/unit/test_tokens.py
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from app.auth.tokens import TokenService
+from app.schemas.token import TokenType
+
+ACCESS_SECRET = "access-secret"
+REFRESH_SECRET = "refresh-secret"
+
+@pytest.fixture
+def service():
+    return TokenService(ACCESS_SECRET, REFRESH_SECRET, "HS256")
+
+@pytest.mark.parametrize("token_type, secret", [
+    (TokenType.ACCESS, ACCESS_SECRET),
+    (TokenType.REFRESH, REFRESH_SECRET),
+])
+def test_mint_is_byte_identical_to_jose(service, token_type, secret):
+    """Test that minted tokens match jose.jwt.encode of the same claims."""
+    now = 1_700_000_000.75
+    token = service.mint(uuid4(), token_type, timedelta(minutes=30), now=now, jti="ab" * 16)
+    claims = jwt.get_unverified_claims(token)
+    assert list(claims) == ["sub", "type", "exp", "iat", "jti"]
+    assert claims["exp"] == 1_700_001_800 and claims["iat"] == 1_700_000_000
+    assert token == jwt.encode(claims, secret, algorithm="HS256")
+
+@pytest.mark.parametrize("algorithm", ["HS384", "HS512"])
+def test_encode_matches_jose_for_other_hmac_algorithms(algorithm):
+    service = TokenService(ACCESS_SECRET, REFRESH_SECRET, algorithm)
+    claims = {"sub": "user", "type": "access", "exp": 2_000_000_000, "iat": 1_000_000_000, "jti": "x"}
+    assert service.encode(dict(claims), TokenType.ACCESS) == jwt.encode(dict(claims), ACCESS_SECRET, algorithm=algorithm)
+
+def test_encode_escapes_non_ascii_like_jose(service):
+    claims = {"sub": "usér", "type": "access", "exp": 2_000_000_000}
+    assert service.encode(dict(claims), TokenType.ACCESS) == jwt.encode(dict(claims), ACCESS_SECRET, algorithm="HS256")
+
+def test_verify_round_trip(service):
+    user_id = uuid4()
+    token = service.mint(user_id, TokenType.ACCESS, timedelta(minutes=5))
+    claims = service.verify(token, TokenType.ACCESS)
+    assert claims["sub"] == str(user_id)
+    assert claims["type"] == "access"
+    assert claims == jwt.decode(token, ACCESS_SECRET, algorithms=["HS256"])
+
+def test_verify_uses_the_secret_of_the_token_type(service):
+    token = service.mint(uuid4(), TokenType.REFRESH, timedelta(minutes=5))
+    with pytest.raises(JWTError):
+        service.verify(token, TokenType.ACCESS)
+    assert service.verify(token, TokenType.REFRESH)["type"] == "refresh"
+
+def test_verify_rejects_tampered_tokens(service):
+    token = service.mint(uuid4(), TokenType.ACCESS, timedelta(minutes=5))
+    header, payload, signature = token.split(".")
+    forged = service.mint("someone-else", TokenType.ACCESS, timedelta(minutes=5)).split(".")[1]
+    with pytest.raises(JWTError):
+        service.verify(f"{header}.{forged}.{signature}", TokenType.ACCESS)
+    with pytest.raises(JWTError):
+        service.verify(f"{header}.{payload}.", TokenType.ACCESS)
+    with pytest.raises(JWTError):
+        service.verify("not-a-token", TokenType.ACCESS)
+
+def test_verify_expiry(service):
+    token = service.mint(uuid4(), TokenType.ACCESS, timedelta(minutes=5), now=time.time() - 3600)
+    with pytest.raises(ExpiredSignatureError):
+        service.verify(token, TokenType.ACCESS)
+    assert service.verify(token, TokenType.ACCESS, verify_exp=False)["type"] == "access"
+
+def test_verify_falls_back_to_jose_for_other_headers(service):
+    """Test that tokens with a different header are verified by jose."""
+    claims = {"sub": "user", "type": "access", "exp": int(time.time()) + 60}
+    with_kid = jwt.encode(claims, ACCESS_SECRET, algorithm="HS256", headers={"kid": "1"})
+    assert service.verify(with_kid, TokenType.ACCESS)["sub"] == "user"
+    other_algorithm = jwt.encode(claims, ACCESS_SECRET, algorithm="HS512")
+    with pytest.raises(JWTError):
+        service.verify(other_algorithm, TokenType.ACCESS)
+
+def test_rejects_non_hmac_algorithms():
+    with pytest.raises(ValueError):
+        TokenService(ACCESS_SECRET, REFRESH_SECRET, "RS256")